@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Board
+
+STAFF_ROLES = ['admin', 'moderator']
+
+# Upper bound on staleness when the cache is not shared between processes
+ACCESS_CACHE_TIMEOUT = getattr(settings, 'BOARD_ACCESS_CACHE_TIMEOUT', 60)
+GENERATION_KEY = 'board-access:generation'
+
+
+def sees_all_boards(user):
+    return user.role in STAFF_ROLES
+
+
+def _generation():
+    # Start from the clock so a lost generation key never revives old entries
+    return cache.get_or_set(GENERATION_KEY, int(time.time() * 1000), None)
+
+
+def _user_key(user_id):
+    return f'board-access:{_generation()}:{user_id}'
+
+
+def readable_board_ids(user):
+    """Ids of the boards ``user`` can read, or ``None`` for every board.
+
+    Resolved once per user and cached until a membership, ``public`` flag or
+    board is added/removed (see ``core.signals``). Role changes need no
+    invalidation since staff never read the cache.
+    """
+    if sees_all_boards(user):
+        return None
+    key = _user_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            Board.objects.filter(Q(public=True) | Q(members=user)).values_list('id', flat=True).distinct()
+        )
+        cache.set(key, ids, ACCESS_CACHE_TIMEOUT)
+    return ids
+
+
+def can_read_board(user, board_id):
+    ids = readable_board_ids(user)
+    return ids is None or board_id in ids
+
+
+def filter_readable(queryset, user, field='board_id'):
+    """Restrict ``queryset`` to readable boards with a plain ``IN`` (no join, no DISTINCT)."""
+    ids = readable_board_ids(user)
+    if ids is None:
+        return queryset
+    return queryset.filter(**{f'{field}__in': sorted(ids)})
+
+
+def invalidate_users(user_ids):
+    def forget():
+        cache.delete_many([_user_key(user_id) for user_id in user_ids])
+    # After commit, so a concurrent request cannot re-cache the old set
+    transaction.on_commit(forget)
+
+
+def invalidate_all():
+    def bump():
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            _generation()
+    transaction.on_commit(bump)
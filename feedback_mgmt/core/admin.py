@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Board, Feedback, Comment
+from .models import User, Board, Feedback, Comment, Tag, Job
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -26,3 +26,13 @@ class FeedbackAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('feedback', 'user', 'created_at')
     list_filter = ('created_at',)
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'status', 'attempts', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
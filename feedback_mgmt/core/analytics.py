@@ -0,0 +1,188 @@
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework import serializers
+
+from .access import filter_readable, readable_board_ids
+from .models import Feedback, FeedbackDailyStat, TagDailyStat
+from .tagging import tag_links_prefetch
+from .viewer import annotate_viewer_state
+
+DEFAULT_SUMMARY_DAYS = 30
+MAX_SUMMARY_DAYS = 365
+TOP_VOTED_LIMIT = 5
+
+SUMMARY_CACHE_TIMEOUT = getattr(settings, 'SUMMARY_CACHE_TIMEOUT', 600)
+SUMMARY_VERSION_KEY = 'summary:version'
+# A process that never saw a change (say, with a per-process LocMem cache)
+# picks up a fresh clock after this long instead of answering 304 forever
+SUMMARY_VERSION_TIMEOUT = getattr(settings, 'SUMMARY_VERSION_TIMEOUT', 60)
+
+STATUS_KEYS = [key for key, _ in Feedback.STATUS_CHOICES]
+
+
+def parse_days(value, default=DEFAULT_SUMMARY_DAYS, maximum=MAX_SUMMARY_DAYS):
+    if value in (None, ''):
+        return default
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError({'days': 'Must be an integer.'})
+    if days < 1 or days > maximum:
+        raise serializers.ValidationError({'days': f'Must be between 1 and {maximum}.'})
+    return days
+
+
+def parse_id_list(value, name):
+    """Parse ``1,2,3`` style query params into a sorted list of ints."""
+    if value in (None, ''):
+        return []
+    try:
+        return sorted({int(part) for part in str(value).split(',') if part.strip()})
+    except ValueError:
+        raise serializers.ValidationError({name: 'Must be a comma-separated list of ids.'})
+
+
+def _scope(queryset, user, board_ids=None):
+    queryset = filter_readable(queryset, user)
+    if board_ids:
+        queryset = queryset.filter(board_id__in=board_ids)
+    return queryset
+
+
+def scoped_feedback(user, board_ids=None):
+    return _scope(Feedback.objects.all(), user, board_ids)
+
+
+def status_counts(stats):
+    """Total plus per-status counts summed from the daily rollup."""
+    rows = stats.order_by().values('status').annotate(count=Sum('count'))
+    counts = dict.fromkeys(STATUS_KEYS, 0)
+    counts.update({row['status']: row['count'] for row in rows})
+    counts['total'] = sum(counts[key] for key in STATUS_KEYS)
+    return counts
+
+
+def daily_trends(stats, days, today=None):
+    """Feedback created per day for the last ``days`` days (today included)."""
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = (
+        stats.filter(day__gte=start)
+        .order_by()
+        .values('day')
+        .annotate(count=Sum('count'))
+    )
+    per_day = {row['day']: row['count'] for row in rows}
+
+    trends = {}
+    for i in range(days):
+        d = start + timedelta(days=i)
+        trends[d.strftime('%Y-%m-%d')] = per_day.get(d, 0)
+    return trends
+
+
+def tag_distribution(tag_stats):
+    rows = (
+        tag_stats.order_by()
+        .values('tag')
+        .annotate(count=Sum('count'))
+        .filter(count__gt=0)
+        .order_by('-count', 'tag')
+    )
+    return {row['tag']: row['count'] for row in rows}
+
+
+def top_voted(queryset, limit=TOP_VOTED_LIMIT):
+    return list(
+        queryset.select_related('created_by', 'board')
+        .prefetch_related(tag_links_prefetch())
+        .order_by('-upvote_count', '-created_at')[:limit]
+    )
+
+
+def _aggregates(user, days, board_ids=None):
+    """The viewer independent part of the summary, plus the top voted ids."""
+    stats = _scope(FeedbackDailyStat.objects.all(), user, board_ids)
+    tag_stats = _scope(TagDailyStat.objects.all(), user, board_ids)
+    counts = status_counts(stats)
+    status_dist = {key: counts[key] for key in STATUS_KEYS}
+
+    return {
+        'total_feedback': counts['total'],
+        'open_feedback': counts['open'],
+        'in_progress_feedback': counts['in_progress'],
+        'completed_feedback': counts['completed'],
+        'rejected_feedback': counts['rejected'],
+        'top_voted_ids': list(
+            scoped_feedback(user, board_ids).order_by('-upvote_count', '-created_at')
+            .values_list('id', flat=True)[:TOP_VOTED_LIMIT]
+        ),
+        'feedback_trends': daily_trends(stats, days),
+        'status_distribution': status_dist,
+        'tag_distribution': tag_distribution(tag_stats),
+    }
+
+
+def _with_top_voted(aggregates, user):
+    ids = aggregates.pop('top_voted_ids')
+    rows = {obj.id: obj for obj in top_voted(annotate_viewer_state(Feedback.objects.filter(id__in=ids), user))}
+    aggregates['top_voted_feedback'] = [rows[pk] for pk in ids if pk in rows]
+    return aggregates
+
+
+def build_summary(user, days, board_ids=None):
+    """Dashboard summary read from the rollup tables, see :mod:`core.rollups`."""
+    return _with_top_voted(_aggregates(user, days, board_ids), user)
+
+
+def summary_version():
+    """Millisecond timestamp of the last change that can affect a summary.
+
+    Only exact across processes with a shared cache; LocMem is per process,
+    so there a change shows up elsewhere within ``SUMMARY_VERSION_TIMEOUT``.
+    """
+    return cache.get_or_set(SUMMARY_VERSION_KEY, int(time.time() * 1000), SUMMARY_VERSION_TIMEOUT)
+
+
+def invalidate_summaries():
+    def bump():
+        current = cache.get(SUMMARY_VERSION_KEY) or 0
+        cache.set(SUMMARY_VERSION_KEY, max(int(time.time() * 1000), current + 1), SUMMARY_VERSION_TIMEOUT)
+    transaction.on_commit(bump)
+
+
+def summary_scope(user, days, board_ids=None):
+    """Cache key part for everything that decides which numbers a summary shows."""
+    readable = readable_board_ids(user)
+    parts = [
+        days,
+        # Trends end today
+        timezone.localdate().isoformat(),
+        ','.join(map(str, board_ids or [])),
+        'all' if readable is None else ','.join(map(str, sorted(readable))),
+    ]
+    return hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()
+
+
+def summary_etag(user, scope, version):
+    # Per viewer, since top voted items carry is_upvoted and friends
+    return f'summary-{scope[:20]}-{version}-{user.pk}'
+
+
+def cached_summary(user, days, board_ids=None, scope=None, version=None):
+    """:func:`build_summary` with the aggregates shared by every viewer of the same scope."""
+    scope = scope or summary_scope(user, days, board_ids)
+    version = version or summary_version()
+    key = f'summary:{scope}:{version}'
+    aggregates = cache.get(key)
+    if aggregates is None:
+        aggregates = _aggregates(user, days, board_ids)
+        cache.set(key, aggregates, SUMMARY_CACHE_TIMEOUT)
+    return _with_top_voted(dict(aggregates), user)
@@ -0,0 +1,154 @@
+import copy
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+METRICS_TOKEN_AUTH = 'metrics-token'
+
+# Users kept per process, and the upper bound on how long a change made
+# by another process takes to reach this one
+PRINCIPAL_CACHE_SIZE = getattr(settings, 'PRINCIPAL_CACHE_SIZE', 1024)
+PRINCIPAL_CACHE_SECONDS = getattr(settings, 'PRINCIPAL_CACHE_SECONDS', 30)
+
+
+class PrincipalCache:
+    """Bounded, short-lived LRU of users by id, local to the process.
+
+    Ids are keyed as strings, the way simplejwt puts them in tokens.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        # Bumped by every forget(), so a lookup that raced one is not stored
+        self.generation = 0
+
+    def get(self, user_id):
+        user_id = str(user_id)
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires <= time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user, generation):
+        user_id = str(user_id)
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[user_id] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def forget(self, user_ids):
+        with self.lock:
+            self.generation += 1
+            for user_id in user_ids:
+                self.entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+
+principals = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_SECONDS)
+
+
+def invalidate_principals(user_ids):
+    def forget():
+        principals.forget(user_ids)
+    # Now for this transaction's own requests, and again after commit so a
+    # concurrent request cannot re-cache the old row
+    principals.forget(user_ids)
+    transaction.on_commit(forget)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` without the user query on every request.
+
+    Users come from ``principals``, which this process clears for a user
+    whenever the row is saved or deleted (see ``core.signals``), so a role
+    change, deactivation or password change applies here at once and in
+    other processes within ``PRINCIPAL_CACHE_SECONDS``. The checks are
+    simplejwt's, against the cached row: ``is_active``, and with
+    ``CHECK_REVOKE_TOKEN`` the password hash claim that revokes tokens
+    issued before a password change.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('Token contained no recognizable user identification') from e
+
+        user = principals.get(user_id)
+        if user is None:
+            generation = principals.generation
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed('User not found', code='user_not_found') from e
+            principals.set(user_id, user, generation)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+
+        # Requests get their own instance, so nothing they set leaks into the cache
+        return copy.copy(user)
+
+
+class QueryTokenJWTAuthentication(CachedJWTAuthentication):
+    """JWT from ``?access_token=``, for clients that cannot send headers.
+
+    Browsers' ``EventSource`` is the reason; only the event stream uses
+    this, since query strings end up in access logs.
+    """
+
+    def authenticate(self, request):
+        raw_token = request.query_params.get('access_token')
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """``Authorization: Bearer <METRICS_TOKEN>``, for Prometheus scrapers.
+
+    Authenticates no user; ``request.auth`` is ``METRICS_TOKEN_AUTH``.
+    """
+
+    def authenticate(self, request):
+        expected = getattr(settings, 'METRICS_TOKEN', '')
+        parts = get_authorization_header(request).split()
+        if not expected or len(parts) != 2 or parts[0].lower() != b'bearer':
+            return None
+        if not hmac.compare_digest(parts[1], expected.encode()):
+            return None
+        return AnonymousUser(), METRICS_TOKEN_AUTH
+
+    def authenticate_header(self, request):
+        return 'Bearer'
@@ -0,0 +1,45 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Django's SQLite backend plus the ``init_command`` and
+    ``transaction_mode`` options of Django 5.1, for serving concurrent
+    requests from one file (see ``feedback_mgmt.database``).
+
+    ``init_command`` runs on every new connection, e.g. to set pragmas.
+    ``transaction_mode='IMMEDIATE'`` takes the write lock when an atomic
+    block starts: a deferred transaction that reads before it writes
+    fails with "database is locked" instead of waiting for the lock
+    whenever another write is in progress.
+    """
+    init_command = None
+    transaction_mode = None
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.init_command = kwargs.pop('init_command', None)
+        self.transaction_mode = kwargs.pop('transaction_mode', None)
+        if self.transaction_mode is not None:
+            self.transaction_mode = self.transaction_mode.upper()
+            if self.transaction_mode not in TRANSACTION_MODES:
+                raise ImproperlyConfigured(
+                    f"settings.DATABASES['{self.alias}']['OPTIONS']['transaction_mode'] must be one of "
+                    f"{', '.join(TRANSACTION_MODES)}."
+                )
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for statement in (self.init_command or '').split(';'):
+            if statement.strip():
+                conn.execute(statement)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {self.transaction_mode}')
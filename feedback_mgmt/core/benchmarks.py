@@ -0,0 +1,265 @@
+import json
+import math
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .access import filter_readable
+from .models import Comment, Feedback, User
+
+# Per-endpoint budgets; anything not listed uses DEFAULT_BUDGET. Override
+# with `manage.py benchmark_endpoints --budgets file.json`.
+DEFAULT_BUDGET = {'p95_ms': 250, 'queries': 12, 'bytes': 256 * 1024}
+BUDGETS = {
+    # Password hashing dominates these on purpose
+    'auth-login': {'p95_ms': 1000},
+    'auth-register': {'p95_ms': 1000},
+    'feedback-list-search': {'p95_ms': 400},
+    # Whole data set, streamed
+    'feedback-export-comments': {'p95_ms': 1000, 'bytes': 1024 * 1024},
+    # Signals keep rollups, tag links, counters and the search index current
+    'feedback-create': {'queries': 30},
+    'feedback-update': {'queries': 30},
+    # One rollup bump per distinct board/day/status/tag, not per item
+    'feedback-bulk-create': {'queries': 30},
+    # ...once per cascaded comment on delete
+    'feedback-delete': {'queries': 40},
+    # One insert per vote, so only real changes reach the counters
+    'feedback-vote-batch': {'queries': 30},
+}
+
+
+class Case:
+    """One request to time: ``as_user`` is a key of the fixture users.
+
+    ``revalidate`` cases send the ETag of a first, untimed response back in
+    ``If-None-Match``, like a polling client.
+    """
+
+    def __init__(self, name, method, path, data=None, as_user='contributor', writes=False, revalidate=False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.as_user = as_user
+        self.writes = writes
+        self.revalidate = revalidate
+        self.headers = {}
+
+
+def benchmark_fixtures():
+    """Users and ids the cases run against, picked from existing (seeded) data."""
+    admin = User.objects.filter(role='admin').order_by('id').first()
+    # A contributor who is a member of some board, so private data is in play
+    contributor = (
+        User.objects.filter(role='contributor', boards__public=True)
+        .order_by('id').first()
+    )
+    if admin is None or contributor is None:
+        return None
+    feedback = (
+        Feedback.objects.filter(board__public=True).order_by('-upvote_count', '-created_at', '-id').first()
+    )
+    if feedback is None:
+        return None
+    comment = Comment.objects.filter(feedback=feedback, user=contributor).order_by('id').first()
+    return {
+        'users': {'admin': admin, 'contributor': contributor, 'anonymous': None},
+        'board': feedback.board_id,
+        'feedback': feedback.id,
+        'batch_feedback': list(
+            Feedback.objects.filter(board__public=True).order_by('-created_at', '-id').values_list('id', flat=True)[:20]
+        ),
+        'own_feedback': filter_readable(Feedback.objects.filter(created_by=contributor), contributor)
+        .values_list('id', flat=True).first(),
+        'comment': comment.id if comment else None,
+        'tag': feedback.tag_links.values_list('tag__name', flat=True).first() or 'ui',
+        'word': feedback.title.split()[0].lower(),
+        'refresh': str(RefreshToken.for_user(contributor)),
+    }
+
+
+def benchmark_cases(fixtures):
+    board = fixtures['board']
+    feedback = fixtures['feedback']
+    cases = [
+        Case('auth-register', 'post', '/api/auth/register/', {
+            'username': 'benchmark-user', 'email': 'benchmark@example.com',
+            'password': 'benchmark-pass-123', 'password_confirm': 'benchmark-pass-123',
+        }, as_user='anonymous', writes=True),
+        Case('auth-login', 'post', '/api/auth/login/', {
+            'username': fixtures['users']['contributor'].username, 'password': 'seed-password',
+        }, as_user='anonymous'),
+        Case('auth-me', 'get', '/api/auth/me/'),
+        Case('token-refresh', 'post', '/api/token/refresh/', {'refresh': fixtures['refresh']},
+             as_user='anonymous', writes=True),
+
+        Case('board-list', 'get', '/api/boards/'),
+        Case('board-list-admin', 'get', '/api/boards/', as_user='admin'),
+        Case('board-detail', 'get', f'/api/boards/{board}/'),
+        Case('board-list-304', 'get', '/api/boards/', revalidate=True),
+        Case('board-create', 'post', '/api/boards/', {'name': 'Benchmark board', 'description': 'x'},
+             as_user='admin', writes=True),
+        Case('board-update', 'patch', f'/api/boards/{board}/', {'description': 'Benchmark'},
+             as_user='admin', writes=True),
+
+        Case('feedback-list', 'get', '/api/feedback/'),
+        Case('feedback-list-admin', 'get', '/api/feedback/', as_user='admin'),
+        Case('feedback-list-board', 'get', f'/api/feedback/?board_id={board}&status=open'),
+        Case('feedback-list-votes', 'get', '/api/feedback/?ordering=upvotes'),
+        Case('feedback-list-tags', 'get', f"/api/feedback/?tags={fixtures['tag']}"),
+        Case('feedback-list-search', 'get', f"/api/feedback/?search={fixtures['word']}"),
+        Case('feedback-list-page', 'get', '/api/feedback/?page=5'),
+        Case('feedback-list-expanded', 'get', '/api/feedback/?expand=board,created_by,comments'),
+        Case('feedback-detail', 'get', f'/api/feedback/{feedback}/'),
+        Case('feedback-comments', 'get', f'/api/feedback/{feedback}/comments/'),
+        Case('feedback-list-304', 'get', '/api/feedback/', revalidate=True),
+        Case('feedback-list-board-304', 'get', f'/api/feedback/?board_id={board}&status=open', revalidate=True),
+        Case('feedback-detail-304', 'get', f'/api/feedback/{feedback}/', revalidate=True),
+        Case('feedback-create', 'post', '/api/feedback/', {
+            'title': 'Benchmark', 'description': 'Benchmark feedback', 'board_id': board, 'tags': 'ui, api',
+        }, writes=True),
+        Case('feedback-bulk-create', 'post', '/api/feedback/bulk/', {'items': [
+            {'title': f'Bulk benchmark {i}', 'description': 'Bulk feedback', 'board_id': board, 'tags': 'ui, api'}
+            for i in range(50)
+        ]}, writes=True),
+        Case('feedback-upvote', 'post', f'/api/feedback/{feedback}/upvote/', as_user='admin', writes=True),
+        Case('feedback-vote', 'put', f'/api/feedback/{feedback}/vote/', as_user='admin', writes=True),
+        Case('feedback-unvote', 'delete', f'/api/feedback/{feedback}/vote/', writes=True),
+        Case('feedback-vote-batch', 'post', '/api/feedback/votes/', {
+            'votes': [{'feedback_id': pk, 'upvoted': True} for pk in fixtures['batch_feedback']],
+        }, as_user='admin', writes=True),
+        Case('feedback-kanban', 'get', '/api/feedback/kanban/'),
+        Case('feedback-kanban-board', 'get', f'/api/feedback/kanban/?board_id={board}&ordering=upvotes'),
+        Case('feedback-tags', 'get', '/api/feedback/tags/'),
+        Case('feedback-export-board', 'get', f'/api/feedback/export/?board_id={board}'),
+        Case('feedback-export-comments', 'get', '/api/feedback/export/?kind=comments&output=ndjson&compress=gzip',
+             as_user='admin'),
+        Case('feedback-summary', 'get', '/api/feedback/summary/'),
+        Case('feedback-summary-admin', 'get', '/api/feedback/summary/', as_user='admin'),
+        Case('feedback-summary-304', 'get', '/api/feedback/summary/', revalidate=True),
+
+        Case('comment-list', 'get', f'/api/comments/?feedback_id={feedback}'),
+        Case('comment-list-304', 'get', f'/api/comments/?feedback_id={feedback}', revalidate=True),
+        Case('comment-bulk-create', 'post', '/api/comments/bulk/', {'items': [
+            {'feedback_id': pk, 'text': 'Bulk benchmark comment'} for pk in fixtures['batch_feedback']
+        ]}, writes=True),
+        Case('comment-create', 'post', '/api/comments/', {'feedback_id': feedback, 'text': 'Benchmark comment'},
+             writes=True),
+    ]
+    if fixtures['own_feedback']:
+        own = fixtures['own_feedback']
+        cases += [
+            Case('feedback-update', 'patch', f'/api/feedback/{own}/', {'status': 'in_progress'}, writes=True),
+            Case('feedback-delete', 'delete', f'/api/feedback/{own}/', writes=True),
+        ]
+    if fixtures['comment']:
+        cases += [
+            Case('comment-detail', 'get', f"/api/comments/{fixtures['comment']}/"),
+            Case('comment-delete', 'delete', f"/api/comments/{fixtures['comment']}/", writes=True),
+        ]
+    return cases
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def authorizations(fixtures):
+    """``Authorization`` header value per fixture user."""
+    return {
+        key: f'Bearer {RefreshToken.for_user(user).access_token}'
+        for key, user in fixtures['users'].items() if user is not None
+    }
+
+
+def without_throttle_limits():
+    """Throttles still run (and are timed) but no benchmark reaches a limit."""
+    rates = {scope: '1000000/s' for scope in settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})}
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+class Runner:
+    """Times each case with the Django test client through the full stack.
+
+    Writes run in a transaction that is rolled back, so the data set is
+    the same for every iteration and every run.
+    """
+
+    def __init__(self, fixtures, iterations=20, warmup=2):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.headers = {
+            key: {'HTTP_AUTHORIZATION': authorization} for key, authorization in authorizations(fixtures).items()
+        }
+        # SERVER_NAME must be in ALLOWED_HOSTS since the test environment is not set up
+        self.client = Client(SERVER_NAME='localhost')
+
+    def request(self, case):
+        kwargs = {**self.headers.get(case.as_user, {}), **case.headers}
+        if case.data is not None:
+            kwargs['data'] = json.dumps(case.data)
+            kwargs['content_type'] = 'application/json'
+        return getattr(self.client, case.method)(case.path, **kwargs)
+
+    def measure(self, case):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.request(case)
+            # Streamed bodies are timed in full, not just up to the first chunk
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            elapsed = (time.perf_counter() - started) * 1000
+        return response, elapsed, len(queries), len(body)
+
+    def run_once(self, case):
+        if not case.writes:
+            return self.measure(case)
+        with transaction.atomic():
+            result = self.measure(case)
+            transaction.set_rollback(True)
+        return result
+
+    def run(self, case):
+        with without_throttle_limits():
+            return self.run_case(case)
+
+    def run_case(self, case):
+        if case.revalidate:
+            etag = self.request(case).get('ETag')
+            if etag:
+                case.headers['HTTP_IF_NONE_MATCH'] = etag
+        for _ in range(self.warmup):
+            self.run_once(case)
+        timings = []
+        for _ in range(self.iterations):
+            response, elapsed, query_count, size = self.run_once(case)
+            timings.append(elapsed)
+        return {
+            'name': case.name,
+            'method': case.method.upper(),
+            'path': case.path,
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'queries': query_count,
+            'bytes': size,
+        }
+
+
+def check_budget(result, budgets):
+    """Budget violations of one result as human readable strings."""
+    budget = {**DEFAULT_BUDGET, **budgets.get(result['name'], {})}
+    problems = []
+    if result['status'] >= 400:
+        problems.append(f"status {result['status']}")
+    for key in ('p95_ms', 'queries', 'bytes'):
+        if key in budget and result[key] > budget[key]:
+            problems.append(f'{key} {result[key]} > {budget[key]}')
+    return problems
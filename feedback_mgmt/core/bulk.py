@@ -0,0 +1,186 @@
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from . import counters, events, rollups, signals, tagging
+from .access import filter_readable
+from .analytics import invalidate_summaries
+from .models import Board, Comment, Feedback
+from .permissions import can_edit_feedback
+from .search import get_backend as get_search_backend
+from .serializers import CommentBulkCreateSerializer, FeedbackBulkCreateSerializer, FeedbackBulkUpdateSerializer
+
+# Items written per transaction
+BULK_CHUNK_SIZE = 200
+
+NOT_FOUND = {'detail': NotFound.default_detail}
+FORBIDDEN = {'detail': PermissionDenied.default_detail}
+
+
+def chunked(iterable, size=BULK_CHUNK_SIZE):
+    """Lists of up to ``size`` items, reading ``iterable`` lazily."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def in_chunks(func, items, user, chunk_size=BULK_CHUNK_SIZE):
+    """Run a bulk ``func`` over ``items`` one chunk (and transaction) at a time."""
+    results = []
+    for start, chunk in zip(range(0, len(items), chunk_size), chunked(items, chunk_size)):
+        results += func(chunk, user, start=start)
+    return results
+
+
+def _int_values(items, key):
+    values = set()
+    for item in items:
+        try:
+            values.add(int(item.get(key)))
+        except (TypeError, ValueError):
+            pass
+    return values
+
+
+def _validate(serializer_class, items, context, start):
+    """Split ``items`` into ``(index, validated_data)`` pairs and error results."""
+    valid, results = [], []
+    for index, item in enumerate(items, start):
+        serializer = serializer_class(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results.append({'index': index, 'errors': serializer.errors})
+    return valid, results
+
+
+def _sorted(results):
+    return sorted(results, key=lambda result: result['index'])
+
+
+def create_feedback(items, user, start=0):
+    """Validate and insert one chunk of feedback ``items`` (plain dicts).
+
+    Returns one ``{'index', 'id'}`` or ``{'index', 'errors'}`` result per
+    item. The rows are written with ``bulk_create``, so the rollups, tag
+    links and search index are updated here instead of in ``core.signals``.
+    """
+    board_ids = set(
+        filter_readable(Board.objects.filter(id__in=_int_values(items, 'board_id')), user, field='id')
+        .values_list('id', flat=True)
+    )
+    valid, results = _validate(FeedbackBulkCreateSerializer, items, {'board_ids': board_ids}, start)
+    if not valid:
+        return _sorted(results)
+
+    with transaction.atomic():
+        created = Feedback.objects.bulk_create([Feedback(created_by=user, **data) for _, data in valid])
+        tagging.sync_tags_many({item.pk: item.tags for item in created})
+        rollups.apply_changes((None, rollups.rollup_state(item)) for item in created)
+        get_search_backend().index_many(feedback=created)
+        invalidate_summaries()
+        for item in created:
+            events.feedback_created(item)
+
+    results += [{'index': index, 'id': item.pk} for (index, _), item in zip(valid, created)]
+    return _sorted(results)
+
+
+def _editable(ids, user):
+    """Readable feedback among ``ids`` keyed by id, with just what bulk edits need."""
+    queryset = filter_readable(Feedback.objects.filter(id__in=ids), user)
+    return {item.pk: item for item in queryset.only('id', 'board_id', 'created_by_id', 'status', 'tags', 'created_at')}
+
+
+def update_feedback(items, user, start=0):
+    """Change the status and/or tags of one chunk of ``{'id', 'status', 'tags'}`` items."""
+    valid, results = _validate(FeedbackBulkUpdateSerializer, items, {}, start)
+    feedback = _editable({data['id'] for _, data in valid}, user)
+
+    changed = {}
+    for index, data in valid:
+        item = feedback.get(data['id'])
+        if item is None:
+            results.append({'index': index, 'errors': NOT_FOUND})
+            continue
+        if not can_edit_feedback(user, item):
+            results.append({'index': index, 'errors': FORBIDDEN})
+            continue
+        item.status = data.get('status', item.status)
+        item.tags = data.get('tags', item.tags)
+        changed[item.pk] = item
+        results.append({'index': index, 'id': item.pk})
+    if not changed:
+        return _sorted(results)
+
+    now = timezone.now()
+    with transaction.atomic():
+        for item in changed.values():
+            item.updated_at = now
+        Feedback.objects.bulk_update(list(changed.values()), ['status', 'tags', 'updated_at'])
+        retagged = {item.pk: item.tags for item in changed.values() if item._rollup_state[3] != item.tags}
+        if retagged:
+            tagging.sync_tags_many(retagged)
+        rollups.apply_changes((item._rollup_state, rollups.rollup_state(item)) for item in changed.values())
+        invalidate_summaries()
+        for item in changed.values():
+            events.feedback_changed(item, old_status=item._rollup_state[2])
+    return _sorted(results)
+
+
+def delete_feedback(ids, user, start=0):
+    """Delete one chunk of feedback ``ids``; results are indexed like ``ids``."""
+    feedback = _editable(set(ids), user)
+    results, doomed = [], {}
+    for index, pk in enumerate(ids, start):
+        item = feedback.get(pk)
+        if item is None:
+            results.append({'index': index, 'errors': NOT_FOUND})
+        elif not can_edit_feedback(user, item):
+            results.append({'index': index, 'errors': FORBIDDEN})
+        else:
+            doomed[pk] = item
+            results.append({'index': index, 'id': pk})
+    if not doomed:
+        return results
+
+    with transaction.atomic():
+        # One grouped rollup and index update instead of the per-row (and
+        # per cascaded comment) receivers
+        with signals.maintenance_muted():
+            Feedback.objects.filter(pk__in=list(doomed)).delete()
+        rollups.apply_changes((item._rollup_state, None) for item in doomed.values())
+        get_search_backend().remove_feedback_many(list(doomed))
+        invalidate_summaries()
+        for pk, item in doomed.items():
+            events.feedback_deleted(item.board_id, pk)
+    return results
+
+
+def create_comments(items, user, start=0):
+    """Validate and insert one chunk of ``{'feedback_id', 'text'}`` comment items."""
+    board_ids = dict(
+        filter_readable(Feedback.objects.filter(id__in=_int_values(items, 'feedback_id')), user)
+        .values_list('id', 'board_id')
+    )
+    valid, results = _validate(CommentBulkCreateSerializer, items, {'feedback_ids': board_ids}, start)
+    if not valid:
+        return _sorted(results)
+
+    with transaction.atomic():
+        created = Comment.objects.bulk_create([Comment(user=user, **data) for _, data in valid])
+        # One counter UPDATE per distinct number of new comments
+        by_amount = defaultdict(list)
+        for feedback_id, amount in Counter(comment.feedback_id for comment in created).items():
+            by_amount[amount].append(feedback_id)
+        for amount, ids in by_amount.items():
+            counters.adjust_many(ids, 'comment_count', amount)
+        get_search_backend().index_many(comments=created)
+        for comment in created:
+            events.comment_created(comment, board_ids[comment.feedback_id])
+
+    results += [{'index': index, 'id': comment.pk} for (index, _), comment in zip(valid, created)]
+    return _sorted(results)
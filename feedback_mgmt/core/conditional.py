@@ -0,0 +1,37 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+def not_modified(request, etag):
+    """A 304 for ``request`` if its ``If-None-Match`` matches, else ``None``.
+
+    ``etag`` is an unquoted string.
+    """
+    response = get_conditional_response(getattr(request, '_request', request), etag=quote_etag(etag))
+    if response is not None:
+        set_validators(response, etag)
+    return response
+
+
+def set_validators(response, etag):
+    response['ETag'] = quote_etag(etag)
+    # Validators are per viewer, so shared caches must not reuse them
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def aggregate_etag(prefix, user, values):
+    """ETag from the result of a validator aggregate.
+
+    ``values`` holds ``latest`` (the newest ``updated_at``) plus whatever
+    else the representation depends on, e.g. a renamed board's timestamp.
+    There is deliberately no Last-Modified: counter updates and deletes
+    change the counts and sums here but no timestamp, so a date alone
+    would answer 304 to a stale ``If-Modified-Since``.
+    """
+    digest = hashlib.sha1(repr(sorted(values.items())).encode()).hexdigest()[:20]
+    # Per viewer, since feedback carries is_upvoted and friends
+    return f'{prefix}-{digest}-{user.pk}'
@@ -0,0 +1,62 @@
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from . import events
+from .analytics import invalidate_summaries
+from .models import Comment, Feedback
+
+COUNTER_SOURCES = {
+    'upvote_count': (Feedback.upvotes.through, 'feedback_id'),
+    'comment_count': (Comment, 'feedback_id'),
+}
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+def adjust(feedback_id, field, delta):
+    """Atomically add ``delta`` to one counter column, never going below zero."""
+    return adjust_many([feedback_id], field, delta)
+
+
+def adjust_many(feedback_ids, field, delta):
+    """:func:`adjust` for several feedback rows in one ``UPDATE``."""
+    if not feedback_ids:
+        return 0
+    queryset = Feedback.objects.filter(pk__in=feedback_ids)
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    updated = queryset.update(**{field: F(field) + delta})
+    # Top voted items on the dashboard show both counters
+    invalidate_summaries()
+    events.counts_changed(feedback_ids)
+    return updated
+
+
+def actual_count(field):
+    model, fk = COUNTER_SOURCES[field]
+    rows = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(n=Count('*')).values('n')
+    return Coalesce(Subquery(rows), 0)
+
+
+def reconcile(dry_run=False, batch_size=RECONCILE_BATCH_SIZE):
+    """Repair counters that drifted from the source tables.
+
+    Returns the number of feedback rows that needed fixing.
+    """
+    actual = {f'actual_{field}': actual_count(field) for field in COUNTER_SOURCES}
+    drift = Q()
+    for field in COUNTER_SOURCES:
+        drift |= ~Q(**{field: F(f'actual_{field}')})
+    drifted_ids = list(
+        Feedback.objects.annotate(**actual).filter(drift).order_by('pk').values_list('pk', flat=True)
+    )
+    if dry_run:
+        return len(drifted_ids)
+
+    for start in range(0, len(drifted_ids), batch_size):
+        Feedback.objects.filter(pk__in=drifted_ids[start:start + batch_size]).update(
+            **{field: actual_count(field) for field in COUNTER_SOURCES}
+        )
+    if drifted_ids:
+        invalidate_summaries()
+    return len(drifted_ids)
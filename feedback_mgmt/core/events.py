@@ -0,0 +1,273 @@
+import asyncio
+import itertools
+import json
+import queue
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework.renderers import BaseRenderer
+
+from .models import Feedback
+
+# Events kept per board for Last-Event-ID replay
+HISTORY_SIZE = getattr(settings, 'BOARD_EVENT_HISTORY', 500)
+# Undelivered events a slow subscriber may queue before it is reset
+SUBSCRIBER_BUFFER = 1000
+# Streams end after this long and the client reconnects with Last-Event-ID,
+# which also bounds streams whose client went away unnoticed
+STREAM_SECONDS = getattr(settings, 'BOARD_EVENT_STREAM_SECONDS', 300)
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 3000
+
+KEEPALIVE = ': keepalive\n\n'
+# Missed events are gone: refetch, then open a fresh stream
+RESET = 'event: reset\ndata: {}\n\n'
+
+
+class Event:
+    __slots__ = ('id', 'board_id', 'type', 'data')
+
+    def __init__(self, board_id, type, data, id=None):
+        self.id = id
+        self.board_id = board_id
+        self.type = type
+        self.data = data
+
+    def encode(self):
+        """The event in Server-Sent Events wire format."""
+        data = json.dumps(self.data, separators=(',', ':'), default=str)
+        return f'id: {self.id}\nevent: {self.type}\ndata: {data}\n\n'
+
+
+class Subscription:
+    """One listener on a board; fed by the broker from any thread.
+
+    Async subscriptions (``loop`` given) are read with ``await get()``,
+    sync ones with ``get(timeout)``. ``overflowed`` is set once events had
+    to be dropped, after which the client has to refetch.
+    """
+
+    def __init__(self, board_id, loop=None):
+        self.board_id = board_id
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIBER_BUFFER) if loop else queue.Queue(SUBSCRIBER_BUFFER)
+        self.overflowed = False
+
+    def deliver(self, event):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._put, event)
+        else:
+            self._put(event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except (asyncio.QueueFull, queue.Full):
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Next event, or ``None`` after ``timeout`` seconds."""
+        if self.loop:
+            return self._get_async(timeout)
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def _get_async(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BaseBroker:
+    """Interface every event broker implements.
+
+    ``subscribe`` returns the subscription plus the events after
+    ``last_event_id`` that the client missed, or ``None`` when they can no
+    longer be replayed and the client has to refetch instead.
+    """
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def subscribe(self, board_id, last_event_id=None, loop=None):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """Pub/sub within one process, with a bounded replay history per board.
+
+    Event ids carry a per-process epoch, so a client reconnecting to another
+    process (or after a restart) is told to refetch instead of getting a
+    wrong replay. Use a shared backend when running several processes.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.epoch = secrets.token_hex(4)
+        self.sequence = itertools.count(1)
+        self.lock = threading.Lock()
+        self.history = defaultdict(lambda: deque(maxlen=history_size))
+        self.subscribers = defaultdict(set)
+
+    def _sequence_of(self, event_id):
+        epoch, _, sequence = (event_id or '').partition('-')
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def publish(self, event):
+        with self.lock:
+            sequence = next(self.sequence)
+            event.id = f'{self.epoch}-{sequence}'
+            self.history[event.board_id].append((sequence, event))
+            subscribers = list(self.subscribers.get(event.board_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def subscribe(self, board_id, last_event_id=None, loop=None):
+        subscription = Subscription(board_id, loop)
+        with self.lock:
+            self.subscribers[board_id].add(subscription)
+            if not last_event_id:
+                return subscription, []
+            history = self.history[board_id]
+            after = self._sequence_of(last_event_id)
+            complete = len(history) < history.maxlen
+            if after is None or not (complete or history[0][0] <= after + 1):
+                return subscription, None
+            return subscription, [event for sequence, event in history if sequence > after]
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscribers = self.subscribers.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscribers[subscription.board_id]
+
+
+_brokers = {}
+
+
+def get_broker():
+    """The configured broker, ``FEEDBACK_EVENT_BROKER`` or the in-memory one."""
+    path = getattr(settings, 'FEEDBACK_EVENT_BROKER', None) or 'core.events.InMemoryBroker'
+    if path not in _brokers:
+        _brokers[path] = import_string(path)()
+    return _brokers[path]
+
+
+def publish(board_id, type, data):
+    """Send an event to the board's listeners once the transaction commits."""
+    transaction.on_commit(lambda: get_broker().publish(Event(board_id, type, data)))
+
+
+def _feedback_data(feedback):
+    return {'id': feedback.pk, 'status': feedback.status, 'title': feedback.title}
+
+
+def feedback_created(feedback):
+    publish(feedback.board_id, 'feedback.created', _feedback_data(feedback))
+
+
+def feedback_changed(feedback, old_board_id=None, old_status=None):
+    """Events for an edit, given the board and status before it (if known)."""
+    if old_board_id is not None and old_board_id != feedback.board_id:
+        feedback_deleted(old_board_id, feedback.pk)
+        feedback_created(feedback)
+    elif old_status is not None and old_status != feedback.status:
+        publish(feedback.board_id, 'feedback.status', {**_feedback_data(feedback), 'previous': old_status})
+    else:
+        publish(feedback.board_id, 'feedback.updated', _feedback_data(feedback))
+
+
+def feedback_deleted(board_id, feedback_id):
+    publish(board_id, 'feedback.deleted', {'id': feedback_id})
+
+
+def comment_created(comment, board_id):
+    publish(board_id, 'comment.created', {
+        'id': comment.pk, 'feedback_id': comment.feedback_id,
+        'user_id': comment.user_id, 'created_at': comment.created_at.isoformat(),
+    })
+
+
+def counts_changed(feedback_ids):
+    """``feedback.counts`` events with the committed counter values."""
+    feedback_ids = list(feedback_ids)
+
+    def send():
+        broker = get_broker()
+        rows = Feedback.objects.filter(pk__in=feedback_ids).values_list(
+            'id', 'board_id', 'upvote_count', 'comment_count'
+        )
+        for pk, board_id, upvote_count, comment_count in rows:
+            broker.publish(Event(board_id, 'feedback.counts', {
+                'id': pk, 'upvote_count': upvote_count, 'comment_count': comment_count,
+            }))
+    transaction.on_commit(send)
+
+
+def _opening(replay):
+    yield f'retry: {RETRY_MS}\n\n'
+    if replay is None:
+        yield RESET
+    else:
+        yield from (event.encode() for event in replay)
+
+
+def stream(board_id, last_event_id=None):
+    """Server-Sent Events for one board, as a blocking iterator (WSGI)."""
+    broker = get_broker()
+    subscription, replay = broker.subscribe(board_id, last_event_id)
+    try:
+        yield from _opening(replay)
+        deadline = time.monotonic() + STREAM_SECONDS
+        while not subscription.overflowed and time.monotonic() < deadline:
+            event = subscription.get(HEARTBEAT_SECONDS)
+            yield event.encode() if event else KEEPALIVE
+        if subscription.overflowed:
+            yield RESET
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def astream(board_id, last_event_id=None):
+    """:func:`stream` for ASGI, where an idle stream holds no thread."""
+    broker = get_broker()
+    subscription, replay = broker.subscribe(board_id, last_event_id, loop=asyncio.get_running_loop())
+    try:
+        for chunk in _opening(replay):
+            yield chunk
+        deadline = time.monotonic() + STREAM_SECONDS
+        while not subscription.overflowed and time.monotonic() < deadline:
+            event = await subscription.get(HEARTBEAT_SECONDS)
+            yield event.encode() if event else KEEPALIVE
+        if subscription.overflowed:
+            yield RESET
+    finally:
+        broker.unsubscribe(subscription)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``Accept: text/event-stream`` through content negotiation.
+
+    The stream itself is a ``StreamingHttpResponse``; this only renders
+    error responses, as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode('utf-8')
@@ -0,0 +1,112 @@
+import csv
+import datetime
+import io
+import json
+import zlib
+
+from rest_framework import serializers
+
+from .models import Comment, Feedback
+
+EXPORT_CHUNK_SIZE = 2000
+# Encoded output is handed out in pieces of about this size
+FLUSH_BYTES = 64 * 1024
+
+# (column, values_list lookup) per export kind
+EXPORT_COLUMNS = {
+    'feedback': [
+        ('id', 'id'), ('board_id', 'board_id'), ('title', 'title'), ('description', 'description'),
+        ('status', 'status'), ('tags', 'tags'), ('created_by', 'created_by__username'),
+        ('upvote_count', 'upvote_count'), ('comment_count', 'comment_count'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ],
+    'comments': [
+        ('id', 'id'), ('feedback_id', 'feedback_id'), ('user', 'user__username'), ('text', 'text'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    ],
+    'votes': [('feedback_id', 'feedback_id'), ('user', 'user__username')],
+}
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def check_options(kind, output, compress):
+    if kind not in EXPORT_COLUMNS:
+        raise serializers.ValidationError({'kind': f"Must be one of: {', '.join(EXPORT_COLUMNS)}."})
+    if output not in EXPORT_FORMATS:
+        raise serializers.ValidationError({'output': f"Must be one of: {', '.join(EXPORT_FORMATS)}."})
+    if compress not in (None, '', 'gzip'):
+        raise serializers.ValidationError({'compress': "Must be 'gzip'."})
+
+
+def export_queryset(kind, feedback):
+    """``values_list`` rows of ``kind`` for the items in the ``feedback`` queryset.
+
+    Each kind is ordered along an index so the database can stream it.
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS[kind]]
+    if kind == 'feedback':
+        return feedback.order_by('id').values_list(*lookups)
+    ids = feedback.order_by().values('id')
+    if kind == 'comments':
+        return Comment.objects.filter(feedback_id__in=ids).order_by('feedback_id', 'created_at', 'id').values_list(*lookups)
+    return Feedback.upvotes.through.objects.filter(feedback_id__in=ids).order_by('feedback_id', 'user_id').values_list(*lookups)
+
+
+def _plain(value):
+    # Keep microseconds, unlike DjangoJSONEncoder
+    return value.isoformat() if isinstance(value, datetime.datetime) else value
+
+
+def _csv_chunks(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _ndjson_chunks(header, rows):
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps(dict(zip(header, map(_plain, row))), ensure_ascii=False)
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines, size = [], 0
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(kind, feedback, output='csv', compress=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Encoded export of ``kind`` as an iterator of ``bytes``.
+
+    Rows come from a chunked ``iterator()`` and are encoded as they arrive,
+    so memory stays flat however many rows are exported.
+    """
+    header = [column for column, _ in EXPORT_COLUMNS[kind]]
+    rows = export_queryset(kind, feedback).iterator(chunk_size=chunk_size)
+    chunks = _csv_chunks(header, rows) if output == 'csv' else _ndjson_chunks(header, rows)
+    return _gzip(chunks) if compress == 'gzip' else chunks
+
+
+def filename(kind, output, compress=None):
+    return f"{kind}-export.{output}{'.gz' if compress == 'gzip' else ''}"
+
+
+def content_type(output, compress=None):
+    return 'application/gzip' if compress == 'gzip' else f'{EXPORT_FORMATS[output]}; charset=utf-8'
@@ -0,0 +1,45 @@
+"""The feedback list filters, shared by the views and the background jobs."""
+from .access import filter_readable
+from .search import apply_search, get_backend as get_search_backend
+from .tagging import filter_by_tags, parse_tag_filter
+
+# Query parameters filter_feedback reads, e.g. to replay them in a job
+FEEDBACK_FILTER_PARAMS = ['board_id', 'status', 'tags', 'tags_match', 'search', 'search_comments']
+
+
+def find_search_hits(params, within):
+    """Hits for ``params['search']`` among the ``within`` feedback, by feedback id."""
+    include_comments = params.get('search_comments') in ('1', 'true')
+    hits = get_search_backend().search(params['search'], include_comments=include_comments, within=within)
+    return {hit.feedback_id: hit for hit in hits}
+
+
+def narrow_feedback(queryset, user, params):
+    """``queryset`` limited to what ``user`` can read and the non-search filters in ``params``."""
+    queryset = filter_readable(queryset, user)
+
+    board_id = params.get('board_id')
+    status_filter = params.get('status')
+    tags_filter = params.get('tags')
+
+    if board_id:
+        queryset = queryset.filter(board_id=board_id)
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    if tags_filter:
+        names, match = parse_tag_filter(tags_filter, params.get('tags_match'))
+        queryset = filter_by_tags(queryset, names, match)
+    return queryset
+
+
+def filter_feedback(queryset, user, params, search_hits=None):
+    """:func:`narrow_feedback` plus ``?search=``, searched within the narrowed rows.
+
+    ``search_hits`` (from :func:`find_search_hits`) saves searching again.
+    """
+    queryset = narrow_feedback(queryset, user, params)
+    if params.get('search'):
+        if search_hits is None:
+            search_hits = find_search_hits(params, queryset)
+        queryset = apply_search(queryset, list(search_hits.values()))
+    return queryset
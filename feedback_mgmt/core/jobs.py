@@ -0,0 +1,133 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('core.jobs')
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+# First retry delay in seconds, doubled on every further attempt
+RETRY_DELAY = getattr(settings, 'JOB_RETRY_DELAY', 10)
+MAX_RETRY_DELAY = getattr(settings, 'JOB_MAX_RETRY_DELAY', 3600)
+# Running jobs older than this are assumed to have lost their worker
+JOB_TIMEOUT = getattr(settings, 'JOB_TIMEOUT', 3600)
+# Files jobs produce, e.g. exports for GET /api/jobs/<id>/download/
+JOB_RESULTS_DIR = Path(getattr(settings, 'JOB_RESULTS_DIR', settings.BASE_DIR / 'job_results'))
+# Due jobs looked at per claim; more than one so workers racing for the
+# oldest do not all come back empty-handed
+CLAIM_CANDIDATES = 5
+
+_handlers = {}
+
+
+def handler(kind, max_attempts=3):
+    """Register ``func(job)`` as the handler of ``kind`` jobs.
+
+    The return value is stored as the job's ``result`` (it must be JSON
+    serializable); raising marks the attempt failed. Handlers that are not
+    safe to run twice should register with ``max_attempts=1``.
+    """
+    def register(func):
+        _handlers[kind] = (func, max_attempts)
+        return func
+    return register
+
+
+def enqueue(kind, payload=None, user=None):
+    if kind not in _handlers:
+        raise ValueError(f'No handler for {kind!r} jobs')
+    return Job.objects.create(
+        kind=kind, payload=payload or {}, created_by=user, max_attempts=_handlers[kind][1],
+    )
+
+
+def result_path(job, filename):
+    return JOB_RESULTS_DIR / f'{job.pk}-{filename}'
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}'
+
+
+def claim(worker):
+    """Mark the oldest due job running for ``worker`` and return it, or ``None``.
+
+    The claim is a conditional UPDATE, so of several workers only one wins
+    a job on any database, without row locks.
+    """
+    now = timezone.now()
+    due = Job.objects.filter(status=QUEUED, run_after__lte=now).order_by('run_after', 'id')
+    for job_id in due.values_list('id', flat=True)[:CLAIM_CANDIDATES]:
+        claimed = Job.objects.filter(pk=job_id, status=QUEUED).update(
+            status=RUNNING, worker=worker, started_at=now, finished_at=None, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def retry_delay(attempts):
+    return min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def execute(job):
+    """Run a claimed job and record how it went."""
+    func = _handlers.get(job.kind, (None,))[0]
+    try:
+        if func is None:
+            raise LookupError(f'No handler for {job.kind!r} jobs')
+        result = func(job)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s (%s) failed on attempt %d', job.pk, job.kind, job.attempts)
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status=QUEUED, error=error, run_after=now + timedelta(seconds=retry_delay(job.attempts)),
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(status=FAILED, error=error, finished_at=now)
+        return False
+    Job.objects.filter(pk=job.pk).update(status=SUCCEEDED, result=result, error='', finished_at=timezone.now())
+    return True
+
+
+def requeue_stale(timeout=JOB_TIMEOUT):
+    """Give jobs whose worker died mid-run back to the queue (or fail them).
+
+    Returns how many were recovered.
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = Job.objects.filter(status=RUNNING, started_at__lt=cutoff)
+    error = f'Worker lost: still running after {timeout}s'
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=FAILED, error=error, finished_at=timezone.now(),
+    )
+    return failed + stale.update(status=QUEUED, error=error)
+
+
+def work(stop, poll_interval=1.0, once=False):
+    """Claim and run jobs until ``stop`` is set (or, with ``once``, the queue is empty)."""
+    name = worker_name()
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            job = claim(name)
+            if job is None:
+                if once:
+                    return
+                stop.wait(poll_interval)
+                continue
+            execute(job)
+    finally:
+        connection.close()
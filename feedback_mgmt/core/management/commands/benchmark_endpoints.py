@@ -0,0 +1,67 @@
+import json
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import BUDGETS, Runner, benchmark_cases, benchmark_fixtures, check_budget
+
+COLUMNS = ['name', 'status', 'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes']
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive every API endpoint through the test client against the current data '
+        '(see `seed`) and report latency percentiles, query counts and response sizes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--only', help='Regex of case names to run')
+        parser.add_argument('--budgets', help='JSON file of {case: {p95_ms, queries, bytes}} overrides')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file')
+        parser.add_argument('--no-fail', action='store_true', help='Report budget violations without failing')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        fixtures = benchmark_fixtures()
+        if fixtures is None:
+            raise CommandError('Not enough data to benchmark; run `manage.py seed` first')
+
+        budgets = dict(BUDGETS)
+        if options['budgets']:
+            with open(options['budgets']) as fh:
+                for name, budget in json.load(fh).items():
+                    budgets[name] = {**budgets.get(name, {}), **budget}
+
+        cases = benchmark_cases(fixtures)
+        if options['only']:
+            pattern = re.compile(options['only'])
+            cases = [case for case in cases if pattern.search(case.name)]
+
+        runner = Runner(fixtures, iterations=options['iterations'], warmup=options['warmup'])
+        results = []
+        failures = 0
+        self.stdout.write(' '.join(f'{column:>10}' if i else f'{column:<26}' for i, column in enumerate(COLUMNS)))
+        for case in cases:
+            result = runner.run(case)
+            result['violations'] = check_budget(result, budgets)
+            results.append(result)
+            line = ' '.join(
+                f'{result[column]:>10}' if i else f'{result[column]:<26}' for i, column in enumerate(COLUMNS)
+            )
+            if result['violations']:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{line}  {'; '.join(result['violations'])}"))
+            else:
+                self.stdout.write(line)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(results, fh, indent=2)
+
+        summary = f'{len(results)} endpoints benchmarked, {failures} over budget'
+        if failures and not options['no_fail']:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,125 @@
+import itertools
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Board, Feedback, User
+from core.views import BoardViewSet, CommentViewSet, FEEDBACK_ORDERINGS, FeedbackViewSet
+
+PAGE_SLICE = 21
+
+# Plan lines that mean "no usable index" on each backend
+PROBLEM_PATTERNS = {
+    'sqlite': [
+        ('full scan', re.compile(r'\bSCAN (?!.*\bUSING\b)(\S+)')),
+        ('temp b-tree', re.compile(r'USE TEMP B-TREE FOR (.+)')),
+    ],
+    'postgresql': [
+        ('full scan', re.compile(r'Seq Scan on (\S+)')),
+        ('sort', re.compile(r'\bSort\b')),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN for every filter/ordering combination the list endpoints can '
+        'produce and flag full table scans and temporary sorts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--role', action='append', choices=[key for key, _ in User.ROLE_CHOICES],
+                            help='Viewer role(s) to audit (default: admin and contributor)')
+        parser.add_argument('--ignore', action='append', default=[],
+                            help='Regex of plan lines to accept, e.g. "FOR DISTINCT" (repeatable)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only flagged ones')
+        parser.add_argument('--fail-on-issues', action='store_true', help='Exit non-zero when anything is flagged')
+
+    def handle(self, *args, **options):
+        patterns = PROBLEM_PATTERNS.get(connection.vendor)
+        if patterns is None:
+            raise CommandError(f'No plan checks for the {connection.vendor} backend')
+        ignored = [re.compile(pattern) for pattern in options['ignore']]
+        roles = options['role'] or ['admin', 'contributor']
+
+        flagged = 0
+        skipped = 0
+        total = 0
+        for role in roles:
+            user = User(id=0, username=f'explain-{role}', role=role)
+            for label, queryset in self.querysets(user):
+                try:
+                    queryset.query.sql_with_params()
+                except EmptyResultSet:
+                    # Filters that cannot match (e.g. a tag nobody uses) never reach the database
+                    skipped += 1
+                    continue
+                total += 1
+                plan = queryset.explain()
+                issues = []
+                for line in plan.splitlines():
+                    if any(pattern.search(line) for pattern in ignored):
+                        continue
+                    for name, pattern in patterns:
+                        if pattern.search(line):
+                            issues.append(f'{name}: {line.strip()}')
+                if issues:
+                    flagged += 1
+                    self.stdout.write(self.style.WARNING(f'[{role}] {label}'))
+                    for issue in issues:
+                        self.stdout.write(f'    {issue}')
+                elif options['verbose_plans']:
+                    self.stdout.write(self.style.SUCCESS(f'[{role}] {label}'))
+                if options['verbose_plans']:
+                    self.stdout.write('\n'.join(f'      {line}' for line in plan.splitlines()))
+
+        summary = f'{total} querysets explained, {flagged} flagged'
+        if skipped:
+            summary += f', {skipped} skipped (cannot match anything)'
+        if flagged and options['fail_on_issues']:
+            raise CommandError(summary)
+        self.stdout.write(summary)
+
+    def querysets(self, user):
+        board_id = Board.objects.values_list('id', flat=True).first() or 1
+        feedback_id = Feedback.objects.values_list('id', flat=True).first() or 1
+
+        feedback_filters = [
+            {},
+            {'board_id': board_id},
+            {'status': 'open'},
+            {'board_id': board_id, 'status': 'open'},
+            {'tags': 'ui'},
+            {'tags': 'ui,api', 'tags_match': 'all'},
+        ]
+        orderings = [ordering for ordering in FEEDBACK_ORDERINGS if ordering != 'relevance']
+        for filters, ordering in itertools.product(feedback_filters, orderings):
+            params = {**filters, 'ordering': ordering}
+            yield self.describe('feedback', params), self.list_queryset(FeedbackViewSet, user, params)
+
+        for params in [{}, {'expand': 'members'}]:
+            yield self.describe('boards', params), self.list_queryset(BoardViewSet, user, params)
+
+        # Listing comments requires a feedback_id
+        params = {'feedback_id': feedback_id}
+        yield self.describe('comments', params), self.list_queryset(CommentViewSet, user, params)
+        yield f'feedback/{feedback_id}/comments', FeedbackViewSet.thread_comments(feedback_id)[:PAGE_SLICE]
+
+    @staticmethod
+    def describe(endpoint, params):
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return f'{endpoint}?{query}' if query else endpoint
+
+    @staticmethod
+    def list_queryset(viewset_class, user, params):
+        """The (first page of the) queryset a list request with ``params`` builds."""
+        django_request = APIRequestFactory().get('/', params)
+        force_authenticate(django_request, user=user)
+        view = viewset_class(action='list', detail=False, format_kwarg=None, kwargs={})
+        view.request = Request(django_request)
+        view.request.user = user
+        return view.get_queryset()[:PAGE_SLICE]
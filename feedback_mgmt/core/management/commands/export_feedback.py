@@ -0,0 +1,56 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core import export
+from core.models import Feedback
+from core.tagging import filter_by_tags, parse_tag_filter
+
+
+class Command(BaseCommand):
+    help = 'Stream feedback, comments or votes to CSV or NDJSON (optionally gzipped) with constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(export.EXPORT_COLUMNS), default='feedback')
+        parser.add_argument('--format', dest='output', choices=list(export.EXPORT_FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument(
+            '--board', type=int, action='append', dest='board_ids',
+            help='Only export this board id (repeatable)',
+        )
+        parser.add_argument('--status', choices=[key for key, _ in Feedback.STATUS_CHOICES])
+        parser.add_argument('--tags', help='Comma-separated tags, any of them must match')
+        parser.add_argument('--chunk-size', type=int, default=export.EXPORT_CHUNK_SIZE)
+        parser.add_argument('-o', '--out', default='-', help="Output file, '-' for stdout")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        feedback = Feedback.objects.all()
+        if options['board_ids']:
+            feedback = feedback.filter(board_id__in=options['board_ids'])
+        if options['status']:
+            feedback = feedback.filter(status=options['status'])
+        if options['tags']:
+            try:
+                names, match = parse_tag_filter(options['tags'])
+            except ValidationError as exc:
+                raise CommandError(exc.detail)
+            feedback = filter_by_tags(feedback, names, match)
+
+        chunks = export.stream(
+            options['kind'], feedback, options['output'],
+            compress='gzip' if options['gzip'] else None, chunk_size=options['chunk_size'],
+        )
+        written = 0
+        target = sys.stdout.buffer if options['out'] == '-' else open(options['out'], 'wb')
+        try:
+            for chunk in chunks:
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if target is not sys.stdout.buffer:
+                target.close()
+        if options['out'] != '-':
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['out']}"))
@@ -0,0 +1,78 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import bulk
+from core.models import User
+
+FORMATS = ['csv', 'jsonl']
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream feedback from a CSV or JSONL file (title, description, board_id, status, tags) '
+        'into the database in chunked bulk inserts, with constant memory'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--user', required=True, help='Username the feedback is created by')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--board', type=int, help='Board id for rows without a board_id')
+        parser.add_argument('--chunk-size', type=int, default=bulk.BULK_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named {options['user']!r}")
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in FORMATS:
+            raise CommandError(f"Unknown format {file_format!r}; pass --format ({', '.join(FORMATS)})")
+
+        created = failed = 0
+        with (sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')) as source:
+            rows = self.read_csv(source) if file_format == 'csv' else self.read_jsonl(source)
+            rows = self.with_default_board(rows, options['board'])
+            for chunk in bulk.chunked(rows, options['chunk_size']):
+                # Each chunk is committed on its own, so a failure late in a
+                # large file keeps everything imported before it
+                for result in bulk.create_feedback([row for _, row in chunk], user):
+                    if 'errors' in result:
+                        failed += 1
+                        line = chunk[result['index']][0]
+                        self.stderr.write(f"line {line}: {json.dumps(result['errors'])}")
+                    else:
+                        created += 1
+                if options['verbosity'] >= 2:
+                    self.stdout.write(f'{created} created, {failed} failed so far')
+
+        style = self.style.WARNING if failed else self.style.SUCCESS
+        self.stdout.write(style(f'Imported {created} feedback items, {failed} rows failed'))
+
+    def read_csv(self, source):
+        # Empty cells fall back to the field defaults
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}
+
+    def read_jsonl(self, source):
+        for line, text in enumerate(source, 1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError as exc:
+                raise CommandError(f'line {line}: invalid JSON ({exc})')
+            yield line, row if isinstance(row, dict) else {}
+
+    def with_default_board(self, rows, board_id):
+        for line, row in rows:
+            if board_id is not None and not row.get('board_id'):
+                row['board_id'] = board_id
+            yield line, row
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core import rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily feedback and tag rollup tables from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board', type=int, action='append', dest='board_ids',
+            help='Only rebuild rows for this board id (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        counts = rollups.rebuild(board_ids=options['board_ids'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {counts['daily_stats']} daily stat rows and {counts['tag_stats']} tag stat rows"
+        ))
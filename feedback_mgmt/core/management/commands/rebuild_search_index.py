@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.search import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for feedback and comments'
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'{type(backend).__name__}: indexed {count} documents'
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core import counters
+
+
+class Command(BaseCommand):
+    help = 'Repair Feedback.upvote_count / comment_count drift from the vote and comment tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows drifted')
+        parser.add_argument('--batch-size', type=int, default=counters.RECONCILE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        fixed = counters.reconcile(dry_run=options['dry_run'], batch_size=options['batch_size'])
+        if options['dry_run']:
+            self.stdout.write(f'{fixed} feedback rows have drifted counters')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Repaired counters on {fixed} feedback rows'))
@@ -0,0 +1,73 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core import jobs
+
+# Seconds between sweeps for jobs whose worker died
+STALE_CHECK_INTERVAL = 60
+
+
+def _process_main(stop, poll_interval, once):
+    # Ctrl-C reaches the whole process group; let the parent stop the
+    # children through ``stop`` so they finish the job in hand
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    jobs.work(stop, poll_interval, once)
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (exports, bulk writes, recomputations) in a thread or process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Jobs run at the same time')
+        parser.add_argument(
+            '--pool', choices=['thread', 'process'], default='thread',
+            help='Threads share one process; processes also run CPU-bound jobs in parallel',
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls of an empty queue')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is due instead of waiting')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+        recovered = jobs.requeue_stale()
+        if recovered:
+            self.stdout.write(self.style.WARNING(f'Recovered {recovered} jobs from lost workers'))
+
+        worker_args = (options['poll_interval'], options['once'])
+        if options['pool'] == 'thread':
+            stop = threading.Event()
+            workers = [
+                threading.Thread(target=jobs.work, args=(stop, *worker_args), name=f'job-worker-{index}')
+                for index in range(options['concurrency'])
+            ]
+        else:
+            context = multiprocessing.get_context('fork')
+            stop = context.Event()
+            # Forked children must not share the parent's connections
+            connections.close_all()
+            workers = [
+                context.Process(target=_process_main, args=(stop, *worker_args), name=f'job-worker-{index}')
+                for index in range(options['concurrency'])
+            ]
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"{options['concurrency']} {options['pool']} workers running")
+        try:
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(timeout=STALE_CHECK_INTERVAL / len(workers))
+                if not stop.is_set():
+                    jobs.requeue_stale()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping after the jobs in progress...')
+            stop.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
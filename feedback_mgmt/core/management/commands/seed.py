@@ -0,0 +1,195 @@
+import contextlib
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core import counters, rollups
+from core.models import Board, Comment, Feedback, FeedbackTag, User
+from core.search import get_backend as get_search_backend
+from core.tagging import get_or_create_tags, unique_tags
+
+SEED_PREFIX = 'seed-'
+SEED_PASSWORD = 'seed-password'
+
+TAG_POOL = [
+    'ui', 'ux', 'api', 'performance', 'mobile', 'billing', 'export', 'import', 'search',
+    'notifications', 'security', 'accessibility', 'integrations', 'reporting', 'onboarding',
+]
+WORDS = (
+    'dashboard board export filter search comment vote status report user team page load slow '
+    'fast button color theme dark mobile email invite sync import csv api token chart column '
+    'kanban drag drop notification setting profile password login error crash bug feature'
+).split()
+
+
+@contextlib.contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we set."""
+    fields = [
+        field for model in models for field in model._meta.fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Bulk-load deterministic fake users, boards, feedback, votes and comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--boards', type=int, default=20)
+        parser.add_argument('--feedback', type=int, default=5000)
+        parser.add_argument('--upvotes', type=int, default=20000, help='Total upvotes (approximate)')
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--members-per-board', type=int, default=15)
+        parser.add_argument('--private-ratio', type=float, default=0.3)
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many days')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded data first')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['boards'] < 1:
+            raise CommandError('Need at least one user and one board')
+        seeded = User.objects.filter(username__startswith=SEED_PREFIX)
+        if seeded.exists():
+            if not options['clear']:
+                raise CommandError('Seed data already exists; pass --clear to replace it')
+            # Cascades to boards, feedback, votes and comments created by seed users
+            seeded.delete()
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = max(options['days'], 1)
+
+        with transaction.atomic(), explicit_timestamps(User, Board, Feedback, Comment):
+            users = self.create_users(options['users'])
+            boards, participants = self.create_boards(users, options['boards'], options['private_ratio'],
+                                                      options['members_per_board'])
+            feedback = self.create_feedback(participants, boards, options['feedback'])
+            self.create_upvotes(participants, feedback, options['upvotes'])
+            self.create_comments(participants, feedback, options['comments'])
+
+        # bulk_create skips signals, so derive everything the signals maintain
+        self.stdout.write('Rebuilding counters, rollups and the search index...')
+        counters.reconcile(batch_size=self.batch_size)
+        rollups.rebuild()
+        get_search_backend().rebuild()
+        # Fresh planner statistics, so `board_id IN (...)` scopes still use the sort indexes
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users, {len(boards)} boards, {len(feedback)} feedback items "
+            f"(password for every seed user: '{SEED_PASSWORD}')"
+        ))
+
+    def timestamp(self):
+        return self.now - timedelta(seconds=self.rng.randrange(self.days * 86400))
+
+    def sentence(self, low, high):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high))).capitalize()
+
+    def create_users(self, count):
+        password = make_password(SEED_PASSWORD)
+        users = []
+        for i in range(count):
+            # A couple of staff accounts, everybody else contributes
+            role = 'admin' if i == 0 else 'moderator' if i == 1 else 'contributor'
+            joined = self.now - timedelta(days=self.days)
+            users.append(User(
+                username=f'{SEED_PREFIX}user-{i:06d}', email=f'user{i}@seed.example',
+                password=password, role=role, is_staff=role == 'admin',
+                date_joined=joined, created_at=joined, updated_at=joined,
+            ))
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    def create_boards(self, users, count, private_ratio, members_per_board):
+        """The boards, and who may write on each: everybody, or a private board's members."""
+        creator = users[0]
+        boards = Board.objects.bulk_create([
+            Board(
+                name=f'Seed board {i:04d}', description=self.sentence(5, 15),
+                public=self.rng.random() >= private_ratio, created_by=creator,
+                created_at=self.now - timedelta(days=self.days), updated_at=self.now,
+            )
+            for i in range(count)
+        ], batch_size=self.batch_size)
+
+        Membership = Board.members.through
+        rows = []
+        participants = {}
+        for board in boards:
+            members = self.rng.sample(users, min(members_per_board, len(users)))
+            rows.extend(Membership(board_id=board.id, user_id=user.id) for user in members)
+            # The creator is an admin and reads every board
+            participants[board.id] = users if board.public else members or [creator]
+        Membership.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+        return boards, participants
+
+    def create_feedback(self, participants, boards, count):
+        statuses = [key for key, _ in Feedback.STATUS_CHOICES]
+        status_weights = [50, 25, 15, 10]
+        feedback = []
+        for _ in range(count):
+            created = self.timestamp()
+            tags = self.rng.sample(TAG_POOL, self.rng.randint(0, 3))
+            board = self.rng.choice(boards)
+            feedback.append(Feedback(
+                title=self.sentence(3, 8), description=self.sentence(15, 60),
+                board=board, status=self.rng.choices(statuses, status_weights)[0],
+                tags=', '.join(tags), created_by=self.rng.choice(participants[board.id]),
+                created_at=created, updated_at=created,
+            ))
+        feedback = Feedback.objects.bulk_create(feedback, batch_size=self.batch_size)
+
+        tag_ids = get_or_create_tags(TAG_POOL)
+        links = [
+            FeedbackTag(feedback_id=item.id, tag_id=tag_ids[name])
+            for item in feedback for name in unique_tags(item.tags)
+        ]
+        FeedbackTag.objects.bulk_create(links, batch_size=self.batch_size, ignore_conflicts=True)
+        return feedback
+
+    def create_upvotes(self, participants, feedback, count):
+        if not feedback:
+            return
+        Upvote = Feedback.upvotes.through
+        # Skewed towards a few popular items, like real boards
+        weights = [1 / (rank + 1) for rank in range(len(feedback))]
+        popular = self.rng.sample(feedback, len(feedback))
+        pairs = set()
+        for item in self.rng.choices(popular, weights, k=count):
+            pairs.add((item.id, self.rng.choice(participants[item.board_id]).id))
+        Upvote.objects.bulk_create(
+            [Upvote(feedback_id=feedback_id, user_id=user_id) for feedback_id, user_id in sorted(pairs)],
+            batch_size=self.batch_size, ignore_conflicts=True,
+        )
+
+    def create_comments(self, participants, feedback, count):
+        if not feedback:
+            return
+        comments = []
+        for _ in range(count):
+            item = self.rng.choice(feedback)
+            created = item.created_at + (self.now - item.created_at) * self.rng.random()
+            comments.append(Comment(
+                feedback_id=item.id, user=self.rng.choice(participants[item.board_id]), text=self.sentence(5, 30),
+                created_at=created, updated_at=created,
+            ))
+            if len(comments) >= self.batch_size:
+                Comment.objects.bulk_create(comments)
+                comments = []
+        Comment.objects.bulk_create(comments)
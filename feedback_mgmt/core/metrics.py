@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+logger = logging.getLogger('core.slow_requests')
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Requests slower than this are logged with their SQL; None turns it off
+SLOW_REQUEST_MS = getattr(settings, 'SLOW_REQUEST_MS', None)
+SLOW_REQUEST_QUERIES = 10
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """What one request spent, filled in by the hooks below.
+
+    Lives in a context variable, so queries that ASGI runs in
+    ``sync_to_async`` threads count towards their request too.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.serialize_depth = 0
+        self.statements = [] if SLOW_REQUEST_MS is not None else None
+        self.lock = threading.Lock()
+
+    def record_query(self, sql, seconds):
+        with self.lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            if self.statements is not None:
+                self.statements.append((seconds, sql))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_seconds * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def start():
+    """Begin measuring the current request; pass the result to :func:`stop`."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook, installed on every connection."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, time.perf_counter() - started)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializing():
+    """Time serialization; nested serializers count once, in the outermost."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.serialize_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_depth -= 1
+        if not metrics.serialize_depth:
+            metrics.serialize_seconds += time.perf_counter() - started
+
+
+def view_name(view_func, method):
+    """``FeedbackViewSet.list``-style label for a resolved view."""
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__qualname__}'
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{cls.__name__}.{actions.get(method.lower(), method.lower())}'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Registry:
+    """Per-process aggregates of the request metrics, by view."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = defaultdict(int)
+        self.latency = {}
+        self.totals = defaultdict(lambda: defaultdict(float))
+
+    def observe(self, view, method, status, metrics, seconds, size):
+        with self.lock:
+            self.requests[view, method, status] += 1
+            if view not in self.latency:
+                self.latency[view] = Histogram(LATENCY_BUCKETS)
+            self.latency[view].observe(seconds)
+            totals = self.totals[view]
+            totals['db_queries'] += metrics.queries
+            totals['db_seconds'] += metrics.db_seconds
+            totals['serialize_seconds'] += metrics.serialize_seconds
+            if size is not None:
+                totals['response_bytes'] += size
+
+    def render(self):
+        """Everything in the Prometheus text exposition format."""
+        with self.lock:
+            lines = [
+                '# HELP feedback_http_requests_total Requests by view, method and status.',
+                '# TYPE feedback_http_requests_total counter',
+            ]
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'feedback_http_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}'
+                )
+            lines += [
+                '# HELP feedback_http_request_duration_seconds Request latency by view.',
+                '# TYPE feedback_http_request_duration_seconds histogram',
+            ]
+            for view, histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                    cumulative += count
+                    lines.append(f'feedback_http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'feedback_http_request_duration_seconds_sum{{view="{view}"}} {histogram.sum:.6f}')
+                lines.append(f'feedback_http_request_duration_seconds_count{{view="{view}"}} {cumulative}')
+            for name, help_text in (
+                ('db_queries', 'SQL queries run.'),
+                ('db_seconds', 'Time spent executing SQL.'),
+                ('serialize_seconds', 'Time spent in serializers.'),
+                ('response_bytes', 'Response body bytes (streamed bodies not included).'),
+            ):
+                metric = f'feedback_{name}_total'
+                lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+                for view, totals in sorted(self.totals.items()):
+                    lines.append(f'{metric}{{view="{view}"}} {totals[name]:g}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def finish(request, response, metrics):
+    """Aggregate, annotate and (if slow) log a finished request."""
+    seconds = metrics.elapsed()
+    view = metrics.view or 'unresolved'
+    size = None if response.streaming else len(response.content)
+    registry.observe(view, request.method, response.status_code, metrics, seconds, size)
+    if getattr(settings, 'SERVER_TIMING', True):
+        response['Server-Timing'] = metrics.server_timing(seconds)
+    if SLOW_REQUEST_MS is not None and seconds * 1000 >= SLOW_REQUEST_MS:
+        slowest = sorted(metrics.statements, key=lambda statement: statement[0], reverse=True)
+        logger.warning(
+            'Slow request: %s %s (%s) took %.0fms, %d queries in %.0fms\n%s',
+            request.method, request.get_full_path(), view, seconds * 1000, metrics.queries,
+            metrics.db_seconds * 1000,
+            '\n'.join(f'  {duration * 1000:.1f}ms {sql}' for duration, sql in slowest[:SLOW_REQUEST_QUERIES]),
+        )
+    return response
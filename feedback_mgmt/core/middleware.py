@@ -0,0 +1,105 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics, routers, throttling
+
+
+class InstrumentationMiddleware:
+    """Times each request and counts its queries (see ``core.metrics``).
+
+    Goes first in ``MIDDLEWARE`` so the other middleware are timed too.
+    Adds a ``Server-Timing`` header and feeds ``/api/metrics/``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        request_metrics, token = metrics.start()
+        request.metrics = request_metrics
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return metrics.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.start()
+        request.metrics = request_metrics
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.stop(token)
+        return metrics.finish(request, response, request_metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.view = metrics.view_name(view_func, request.method)
+
+
+class RateLimitHeadersMiddleware:
+    """Adds the ``RateLimit-*`` headers of ``core.throttling`` to responses."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.add_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_headers(request, await self.get_response(request))
+
+    def add_headers(self, request, response):
+        for name, value in getattr(request, throttling.HEADERS_ATTR, {}).items():
+            response[name] = value
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Sends the reads of safe-method requests to the replica (see ``core.routers``).
+
+    Unused unless a ``replica`` database is configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not routers.replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = routers.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.stop(token)
+        routers.remember_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = routers.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.stop(token)
+        routers.remember_write(request, response)
+        return response
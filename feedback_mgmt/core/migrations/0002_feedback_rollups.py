@@ -0,0 +1,84 @@
+# Generated by Django 4.2.23 on 2026-10-17 16:04
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def split_tags(tags):
+    # Frozen copy of core.models.split_tags
+    if not tags:
+        return []
+    return [tag.strip() for tag in tags.split(',') if tag.strip()]
+
+
+def backfill_rollups(apps, schema_editor):
+    # Frozen copy of core.rollups.rebuild as of this migration
+    Feedback = apps.get_model('core', 'Feedback')
+    FeedbackDailyStat = apps.get_model('core', 'FeedbackDailyStat')
+    TagDailyStat = apps.get_model('core', 'TagDailyStat')
+
+    rows = (
+        Feedback.objects.annotate(day=TruncDate('created_at'))
+        .order_by()
+        .values('board_id', 'day', 'status')
+        .annotate(count=Count('id'))
+    )
+    FeedbackDailyStat.objects.bulk_create([FeedbackDailyStat(**row) for row in rows.iterator()], batch_size=1000)
+
+    tag_counts = Counter()
+    tag_rows = Feedback.objects.exclude(tags='').values_list('board_id', 'created_at', 'tags').order_by()
+    for board_id, created_at, tags in tag_rows.iterator(chunk_size=1000):
+        day = timezone.localdate(created_at) if timezone.is_aware(created_at) else created_at.date()
+        for tag in set(split_tags(tags)):
+            tag_counts[(board_id, day, tag)] += 1
+    TagDailyStat.objects.bulk_create(
+        [
+            TagDailyStat(board_id=board_id, day=day, tag=tag, count=count)
+            for (board_id, day, tag), count in tag_counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tag', models.CharField(max_length=200)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_stats', to='core.board')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FeedbackDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('rejected', 'Rejected')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='core.board')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='tagdailystat',
+            constraint=models.UniqueConstraint(fields=('board', 'day', 'tag'), name='uniq_tag_daily_stat'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedbackdailystat',
+            constraint=models.UniqueConstraint(fields=('board', 'day', 'status'), name='uniq_feedback_daily_stat'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
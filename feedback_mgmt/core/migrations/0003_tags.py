@@ -0,0 +1,46 @@
+# Generated by Django 4.2.23 on 2026-10-17 16:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_feedback_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FeedbackTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feedback', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='core.feedback')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_links', to='core.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='feedback', through='core.FeedbackTag', to='core.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='feedbacktag',
+            index=models.Index(fields=['tag', 'feedback'], name='feedback_tag_lookup_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='feedbacktag',
+            constraint=models.UniqueConstraint(fields=('feedback', 'tag'), name='uniq_feedback_tag'),
+        ),
+    ]
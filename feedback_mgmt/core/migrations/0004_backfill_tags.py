@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def split_tags(tags):
+    # Frozen copy of core.models.split_tags
+    if not tags:
+        return []
+    return [tag.strip() for tag in tags.split(',') if tag.strip()]
+
+
+def backfill_tags(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    Tag = apps.get_model('core', 'Tag')
+    FeedbackTag = apps.get_model('core', 'FeedbackTag')
+
+    rows = Feedback.objects.exclude(tags='').values_list('id', 'tags').order_by('id')
+    parsed = [(feedback_id, list(dict.fromkeys(split_tags(tags)))) for feedback_id, tags in rows.iterator()]
+
+    names = {name for _, tag_names in parsed for name in tag_names}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True, batch_size=500)
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+
+    FeedbackTag.objects.bulk_create(
+        [
+            FeedbackTag(feedback_id=feedback_id, tag_id=tag_ids[name])
+            for feedback_id, tag_names in parsed
+            for name in tag_names
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
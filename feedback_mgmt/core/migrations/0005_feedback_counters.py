@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-17 16:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Feedback = apps.get_model('core', 'Feedback')
+    Comment = apps.get_model('core', 'Comment')
+    Upvote = Feedback.upvotes.through
+
+    def count_of(model, fk):
+        rows = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(n=Count('*')).values('n')
+        return Coalesce(Subquery(rows), 0)
+
+    Feedback.objects.update(
+        upvote_count=count_of(Upvote, 'feedback_id'),
+        comment_count=count_of(Comment, 'feedback_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_backfill_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='upvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-upvote_count', '-created_at'], name='feedback_upvotes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-comment_count', '-created_at'], name='feedback_comments_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_search_index USING fts5("
+    "title, body, feedback_id UNINDEXED, comment_id UNINDEXED, "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    "INSERT INTO core_search_index (title, body, feedback_id, comment_id) "
+    "SELECT title, description, id, 0 FROM core_feedback",
+    "INSERT INTO core_search_index (title, body, feedback_id, comment_id) "
+    "SELECT '', text, feedback_id, id FROM core_comment",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS core_search_index"]
+
+# Must match the expressions in core.search.PostgresSearchBackend
+POSTGRES_CREATE = [
+    "CREATE INDEX IF NOT EXISTS core_feedback_search_idx ON core_feedback "
+    "USING GIN (to_tsvector('english'::regconfig, title || ' ' || description))",
+    "CREATE INDEX IF NOT EXISTS core_comment_search_idx ON core_comment "
+    "USING GIN (to_tsvector('english'::regconfig, text))",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS core_feedback_search_idx",
+    "DROP INDEX IF EXISTS core_comment_search_idx",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_feedback_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}),
+            _run({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
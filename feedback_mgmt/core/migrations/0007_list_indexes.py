@@ -0,0 +1,61 @@
+# Generated by Django 4.2.23 on 2026-10-17 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='feedback',
+            name='feedback_upvotes_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='feedback',
+            name='feedback_comments_idx',
+        ),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(fields=['-created_at'], name='board_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['feedback', 'created_at', 'id'], name='comment_feedback_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-created_at', '-id'], name='feedback_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', '-created_at', '-id'], name='feedback_board_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='feedback_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', 'status', '-created_at', '-id'], name='feedback_board_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-upvote_count', '-created_at', '-id'], name='feedback_votes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['board', '-upvote_count', '-created_at', '-id'], name='feedback_board_votes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['status', '-upvote_count', '-created_at', '-id'], name='feedback_status_votes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-comment_count', '-created_at', '-id'], name='feedback_comment_count_idx'),
+        ),
+    ]
@@ -3,6 +3,14 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import MinLengthValidator
+from django.utils import timezone
+
+
+def split_tags(tags):
+    if not tags:
+        return []
+    return [tag.strip() for tag in tags.split(',') if tag.strip()]
+
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -46,10 +54,26 @@ class Board(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='board_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+class Tag(models.Model):
+    name = models.CharField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+# Denormalized on Feedback and kept by core.counters
+COUNTER_FIELDS = ['upvote_count', 'comment_count']
+
 class Feedback(models.Model):
     STATUS_CHOICES = [
         ('open', 'Open'),
@@ -63,24 +87,61 @@ class Feedback(models.Model):
     board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='feedback')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
     tags = models.CharField(max_length=200, blank=True, help_text="Comma-separated tags")
+    tag_set = models.ManyToManyField(Tag, through='FeedbackTag', related_name='feedback', blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feedback')
     upvotes = models.ManyToManyField(User, related_name='upvoted_feedback', blank=True)
+    # Denormalized counters, see core.counters
+    upvote_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Match the list filters and the keys in core.views.FEEDBACK_ORDERINGS
+            models.Index(fields=['-created_at', '-id'], name='feedback_created_idx'),
+            models.Index(fields=['board', '-created_at', '-id'], name='feedback_board_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='feedback_status_created_idx'),
+            models.Index(fields=['board', 'status', '-created_at', '-id'], name='feedback_board_status_idx'),
+            models.Index(fields=['-upvote_count', '-created_at', '-id'], name='feedback_votes_idx'),
+            models.Index(fields=['board', '-upvote_count', '-created_at', '-id'], name='feedback_board_votes_idx'),
+            models.Index(fields=['status', '-upvote_count', '-created_at', '-id'], name='feedback_status_votes_idx'),
+            models.Index(fields=['-comment_count', '-created_at', '-id'], name='feedback_comment_count_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
-    @property
-    def upvote_count(self):
-        return self.upvotes.count()
+    def save(self, *args, **kwargs):
+        # Counters only move through core.counters; a copy loaded before a
+        # vote or comment must not write its old counts back. Like Django,
+        # a copy loaded with .only()/.defer() saves just what it loaded
+        # (plus updated_at, which needs no loading).
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+                and (field.attname not in deferred or getattr(field, 'auto_now', False))
+            ]
+        super().save(*args, **kwargs)
+
+class FeedbackTag(models.Model):
+    """Normalized copy of ``Feedback.tags``, kept in sync on save."""
+    feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='feedback_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['feedback', 'tag'], name='uniq_feedback_tag'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'feedback'], name='feedback_tag_lookup_idx'),
+        ]
 
-    @property
-    def comment_count(self):
-        return self.comments.count()
+    def __str__(self):
+        return f"{self.feedback_id}: {self.tag_id}"
 
 class Comment(models.Model):
     feedback = models.ForeignKey(Feedback, on_delete=models.CASCADE, related_name='comments')
@@ -91,6 +152,75 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['feedback', 'created_at', 'id'], name='comment_feedback_created_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.feedback.title}"
+
+
+class FeedbackDailyStat(models.Model):
+    """Rollup of feedback created per board, day and (current) status."""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Feedback.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'day', 'status'], name='uniq_feedback_daily_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.board_id} {self.day} {self.status}: {self.count}"
+
+class TagDailyStat(models.Model):
+    """Rollup of tag usage per board and feedback creation day."""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tag_stats')
+    day = models.DateField()
+    tag = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'day', 'tag'], name='uniq_tag_daily_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.board_id} {self.day} {self.tag}: {self.count}"
+
+class Job(models.Model):
+    """Work queued for ``manage.py run_workers`` (see ``core.jobs``)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    # Not picked up before this; moved forward by retry backoff
+    run_after = models.DateTimeField(default=timezone.now)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Workers claim the oldest due job, see core.jobs.claim
+            models.Index(fields=['status', 'run_after', 'id'], name='job_due_idx'),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='job_owner_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
@@ -0,0 +1,200 @@
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import EmptyResultSet
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+APPROX_TOTAL_CAP = 10000
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder drops microseconds, which would break seek comparisons
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class SizedPageNumberPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination over whatever ordering the view applied.
+
+    The queryset's ``order_by`` is used as the key, with ``id`` appended as a
+    tie breaker, and the cursor carries the key values of the first/last row
+    of the page. Pages are fetched with ``WHERE (key) > (cursor)`` instead of
+    ``OFFSET``, and no ``COUNT(*)`` runs unless ``?total=exact`` or
+    ``?total=approx`` is asked for.
+
+    Requests with ``?page=`` (or ``?pagination=page``) fall back to the
+    page-number pagination existing clients use.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    total_query_param = 'total'
+    page_number_class = SizedPageNumberPagination
+
+    def use_page_numbers(self, request):
+        params = request.query_params
+        return 'page' in params or params.get('pagination') == 'page'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fallback = None
+        if self.use_page_numbers(request):
+            self.fallback = self.page_number_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        self.total = self.get_total(queryset, request)
+
+        reverse = bool(cursor and cursor['r'])
+        if cursor:
+            queryset = queryset.filter(self.seek_filter(cursor['v'], reverse))
+        if reverse:
+            queryset = queryset.order_by(*[self.flip(field) for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.key_of(rows[-1])
+            if cursor and (has_more or not reverse):
+                self.previous_position = self.key_of(rows[0])
+        return rows
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Must be an integer.'})
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        ordering = [str(field) for field in queryset.query.order_by] or ['-id']
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def key_of(self, obj):
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def seek_filter(self, values, reverse):
+        """Lexicographic "after this row" condition for the ordering key."""
+        if len(values) != len(self.ordering):
+            raise NotFound('Invalid cursor')
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            return {'v': list(cursor['v']), 'r': bool(cursor.get('r'))}
+        except (TypeError, ValueError, KeyError):
+            raise NotFound('Invalid cursor')
+
+    def encode_cursor(self, values, reverse=False, url=None):
+        """Link to the page after (or before) ``values``, on ``url`` or the current one."""
+        payload = json.dumps({'v': values, 'r': int(reverse)}, cls=CursorEncoder, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(url or self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_total(self, queryset, request):
+        mode = request.query_params.get(self.total_query_param)
+        if not mode:
+            return None
+        if mode == 'exact':
+            return {'total': queryset.count(), 'total_is_estimate': False}
+        if mode == 'approx':
+            return {'total': self.estimate_count(queryset), 'total_is_estimate': True}
+        raise ValidationError({self.total_query_param: "Must be 'exact' or 'approx'."})
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            # Planner row estimate: no scan at all
+            try:
+                sql, params = queryset.order_by().query.sql_with_params()
+            except EmptyResultSet:
+                # Filters that cannot match anything, e.g. a tag nobody uses
+                return 0
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        # Elsewhere count at most APPROX_TOTAL_CAP rows
+        return queryset.order_by()[:APPROX_TOTAL_CAP].count()
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            *(self.total or {}).items(),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'total': {'type': 'integer', 'nullable': True},
+                'total_is_estimate': {'type': 'boolean', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -2,6 +2,9 @@
 
 from rest_framework import permissions
 
+from .access import can_read_board
+from .authentication import METRICS_TOKEN_AUTH
+
 class IsAdminOrModerator(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role in ['admin', 'moderator']
@@ -16,22 +19,21 @@ class IsBoardMemberOrPublic(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if obj.public:
             return True
-        return request.user.is_authenticated and (
-            obj.members.filter(id=request.user.id).exists() or
-            request.user.role in ['admin', 'moderator']
-        )
+        return request.user.is_authenticated and can_read_board(request.user, obj.id)
+
+def can_edit_feedback(user, feedback):
+    # Admins and moderators can edit any feedback
+    if user.role in ['admin', 'moderator']:
+        return True
+
+    # Contributors can only edit their own feedback
+    return feedback.created_by_id == user.id
 
 class CanEditFeedback(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-
-        # Admins and moderators can edit any feedback
-        if request.user.role in ['admin', 'moderator']:
-            return True
-
-        # Contributors can only edit their own feedback
-        return obj.created_by == request.user
+        return can_edit_feedback(request.user, obj)
 
 class CanEditComment(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -44,3 +46,9 @@ class CanEditComment(permissions.BasePermission):
 
         # Users can only edit their own comments
         return obj.user == request.user
+
+class CanReadMetrics(permissions.BasePermission):
+    def has_permission(self, request, view):
+        if request.auth == METRICS_TOKEN_AUTH:
+            return True
+        return request.user.is_authenticated and request.user.role == 'admin'
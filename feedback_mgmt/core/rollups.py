@@ -0,0 +1,133 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .analytics import invalidate_summaries
+from .models import Feedback, FeedbackDailyStat, FeedbackTag, TagDailyStat, split_tags
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+def _bump(model, delta, **key):
+    if not delta:
+        return
+    updated = model.objects.filter(**key).update(count=F('count') + delta)
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # Someone else created the row between our UPDATE and INSERT
+        model.objects.filter(**key).update(count=F('count') + delta)
+
+
+def feedback_day(created_at):
+    return timezone.localdate(created_at) if timezone.is_aware(created_at) else created_at.date()
+
+
+def apply_delta(state, delta):
+    """Add ``delta`` to the rollup rows of a feedback snapshot.
+
+    ``state`` is a ``(board_id, day, status, tags)`` tuple as returned by
+    :func:`rollup_state`.
+    """
+    if state is None:
+        return
+    board_id, day, status, tags = state
+    _bump(FeedbackDailyStat, delta, board_id=board_id, day=day, status=status)
+    for tag in set(split_tags(tags)):
+        _bump(TagDailyStat, delta, board_id=board_id, day=day, tag=tag)
+
+
+def rollup_state(feedback):
+    values = feedback.__dict__
+    if any(values.get(name) is None for name in ('board_id', 'status', 'created_at', 'tags')):
+        return None
+    return (values['board_id'], feedback_day(values['created_at']), values['status'], values['tags'])
+
+
+def apply_change(old, new):
+    """Move a feedback item's contribution from ``old`` to ``new`` state."""
+    if old == new:
+        return
+    if old and new and old[:3] == new[:3]:
+        # Only the tags changed
+        board_id, day = new[0], new[1]
+        old_tags, new_tags = set(split_tags(old[3])), set(split_tags(new[3]))
+        for tag in old_tags - new_tags:
+            _bump(TagDailyStat, -1, board_id=board_id, day=day, tag=tag)
+        for tag in new_tags - old_tags:
+            _bump(TagDailyStat, 1, board_id=board_id, day=day, tag=tag)
+        return
+    apply_delta(old, -1)
+    apply_delta(new, 1)
+
+
+def apply_changes(changes):
+    """:func:`apply_change` for many ``(old, new)`` pairs at once.
+
+    Deltas are summed first, so each rollup row is bumped once however many
+    items touch it. Use ``(None, new)`` for created and ``(old, None)`` for
+    deleted items.
+    """
+    stats, tag_stats = Counter(), Counter()
+    for old, new in changes:
+        for state, delta in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            board_id, day, status, tags = state
+            stats[board_id, day, status] += delta
+            for tag in set(split_tags(tags)):
+                tag_stats[board_id, day, tag] += delta
+    for (board_id, day, status), delta in stats.items():
+        _bump(FeedbackDailyStat, delta, board_id=board_id, day=day, status=status)
+    for (board_id, day, tag), delta in tag_stats.items():
+        _bump(TagDailyStat, delta, board_id=board_id, day=day, tag=tag)
+
+
+@transaction.atomic
+def rebuild(board_ids=None):
+    """Recompute the rollup tables from scratch, returning the row counts."""
+    feedback = Feedback.objects.all()
+    stats = FeedbackDailyStat.objects.all()
+    tag_stats = TagDailyStat.objects.all()
+    if board_ids:
+        feedback = feedback.filter(board_id__in=board_ids)
+        stats = stats.filter(board_id__in=board_ids)
+        tag_stats = tag_stats.filter(board_id__in=board_ids)
+    stats.delete()
+    tag_stats.delete()
+
+    rows = (
+        feedback.annotate(day=TruncDate('created_at'))
+        .order_by()
+        .values('board_id', 'day', 'status')
+        .annotate(count=Count('id'))
+    )
+    daily_stats = [FeedbackDailyStat(**row) for row in rows.iterator()]
+    FeedbackDailyStat.objects.bulk_create(daily_stats, batch_size=ROLLUP_BATCH_SIZE)
+
+    tag_links = FeedbackTag.objects.all()
+    if board_ids:
+        tag_links = tag_links.filter(feedback__board_id__in=board_ids)
+    tag_rows = (
+        tag_links.annotate(day=TruncDate('feedback__created_at'))
+        .order_by()
+        .values('feedback__board_id', 'day', 'tag__name')
+        .annotate(count=Count('id'))
+    )
+    new_tag_stats = [
+        TagDailyStat(board_id=row['feedback__board_id'], day=row['day'], tag=row['tag__name'], count=row['count'])
+        for row in tag_rows.iterator()
+    ]
+    TagDailyStat.objects.bulk_create(new_tag_stats, batch_size=ROLLUP_BATCH_SIZE)
+    invalidate_summaries()
+
+    return {
+        'daily_stats': len(daily_stats),
+        'tag_stats': len(new_tag_stats),
+    }
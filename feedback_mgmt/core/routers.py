@@ -0,0 +1,67 @@
+import hashlib
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from feedback_mgmt.database import REPLICA
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# How long a client reads from the primary after a write of its own
+REPLICA_PIN_SECONDS = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def _pin_key(request):
+    # The token identifies API clients before authentication has run
+    client = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+    return 'replica-pin:' + hashlib.sha256(client.encode()).hexdigest()
+
+
+def start(request):
+    """Route this request's reads; pass the result to :func:`stop`.
+
+    Safe-method requests read from the replica unless the same client
+    wrote within ``REPLICA_PIN_SECONDS``, so it sees its own writes.
+    """
+    reads = request.method in SAFE_METHODS and not cache.get(_pin_key(request))
+    return _replica_reads.set(reads)
+
+
+def stop(token):
+    _replica_reads.reset(token)
+
+
+def remember_write(request, response):
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        cache.set(_pin_key(request), True, REPLICA_PIN_SECONDS)
+
+
+class PrimaryReplicaRouter:
+    """Reads of read-only requests go to ``replica``, everything else to ``default``.
+
+    Routing is decided per request by ``core.middleware.ReplicaRoutingMiddleware``;
+    management commands, signals outside requests and writes always use the
+    primary. The replica is not migrated: it is a copy of the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and replica_configured():
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Also for instances that were read from the replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
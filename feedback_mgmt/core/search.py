@@ -0,0 +1,317 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+# Best matches kept per search, after the ``within`` filters have applied
+MAX_SEARCH_HITS = 500
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+SNIPPET_TOKENS = 12
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+def _id_subquery(within):
+    """``within``'s ids as SQL and params, for ``feedback_id IN (...)``.
+
+    Raises ``EmptyResultSet`` when ``within`` cannot match anything, e.g. a
+    tag nobody uses or a user without readable boards.
+    """
+    return within.order_by().values('id').query.sql_with_params()
+
+
+class SearchHit:
+    __slots__ = ('feedback_id', 'rank', 'title', 'snippet', 'matched_in')
+
+    def __init__(self, feedback_id, rank=None, title=None, snippet=None, matched_in='feedback'):
+        self.feedback_id = feedback_id
+        self.rank = rank
+        self.title = title
+        self.snippet = snippet
+        self.matched_in = matched_in
+
+    def as_dict(self):
+        return {
+            'rank': self.rank,
+            'title': self.title,
+            'snippet': self.snippet,
+            'matched_in': self.matched_in,
+        }
+
+
+class BaseSearchBackend:
+    """Interface every search backend implements.
+
+    ``search`` returns up to ``limit`` :class:`SearchHit` objects, best
+    match first and at most one per feedback item. ``within`` (a feedback
+    queryset, e.g. readable boards and the list filters) is applied in the
+    search query itself, so the limit never goes to rows filtered out
+    later. The index maintenance hooks are called from ``core.signals``.
+    """
+
+    def search(self, query, include_comments=False, limit=MAX_SEARCH_HITS, within=None):
+        raise NotImplementedError
+
+    def index_feedback(self, feedback):
+        pass
+
+    def remove_feedback(self, feedback_id):
+        pass
+
+    def index_comment(self, comment):
+        pass
+
+    def remove_comment(self, comment_id):
+        pass
+
+    def index_many(self, feedback=(), comments=()):
+        for item in feedback:
+            self.index_feedback(item)
+        for comment in comments:
+            self.index_comment(comment)
+
+    def remove_feedback_many(self, feedback_ids):
+        for feedback_id in feedback_ids:
+            self.remove_feedback(feedback_id)
+
+    def rebuild(self):
+        return 0
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """``icontains`` fallback for databases without a full-text index."""
+
+    def search(self, query, include_comments=False, limit=MAX_SEARCH_HITS, within=None):
+        from .models import Comment, Feedback
+
+        feedback = Feedback.objects.all() if within is None else within
+        condition = Q(title__icontains=query) | Q(description__icontains=query)
+        ids = list(feedback.filter(condition).order_by('-created_at').values_list('id', flat=True)[:limit])
+        hits = [SearchHit(feedback_id) for feedback_id in ids]
+        if include_comments and len(hits) < limit:
+            seen = set(ids)
+            comments = Comment.objects.filter(text__icontains=query).exclude(feedback_id__in=seen)
+            if within is not None:
+                comments = comments.filter(feedback_id__in=within.order_by().values('id'))
+            comment_ids = (
+                comments
+                .order_by('feedback_id').values_list('feedback_id', flat=True).distinct()[:limit - len(hits)]
+            )
+            hits += [SearchHit(feedback_id, matched_in='comment') for feedback_id in comment_ids]
+        return hits
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """SQLite FTS5 index with one document per feedback item and per comment.
+
+    The ``core_search_index`` virtual table is created by migration
+    ``0006_search_index`` and kept current by signals.
+    """
+    table = 'core_search_index'
+
+    @staticmethod
+    def match_expression(query):
+        # Quote every token so user input can never be parsed as FTS syntax;
+        # the last one is a prefix match for search-as-you-type.
+        tokens = _TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def search(self, query, include_comments=False, limit=MAX_SEARCH_HITS, within=None):
+        expression = self.match_expression(query)
+        if expression is None:
+            return []
+        sql = (
+            f'SELECT feedback_id, comment_id, rank, '
+            f'highlight({self.table}, 0, %s, %s), '
+            f'snippet({self.table}, 1, %s, %s, %s, %s) '
+            f'FROM {self.table} WHERE {self.table} MATCH %s'
+        )
+        params = [HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, '…', SNIPPET_TOKENS, expression]
+        if not include_comments:
+            sql += ' AND comment_id = 0'
+        if within is not None:
+            try:
+                subquery, subquery_params = _id_subquery(within)
+            except EmptyResultSet:
+                return []
+            sql += f' AND feedback_id IN ({subquery})'
+            params += subquery_params
+        # Over-fetch a little since several documents can share a feedback item
+        sql += ' ORDER BY rank LIMIT %s'
+        params.append(limit * 2 if include_comments else limit)
+
+        hits = {}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for feedback_id, comment_id, rank, title, snippet in cursor.fetchall():
+                if feedback_id in hits:
+                    continue
+                hits[feedback_id] = SearchHit(
+                    feedback_id, rank=rank, title=title or None, snippet=snippet,
+                    matched_in='comment' if comment_id else 'feedback',
+                )
+                if len(hits) >= limit:
+                    break
+        return list(hits.values())
+
+    def _delete(self, where, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE {where}', params)
+
+    def _insert(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (title, body, feedback_id, comment_id) VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+    def index_feedback(self, feedback):
+        self._delete('feedback_id = %s AND comment_id = 0', [feedback.pk])
+        self._insert([(feedback.title, feedback.description, feedback.pk, 0)])
+
+    def remove_feedback(self, feedback_id):
+        self._delete('feedback_id = %s', [feedback_id])
+
+    def index_comment(self, comment):
+        self._delete('comment_id = %s', [comment.pk])
+        self._insert([('', comment.text, comment.feedback_id, comment.pk)])
+
+    def remove_comment(self, comment_id):
+        self._delete('comment_id = %s', [comment_id])
+
+    def index_many(self, feedback=(), comments=()):
+        rows = [(item.title, item.description, item.pk, 0) for item in feedback]
+        rows += [('', comment.text, comment.feedback_id, comment.pk) for comment in comments]
+        feedback_ids = [row[2] for row in rows if not row[3]]
+        comment_ids = [row[3] for row in rows if row[3]]
+        if feedback_ids:
+            self._delete(f'feedback_id IN ({_placeholders(feedback_ids)}) AND comment_id = 0', feedback_ids)
+        if comment_ids:
+            self._delete(f'comment_id IN ({_placeholders(comment_ids)})', comment_ids)
+        if rows:
+            self._insert(rows)
+
+    def remove_feedback_many(self, feedback_ids):
+        feedback_ids = list(feedback_ids)
+        if feedback_ids:
+            self._delete(f'feedback_id IN ({_placeholders(feedback_ids)})', feedback_ids)
+
+    @transaction.atomic
+    def rebuild(self, batch_size=1000):
+        from .models import Comment, Feedback
+
+        self._delete('1 = 1', [])
+        count = 0
+        batch = []
+        sources = [
+            Feedback.objects.order_by().values_list('title', 'description', 'id', Value(0)),
+            Comment.objects.order_by().values_list(Value(''), 'text', 'feedback_id', 'id'),
+        ]
+        for source in sources:
+            for row in source.iterator(chunk_size=batch_size):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._insert(batch)
+                    count += len(batch)
+                    batch = []
+        if batch:
+            self._insert(batch)
+            count += len(batch)
+        return count
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector search on Postgres.
+
+    Uses the same ``to_tsvector`` expressions as the GIN indexes created by
+    migration ``0006_search_index`` so the planner can use them. The index
+    is expression based, so there is nothing to maintain or rebuild.
+    """
+    config = 'english'
+
+    def search(self, query, include_comments=False, limit=MAX_SEARCH_HITS, within=None):
+        if not _TOKEN_RE.search(query):
+            return []
+        try:
+            subquery, subquery_params = _id_subquery(within) if within is not None else (None, ())
+        except EmptyResultSet:
+            return []
+        options = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=20, MinWords=5'
+        feedback_sql = (
+            "SELECT id, ts_rank(to_tsvector(%s::regconfig, title || ' ' || description), q) AS rank, "
+            "ts_headline(%s::regconfig, title, q, %s), ts_headline(%s::regconfig, description, q, %s), 0 "
+            "FROM core_feedback, websearch_to_tsquery(%s::regconfig, %s) q "
+            "WHERE to_tsvector(%s::regconfig, title || ' ' || description) @@ q"
+        )
+        params = [self.config, self.config, options, self.config, options, self.config, query, self.config]
+        if subquery is not None:
+            feedback_sql += f' AND id IN ({subquery})'
+            params += subquery_params
+        sql = feedback_sql
+        if include_comments:
+            sql += (
+                " UNION ALL "
+                "SELECT feedback_id, ts_rank(to_tsvector(%s::regconfig, text), q), NULL, "
+                "ts_headline(%s::regconfig, text, q, %s), 1 "
+                "FROM core_comment, websearch_to_tsquery(%s::regconfig, %s) q "
+                "WHERE to_tsvector(%s::regconfig, text) @@ q"
+            )
+            params += [self.config, self.config, options, self.config, query, self.config]
+            if subquery is not None:
+                sql += f' AND feedback_id IN ({subquery})'
+                params += subquery_params
+        sql = f'SELECT * FROM ({sql}) hits ORDER BY 2 DESC LIMIT %s'
+        params.append(limit * 2 if include_comments else limit)
+
+        hits = {}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for feedback_id, rank, title, snippet, from_comment in cursor.fetchall():
+                if feedback_id not in hits:
+                    hits[feedback_id] = SearchHit(
+                        feedback_id, rank=-rank, title=title, snippet=snippet,
+                        matched_in='comment' if from_comment else 'feedback',
+                    )
+        return list(hits.values())[:limit]
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': 'core.search.SQLiteFTSBackend',
+    'postgresql': 'core.search.PostgresSearchBackend',
+}
+
+_backends = {}
+
+
+def get_backend():
+    """The configured backend, ``FEEDBACK_SEARCH_BACKEND`` or a per-vendor default."""
+    path = getattr(settings, 'FEEDBACK_SEARCH_BACKEND', None) or DEFAULT_BACKENDS.get(
+        connection.vendor, 'core.search.BasicSearchBackend'
+    )
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+def apply_search(queryset, hits):
+    """Restrict ``queryset`` to ``hits`` and annotate their relevance order."""
+    if not hits:
+        return queryset.annotate(search_position=Value(0, output_field=IntegerField())).none()
+    ids = [hit.feedback_id for hit in hits]
+    position = Case(
+        *[When(id=feedback_id, then=Value(i)) for i, feedback_id in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(id__in=ids).annotate(search_position=position)
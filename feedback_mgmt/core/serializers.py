@@ -2,7 +2,48 @@
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from .models import User, Board, Feedback, Comment
+from .access import can_read_board
+from .metrics import serializing
+from .models import User, Board, Feedback, Comment, Job, split_tags
+from .viewer import viewer_state
+from .votes import MAX_BATCH_VOTES
+
+def _readable(context, board_id):
+    request = context.get('request')
+    return request is None or can_read_board(request.user, board_id)
+
+class ExpandableFieldsMixin:
+    """Sparse fieldsets and opt-in nesting for model serializers.
+
+    ``fields`` limits the output to the named fields. ``expand`` swaps in
+    the nested serializers declared in ``expandable_fields`` (name ->
+    ``(serializer_class, kwargs)``); unexpanded fields stay compact or are
+    left out entirely.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        for name in expand or ():
+            if name in self.expandable_fields:
+                serializer_class, options = self.expandable_fields[name]
+                self.fields[name] = serializer_class(read_only=True, **options)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+        read_only_fields = fields
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -45,25 +86,44 @@ class LoginSerializer(serializers.Serializer):
             attrs['user'] = user
         return attrs
 
-class BoardSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
-    members = UserSerializer(many=True, read_only=True)
+class BoardSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Board
+        fields = ['id', 'name']
+        read_only_fields = fields
+
+class BoardSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    created_by = UserSummarySerializer(read_only=True)
     member_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
         required=False
     )
     feedback_count = serializers.SerializerMethodField()
+    member_count = serializers.SerializerMethodField()
+
+    expandable_fields = {
+        'created_by': (UserSerializer, {}),
+        'members': (UserSerializer, {'many': True}),
+    }
 
     class Meta:
         model = Board
-        fields = ['id', 'name', 'description', 'public', 'created_by', 'members',
-                 'member_ids', 'feedback_count', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'description', 'public', 'created_by',
+                 'member_ids', 'feedback_count', 'member_count', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
 
     def get_feedback_count(self, obj):
+        # Annotated by the viewsets; see core.views.with_board_counts
+        if hasattr(obj, 'feedback_total'):
+            return obj.feedback_total
         return obj.feedback.count()
 
+    def get_member_count(self, obj):
+        if hasattr(obj, 'member_total'):
+            return obj.member_total
+        return obj.members.count()
+
     def create(self, validated_data):
         member_ids = validated_data.pop('member_ids', [])
         board = Board.objects.create(**validated_data)
@@ -81,10 +141,14 @@ class BoardSerializer(serializers.ModelSerializer):
             instance.members.set(User.objects.filter(id__in=member_ids))
         return instance
 
-class CommentSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+class CommentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    user = UserSummarySerializer(read_only=True)
     feedback_id = serializers.IntegerField(write_only=True)  # Accept feedback_id
 
+    expandable_fields = {
+        'user': (UserSerializer, {}),
+    }
+
     class Meta:
         model = Comment
         fields = ['id', 'user', 'feedback_id', 'text', 'created_at', 'updated_at']
@@ -98,40 +162,63 @@ class CommentSerializer(serializers.ModelSerializer):
             validated_data['feedback'] = feedback
         except Feedback.DoesNotExist:
             raise serializers.ValidationError("Feedback not found")
+        if not _readable(self.context, feedback.board_id):
+            raise serializers.ValidationError("Feedback not found")
 
         return super().create(validated_data)
 
-class FeedbackSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
-    board = BoardSerializer(read_only=True)
+class FeedbackSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    created_by = UserSummarySerializer(read_only=True)
+    board = BoardSummarySerializer(read_only=True)
     board_id = serializers.IntegerField(write_only=True)
-    upvote_count = serializers.SerializerMethodField()  # CHANGE: from ReadOnlyField to SerializerMethodField
-    comment_count = serializers.ReadOnlyField()
-    comments = CommentSerializer(many=True, read_only=True)
     is_upvoted = serializers.SerializerMethodField()
+    has_commented = serializers.SerializerMethodField()
+    is_author = serializers.SerializerMethodField()
     tags_list = serializers.SerializerMethodField()
 
+    expandable_fields = {
+        'board': (BoardSerializer, {'expand': ['created_by', 'members']}),
+        'created_by': (UserSerializer, {}),
+        # The latest few, see FeedbackViewSet; comment_count is the total
+        'comments': (CommentSerializer, {'many': True, 'expand': ['user'], 'source': 'latest_comments', 'default': list}),
+    }
+
     class Meta:
         model = Feedback
         fields = ['id', 'title', 'description', 'board', 'board_id', 'status', 'tags',
-                 'tags_list', 'created_by', 'upvote_count', 'comment_count', 'comments',
-                 'is_upvoted', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+                 'tags_list', 'created_by', 'upvote_count', 'comment_count',
+                 'is_upvoted', 'has_commented', 'is_author', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_by', 'upvote_count', 'comment_count', 'created_at', 'updated_at']
 
-    def get_upvote_count(self, obj):
-        # Check if it's annotated first, then fall back to property
-        return getattr(obj, 'upvotes_count', obj.upvote_count)
+    def _viewer(self):
+        request = self.context.get('request')
+        return request.user if request else None
 
     def get_is_upvoted(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.upvotes.filter(id=request.user.id).exists()
-        return False
+        return viewer_state(obj, self._viewer(), 'is_upvoted')
+
+    def get_has_commented(self, obj):
+        return viewer_state(obj, self._viewer(), 'has_commented')
+
+    def get_is_author(self, obj):
+        return viewer_state(obj, self._viewer(), 'is_author')
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        search_hits = self.context.get('search_hits')
+        if search_hits and instance.pk in search_hits:
+            data['search'] = search_hits[instance.pk].as_dict()
+        return data
+
+    def validate_board_id(self, value):
+        if not Board.objects.filter(id=value).exists() or not _readable(self.context, value):
+            raise serializers.ValidationError("Board not found")
+        return value
 
     def get_tags_list(self, obj):
-        if obj.tags:
-            return [tag.strip() for tag in obj.tags.split(',') if tag.strip()]
-        return []
+        if 'tag_links' in getattr(obj, '_prefetched_objects_cache', {}):
+            return [link.tag.name for link in obj.tag_links.all()]
+        return split_tags(obj.tags)
 
 class FeedbackSummarySerializer(serializers.Serializer):
     total_feedback    = serializers.IntegerField()
@@ -143,3 +230,79 @@ class FeedbackSummarySerializer(serializers.Serializer):
     feedback_trends      = serializers.DictField()
     status_distribution  = serializers.DictField()
     tag_distribution     = serializers.DictField()
+
+class VoteSerializer(serializers.Serializer):
+    feedback_id = serializers.IntegerField()
+    upvoted = serializers.BooleanField()
+
+class VoteBatchSerializer(serializers.Serializer):
+    votes = VoteSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_VOTES)
+
+    def validate_votes(self, value):
+        # Queued votes for the same feedback coalesce, the last one wins
+        return {vote['feedback_id']: vote['upvoted'] for vote in value}
+
+MAX_BULK_ITEMS = 1000
+
+class BulkItemsSerializer(serializers.Serializer):
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=MAX_BULK_ITEMS)
+
+class BulkIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BULK_ITEMS)
+
+class FeedbackBulkCreateSerializer(serializers.ModelSerializer):
+    """One item of a bulk create, checked against the ``board_ids`` in the context."""
+    board_id = serializers.IntegerField()
+
+    class Meta:
+        model = Feedback
+        fields = ['title', 'description', 'board_id', 'status', 'tags']
+
+    def validate_board_id(self, value):
+        if value not in self.context['board_ids']:
+            raise serializers.ValidationError("Board not found")
+        return value
+
+class FeedbackBulkUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Feedback.STATUS_CHOICES, required=False)
+    tags = serializers.CharField(max_length=200, allow_blank=True, required=False)
+
+    def validate(self, attrs):
+        if 'status' not in attrs and 'tags' not in attrs:
+            raise serializers.ValidationError("Give a status and/or tags to update")
+        return attrs
+
+class CommentBulkCreateSerializer(serializers.ModelSerializer):
+    """One item of a bulk create, checked against the ``feedback_ids`` in the context."""
+    feedback_id = serializers.IntegerField()
+
+    class Meta:
+        model = Comment
+        fields = ['feedback_id', 'text']
+
+    def validate_feedback_id(self, value):
+        if value not in self.context['feedback_ids']:
+            raise serializers.ValidationError("Feedback not found")
+        return value
+
+class JobSerializer(serializers.ModelSerializer):
+    url = serializers.HyperlinkedIdentityField(view_name='job-detail')
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'url', 'kind', 'status', 'attempts', 'max_attempts', 'run_after', 'result', 'error',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_error(self, obj):
+        # The exception line only, the traceback stays in the worker log
+        lines = obj.error.strip().splitlines()
+        return lines[-1] if lines else ''
+
+class RecomputeSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=['counters', 'rollups'])
+    board_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
@@ -0,0 +1,214 @@
+import contextlib
+import functools
+import threading
+
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import access, counters, events, rollups, tagging
+from .authentication import invalidate_principals
+from .analytics import invalidate_summaries
+from .search import get_backend as search_backend
+from .models import Board, Comment, Feedback, User
+
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def maintenance_muted():
+    """Skip the per-row feedback and comment receivers below.
+
+    For bulk paths that update rollups, tag links, counters and the search
+    index themselves, in a few grouped statements (see ``core.bulk``).
+    """
+    previous = getattr(_local, 'muted', False)
+    _local.muted = True
+    try:
+        yield
+    finally:
+        _local.muted = previous
+
+
+def _unless_muted(receiver_func):
+    @functools.wraps(receiver_func)
+    def wrapper(*args, **kwargs):
+        if not getattr(_local, 'muted', False):
+            return receiver_func(*args, **kwargs)
+    return wrapper
+
+
+def _stored_state(pk):
+    current = Feedback.objects.filter(pk=pk).first()
+    return current._rollup_state if current else None
+
+
+@receiver(post_init, sender=Feedback)
+def remember_feedback_state(sender, instance, **kwargs):
+    instance._rollup_state = rollups.rollup_state(instance)
+
+
+@receiver(pre_save, sender=Feedback)
+@_unless_muted
+def load_feedback_state(sender, instance, raw=False, **kwargs):
+    # Instances loaded with deferred fields have no snapshot yet
+    if raw or instance._state.adding or instance._rollup_state is not None:
+        return
+    instance._rollup_state = _stored_state(instance.pk)
+
+
+# Before update_feedback_rollups, which replaces the old _rollup_state
+@receiver(post_save, sender=Feedback)
+@_unless_muted
+def publish_feedback_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        events.feedback_created(instance)
+        return
+    old_state = instance._rollup_state
+    events.feedback_changed(instance, *(old_state[0], old_state[2]) if old_state else ())
+
+
+@receiver(post_save, sender=Feedback)
+@_unless_muted
+def update_feedback_rollups(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_state = rollups.rollup_state(instance)
+    if new_state is None:
+        new_state = _stored_state(instance.pk)
+    old_state = None if created else instance._rollup_state
+    rollups.apply_change(old_state, new_state)
+    if new_state and (old_state is None or old_state[3] != new_state[3]):
+        tagging.sync_feedback_tags(instance.pk, new_state[3])
+    instance._rollup_state = new_state
+
+
+@receiver(pre_delete, sender=Feedback)
+@_unless_muted
+def load_deleted_feedback_state(sender, instance, **kwargs):
+    if instance._rollup_state is None:
+        instance._rollup_state = _stored_state(instance.pk)
+
+
+@receiver(post_delete, sender=Feedback)
+@_unless_muted
+def remove_feedback_rollups(sender, instance, **kwargs):
+    rollups.apply_delta(instance._rollup_state, -1)
+    events.feedback_deleted(instance.board_id, instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@_unless_muted
+def count_new_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust(instance.feedback_id, 'comment_count', 1)
+        if Comment.feedback.is_cached(instance):
+            board_id = instance.feedback.board_id
+        else:
+            board_id = Feedback.objects.values_list('board_id', flat=True).get(pk=instance.feedback_id)
+        events.comment_created(instance, board_id)
+
+
+@receiver(post_delete, sender=Comment)
+@_unless_muted
+def count_deleted_comment(sender, instance, **kwargs):
+    counters.adjust(instance.feedback_id, 'comment_count', -1)
+
+
+@receiver(post_save, sender=Feedback)
+@_unless_muted
+def index_saved_feedback(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search_backend().index_feedback(instance)
+
+
+@receiver(post_delete, sender=Feedback)
+@_unless_muted
+def unindex_deleted_feedback(sender, instance, **kwargs):
+    search_backend().remove_feedback(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@_unless_muted
+def index_saved_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search_backend().index_comment(instance)
+
+
+@receiver(post_delete, sender=Comment)
+@_unless_muted
+def unindex_deleted_comment(sender, instance, **kwargs):
+    search_backend().remove_comment(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, raw=False, **kwargs):
+    # Role, is_active and password live on the cached principal
+    if not raw:
+        invalidate_principals([instance.pk])
+
+
+@receiver(post_init, sender=Board)
+def remember_board_visibility(sender, instance, **kwargs):
+    instance._was_public = instance.__dict__.get('public')
+
+
+@receiver(post_save, sender=Board)
+def board_visibility_changed(sender, instance, created, raw=False, **kwargs):
+    # New private boards have no members yet, so nobody's access changes
+    if created and instance.public or not created and instance._was_public != instance.public:
+        access.invalidate_all()
+    instance._was_public = instance.public
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    access.invalidate_all()
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._cleared_board_ids = list(instance.boards.values_list('id', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # user.boards.add(...): only that user's access changed
+        access.invalidate_users([instance.pk])
+    elif pk_set:
+        access.invalidate_users(pk_set)
+    elif action == 'post_clear':
+        # The cleared members are gone by now
+        access.invalidate_all()
+
+    # Members are part of the board representation, so conditional GETs
+    # need updated_at to move (see core.views.ConditionalReadMixin)
+    if not reverse:
+        board_ids = [instance.pk] if pk_set or action == 'post_clear' else []
+    elif action == 'post_clear':
+        board_ids = instance.__dict__.pop('_cleared_board_ids', [])
+    else:
+        board_ids = pk_set
+    if board_ids:
+        Board.objects.filter(pk__in=board_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+@_unless_muted
+def feedback_changed(sender, raw=False, **kwargs):
+    # Votes and comments invalidate through counters.adjust
+    if not raw:
+        invalidate_summaries()
+
+
+@receiver(m2m_changed, sender=Feedback.upvotes.through)
+@_unless_muted
+def upvotes_changed(sender, action, **kwargs):
+    # feedback.upvotes.add() and friends bypass the upvote endpoint
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_summaries()
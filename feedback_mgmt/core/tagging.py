@@ -0,0 +1,104 @@
+from collections import defaultdict
+
+from django.db.models import Count, Prefetch, Q
+from rest_framework import serializers
+
+from .models import FeedbackTag, Tag, split_tags
+
+TAG_MATCH_MODES = ['any', 'all']
+
+
+def unique_tags(tags):
+    """Parsed tag names in their original order without duplicates."""
+    return list(dict.fromkeys(split_tags(tags)))
+
+
+def get_or_create_tags(names):
+    """Map each name to its ``Tag`` id, creating missing tags in one insert."""
+    if not names:
+        return {}
+    tag_ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [name for name in names if name not in tag_ids]
+    if missing:
+        Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+        tag_ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+    return tag_ids
+
+
+def sync_feedback_tags(feedback_id, tags):
+    """Make the ``FeedbackTag`` rows of one feedback item match its tag string."""
+    sync_tags_many({feedback_id: tags})
+
+
+def sync_tags_many(tags_by_feedback):
+    """:func:`sync_feedback_tags` for ``{feedback_id: tags}`` in a fixed number of queries."""
+    names_by_feedback = {pk: unique_tags(tags) for pk, tags in tags_by_feedback.items()}
+    tag_ids = get_or_create_tags(list(dict.fromkeys(
+        name for names in names_by_feedback.values() for name in names
+    )))
+
+    current = defaultdict(dict)
+    links = FeedbackTag.objects.filter(feedback_id__in=list(names_by_feedback))
+    for link_id, feedback_id, tag_id in links.values_list('id', 'feedback_id', 'tag_id'):
+        current[feedback_id][tag_id] = link_id
+
+    stale, missing = [], []
+    for feedback_id, names in names_by_feedback.items():
+        wanted = {tag_ids[name] for name in names}
+        have = current[feedback_id]
+        stale += [link_id for tag_id, link_id in have.items() if tag_id not in wanted]
+        missing += [
+            FeedbackTag(feedback_id=feedback_id, tag_id=tag_ids[name])
+            for name in names if tag_ids[name] not in have
+        ]
+    if stale:
+        FeedbackTag.objects.filter(id__in=stale).delete()
+    FeedbackTag.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+def tag_links_prefetch(lookup='tag_links'):
+    return Prefetch(lookup, queryset=FeedbackTag.objects.select_related('tag').order_by('id'))
+
+
+def parse_tag_filter(value, match='any'):
+    names = unique_tags(value)
+    match = match or 'any'
+    if match not in TAG_MATCH_MODES:
+        raise serializers.ValidationError({'tags_match': f"Must be one of: {', '.join(TAG_MATCH_MODES)}."})
+    return names, match
+
+
+def filter_by_tags(queryset, names, match='any'):
+    """Exact, case-insensitive tag filtering through the indexed link table.
+
+    ``match='any'`` keeps feedback carrying at least one of ``names``,
+    ``match='all'`` only feedback carrying every one of them.
+    """
+    if not names:
+        return queryset
+
+    def links_for(tag_names):
+        # Resolve ids up front: iexact cannot use the name index, and literal
+        # ids let the link lookup use feedback_tag_lookup_idx
+        matches = Q()
+        for name in tag_names:
+            matches |= Q(name__iexact=name)
+        tag_ids = list(Tag.objects.filter(matches).values_list('id', flat=True))
+        return FeedbackTag.objects.filter(tag_id__in=tag_ids).values('feedback_id')
+
+    if match == 'all':
+        for name in names:
+            queryset = queryset.filter(id__in=links_for([name]))
+        return queryset
+    return queryset.filter(id__in=links_for(names))
+
+
+def tag_counts(feedback_queryset):
+    """``[{'name', 'count'}]`` for the tags used by ``feedback_queryset``."""
+    rows = (
+        FeedbackTag.objects.filter(feedback_id__in=feedback_queryset.order_by().values('id'))
+        .values('tag__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'tag__name')
+    )
+    return [{'name': row['tag__name'], 'count': row['count']} for row in rows]
@@ -0,0 +1,62 @@
+"""Handlers of the background jobs in ``core.jobs``, one per job kind."""
+import os
+
+from django.db import transaction
+
+from . import bulk, counters, export, rollups
+from .feedback_filters import filter_feedback
+from .jobs import handler, result_path
+from .models import Feedback
+
+BULK_FUNCTIONS = {
+    'POST': bulk.create_feedback,
+    'PATCH': bulk.update_feedback,
+    'DELETE': bulk.delete_feedback,
+}
+
+
+def _owner(job):
+    if job.created_by is None:
+        raise LookupError('The user who queued this job no longer exists')
+    return job.created_by
+
+
+@handler('reconcile_counters')
+def reconcile_counters(job):
+    return {'fixed': counters.reconcile()}
+
+
+@handler('rebuild_rollups')
+def rebuild_rollups(job):
+    # All or nothing, so a retry starts from intact tables
+    with transaction.atomic():
+        return rollups.rebuild(board_ids=job.payload.get('board_ids'))
+
+
+# Chunks commit one by one: a retry would redo the chunks already written
+@handler('feedback_bulk', max_attempts=1)
+def feedback_bulk(job):
+    """``payload``: ``method`` (POST, PATCH or DELETE) and ``items`` or ``ids``."""
+    method = job.payload['method']
+    items = job.payload['ids'] if method == 'DELETE' else job.payload['items']
+    results = bulk.in_chunks(BULK_FUNCTIONS[method], items, _owner(job))
+    return {'results': results, 'failed': sum('errors' in result for result in results)}
+
+
+@handler('feedback_export')
+def feedback_export(job):
+    """``payload``: ``kind``, ``output``, ``compress`` and the list filters as ``params``."""
+    payload = job.payload
+    feedback = filter_feedback(Feedback.objects.all(), _owner(job), payload.get('params', {}))
+    name = export.filename(payload['kind'], payload['output'], payload.get('compress'))
+    path = result_path(job, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name, so a download never sees half a file
+    partial = path.with_name(path.name + '.partial')
+    size = 0
+    with open(partial, 'wb') as target:
+        for chunk in export.stream(payload['kind'], feedback, payload['output'], payload.get('compress')):
+            target.write(chunk)
+            size += len(chunk)
+    os.replace(partial, path)
+    return {'filename': name, 'bytes': size}
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.authentication import principals
+from core.models import Board, Feedback, User
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'core-tests'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CoreTestCase(APITestCase):
+    """An admin, a member of the private board and an outsider, on a public and a private board.
+
+    Every test starts with empty caches (board access, throttle budgets,
+    principals), and requests authenticate with real access tokens.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='admin-pass-123', role='admin')
+        cls.member = User.objects.create_user('member', password='member-pass-123')
+        cls.outsider = User.objects.create_user('outsider', password='outsider-pass-123')
+        cls.public_board = Board.objects.create(name='Public', description='Everybody', created_by=cls.admin)
+        cls.private_board = Board.objects.create(
+            name='Private', description='Members only', public=False, created_by=cls.admin,
+        )
+        cls.private_board.members.add(cls.member)
+
+    def setUp(self):
+        cache.clear()
+        principals.clear()
+
+    def login(self, user):
+        """Send ``user``'s access token with the following requests."""
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def make_feedback(self, board=None, user=None, **fields):
+        fields.setdefault('title', 'Feedback title')
+        fields.setdefault('description', 'Some description')
+        return Feedback.objects.create(
+            board=board or self.public_board, created_by=user or self.member, **fields,
+        )
+
+    def ids(self, response):
+        return [row['id'] for row in response.data['results']]
@@ -0,0 +1,109 @@
+from core import access
+from core.models import Board, Comment
+
+from .base import CoreTestCase
+
+
+class PrivateBoardTests(CoreTestCase):
+    """Private boards, their feedback and comments are only visible to members and staff."""
+
+    def setUp(self):
+        super().setUp()
+        self.public_feedback = self.make_feedback()
+        self.private_feedback = self.make_feedback(board=self.private_board)
+        self.private_comment = Comment.objects.create(feedback=self.private_feedback, user=self.member, text='Hush')
+
+    def board_ids(self, user):
+        self.login(user)
+        return set(self.ids(self.client.get('/api/boards/')))
+
+    def feedback_ids(self, user):
+        self.login(user)
+        return set(self.ids(self.client.get('/api/feedback/')))
+
+    def test_board_list(self):
+        everything = {self.public_board.pk, self.private_board.pk}
+        self.assertEqual(self.board_ids(self.admin), everything)
+        self.assertEqual(self.board_ids(self.member), everything)
+        self.assertEqual(self.board_ids(self.outsider), {self.public_board.pk})
+
+    def test_board_detail(self):
+        self.login(self.outsider)
+        self.assertEqual(self.client.get(f'/api/boards/{self.private_board.pk}/').status_code, 404)
+        self.login(self.member)
+        self.assertEqual(self.client.get(f'/api/boards/{self.private_board.pk}/').status_code, 200)
+
+    def test_feedback_list_and_detail(self):
+        everything = {self.public_feedback.pk, self.private_feedback.pk}
+        self.assertEqual(self.feedback_ids(self.admin), everything)
+        self.assertEqual(self.feedback_ids(self.member), everything)
+        self.assertEqual(self.feedback_ids(self.outsider), {self.public_feedback.pk})
+        self.assertEqual(self.client.get(f'/api/feedback/{self.private_feedback.pk}/').status_code, 404)
+        response = self.client.get(f'/api/feedback/?board_id={self.private_board.pk}')
+        self.assertEqual(response.data['results'], [])
+
+    def test_comment_list_and_thread(self):
+        self.login(self.outsider)
+        response = self.client.get(f'/api/comments/?feedback_id={self.private_feedback.pk}')
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(self.client.get(f'/api/comments/{self.private_comment.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/feedback/{self.private_feedback.pk}/comments/').status_code, 404)
+
+        self.login(self.member)
+        response = self.client.get(f'/api/comments/?feedback_id={self.private_feedback.pk}')
+        self.assertEqual(self.ids(response), [self.private_comment.pk])
+
+    def test_create_on_a_private_board(self):
+        self.login(self.outsider)
+        response = self.client.post('/api/feedback/', {
+            'title': 'Let me in please', 'description': 'x', 'board_id': self.private_board.pk,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'board_id': ['Board not found']})
+        response = self.client.post('/api/comments/', {'feedback_id': self.private_feedback.pk, 'text': 'Hello there'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, ['Feedback not found'])
+        self.assertEqual(self.private_feedback.comments.count(), 1)
+
+        self.login(self.member)
+        response = self.client.post('/api/feedback/', {
+            'title': 'Members may post', 'description': 'x', 'board_id': self.private_board.pk,
+        })
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/api/comments/', {'feedback_id': self.private_feedback.pk, 'text': 'Hello there'})
+        self.assertEqual(response.status_code, 201)
+
+    def test_membership_changes_apply_at_once(self):
+        self.assertEqual(self.feedback_ids(self.outsider), {self.public_feedback.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private_board.members.add(self.outsider)
+        self.assertIn(self.private_feedback.pk, self.feedback_ids(self.outsider))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.outsider.boards.remove(self.private_board)
+        self.assertNotIn(self.private_feedback.pk, self.feedback_ids(self.outsider))
+
+    def test_publishing_a_board_applies_at_once(self):
+        self.assertEqual(self.board_ids(self.outsider), {self.public_board.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private_board.public = True
+            self.private_board.save()
+        self.assertIn(self.private_board.pk, self.board_ids(self.outsider))
+
+
+class ReadableBoardCacheTests(CoreTestCase):
+    def test_resolved_once_per_user(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(access.readable_board_ids(self.member), {self.public_board.pk, self.private_board.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(access.readable_board_ids(self.member), {self.public_board.pk, self.private_board.pk})
+
+    def test_staff_read_every_board(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(access.readable_board_ids(self.admin))
+
+    def test_new_boards(self):
+        access.readable_board_ids(self.outsider)
+        with self.captureOnCommitCallbacks(execute=True):
+            board = Board.objects.create(name='Another', created_by=self.admin)
+        self.assertIn(board.pk, access.readable_board_ids(self.outsider))
@@ -0,0 +1,45 @@
+from core.authentication import principals
+
+from .base import CoreTestCase
+
+
+class PrincipalCacheTests(CoreTestCase):
+    """Cached users are dropped as soon as the row changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+
+    def me(self):
+        return self.client.get('/api/auth/me/')
+
+    def test_cached_user_needs_no_query(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.assertIsNotNone(principals.get(self.member.pk))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.me().status_code, 200)
+
+    def test_role_change(self):
+        self.assertEqual(self.me().data['role'], 'contributor')
+        self.member.role = 'moderator'
+        self.member.save()
+        self.assertEqual(self.me().data['role'], 'moderator')
+
+    def test_deactivation(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.member.is_active = False
+        self.member.save()
+        self.assertEqual(self.me().status_code, 401)
+
+    def test_password_change_revokes_tokens(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.member.set_password('a-new-password-456')
+        self.member.save()
+        self.assertEqual(self.me().status_code, 401)
+        self.login(self.member)
+        self.assertEqual(self.me().status_code, 200)
+
+    def test_deleted_user(self):
+        self.assertEqual(self.me().status_code, 200)
+        self.member.delete()
+        self.assertEqual(self.me().status_code, 401)
@@ -0,0 +1,144 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from core.models import Comment, Feedback
+from core.serializers import MAX_BULK_ITEMS
+
+from .base import CoreTestCase
+
+
+class BulkFeedbackTests(CoreTestCase):
+    url = '/api/feedback/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+
+    def item(self, title, board=None, **fields):
+        return {'title': title, 'description': 'x', 'board_id': (board or self.public_board).pk, **fields}
+
+    def test_create(self):
+        response = self.client.post(self.url, {'items': [
+            self.item('Dark mode please', tags='ui, UX'),
+            self.item('Private request', board=self.private_board),
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        ids = [result['id'] for result in response.data['results']]
+        self.assertEqual(Feedback.objects.filter(pk__in=ids, created_by=self.member).count(), 2)
+        # Tag links and the search index are kept without the signals
+        self.assertEqual(self.ids(self.client.get('/api/feedback/?tags=ux')), [ids[0]])
+        self.assertEqual(self.ids(self.client.get('/api/feedback/?search=dark')), [ids[0]])
+
+    def test_failed_entries(self):
+        self.login(self.outsider)
+        response = self.client.post(self.url, {'items': [
+            self.item('Fine item'),
+            self.item('No'),
+            self.item('Not my board', board=self.private_board),
+        ]}, format='json')
+        self.assertEqual(response.status_code, 207)
+        results = response.data['results']
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertIn('id', results[0])
+        self.assertIn('title', results[1]['errors'])
+        self.assertIn('board_id', results[2]['errors'])
+
+    def test_limits(self):
+        self.assertEqual(self.client.post(self.url, {'items': []}, format='json').status_code, 400)
+        items = [self.item('Too many items')] * (MAX_BULK_ITEMS + 1)
+        self.assertEqual(self.client.post(self.url, {'items': items}, format='json').status_code, 400)
+        self.assertFalse(Feedback.objects.exists())
+
+    def test_update_needs_edit_rights(self):
+        own = self.make_feedback(tags='ui')
+        other = self.make_feedback(user=self.admin)
+        response = self.client.patch(self.url, {'items': [
+            {'id': own.pk, 'status': 'completed', 'tags': 'api'},
+            {'id': other.pk, 'status': 'completed'},
+            {'id': 0, 'status': 'completed'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [sorted(result.get('errors', {})) for result in response.data['results']], [[], ['detail'], ['detail']],
+        )
+        own.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((own.status, own.tags, other.status), ('completed', 'api', 'open'))
+        self.assertEqual(self.ids(self.client.get('/api/feedback/?tags=api')), [own.pk])
+
+    def test_delete(self):
+        doomed = self.make_feedback(title='Dark mode please')
+        Comment.objects.create(feedback=doomed, user=self.admin, text='Seconded')
+        kept = self.make_feedback(user=self.admin)
+        response = self.client.delete(self.url, {'ids': [doomed.pk, kept.pk]}, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(list(Feedback.objects.values_list('id', flat=True)), [kept.pk])
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(self.ids(self.client.get('/api/feedback/?search=dark')), [])
+
+
+class BulkCommentTests(CoreTestCase):
+    def test_create(self):
+        feedback = self.make_feedback()
+        private = self.make_feedback(board=self.private_board)
+        self.login(self.outsider)
+        response = self.client.post('/api/comments/bulk/', {'items': [
+            {'feedback_id': feedback.pk, 'text': 'First comment'},
+            {'feedback_id': feedback.pk, 'text': 'Second comment'},
+            {'feedback_id': private.pk, 'text': 'Cannot see it'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertIn('feedback_id', response.data['results'][2]['errors'])
+        feedback.refresh_from_db()
+        self.assertEqual((feedback.comment_count, feedback.comments.count()), (2, 2))
+        response = self.client.get('/api/feedback/?search=second&search_comments=1')
+        self.assertEqual(self.ids(response), [feedback.pk])
+
+
+class ImportFeedbackTests(CoreTestCase):
+    def write(self, suffix, text):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_feedback', path, '--user', 'member', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv(self):
+        path = self.write('.csv', (
+            'title,description,board_id,status,tags\n'
+            'Imported first,From a file,,completed,"ui, api"\n'
+            'Bad,Title too short,,,\n'
+            f'Imported second,Elsewhere,{self.private_board.pk},,\n'
+        ))
+        out, err = self.run_import(path, '--board', str(self.public_board.pk), '--chunk-size', '1')
+        self.assertIn('Imported 2 feedback items, 1 rows failed', out)
+        self.assertIn('line 3:', err)
+        first = Feedback.objects.get(title='Imported first')
+        self.assertEqual((first.board, first.status, first.created_by), (self.public_board, 'completed', self.member))
+        self.assertEqual(Feedback.objects.get(title='Imported second').board, self.private_board)
+
+    def test_jsonl(self):
+        path = self.write('.jsonl', (
+            f'{{"title": "Imported line", "description": "x", "board_id": {self.public_board.pk}}}\n'
+            '\n'
+            '{"title": "No board at all", "description": "x"}\n'
+        ))
+        out, err = self.run_import(path)
+        self.assertIn('Imported 1 feedback items, 1 rows failed', out)
+        self.assertIn('line 3:', err)
+
+    def test_bad_input(self):
+        with self.assertRaises(CommandError):
+            self.run_import(self.write('.jsonl', '{not json\n'))
+        with self.assertRaises(CommandError):
+            self.run_import(self.write('.txt', 'title\n'))
+        with self.assertRaises(CommandError):
+            call_command('import_feedback', self.write('.csv', 'title\n'), '--user', 'nobody')
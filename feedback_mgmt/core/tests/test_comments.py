@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Comment
+from core.views import COMMENT_PREVIEW_SIZE
+
+from .base import CoreTestCase
+
+
+class CommentThreadTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        self.feedback = self.make_feedback()
+        # Distinct created_at values, oldest first
+        start = timezone.now() - timedelta(hours=1)
+        self.comments = []
+        for i in range(5):
+            comment = Comment.objects.create(feedback=self.feedback, user=self.admin, text=f'Comment number {i}')
+            Comment.objects.filter(pk=comment.pk).update(created_at=start + timedelta(minutes=i))
+            self.comments.append(comment.pk)
+
+    def test_previews_are_the_latest_few(self):
+        row = self.client.get('/api/feedback/?expand=comments').data['results'][0]
+        self.assertEqual([comment['id'] for comment in row['comments']], self.comments[::-1][:COMMENT_PREVIEW_SIZE])
+        self.assertEqual(row['comment_count'], 5)
+        detail = self.client.get(f'/api/feedback/{self.feedback.pk}/').data
+        self.assertEqual(len(detail['comments']), COMMENT_PREVIEW_SIZE)
+
+    def test_previews_take_one_query_per_page(self):
+        for _ in range(4):
+            other = self.make_feedback()
+            for i in range(4):
+                Comment.objects.create(feedback=other, user=self.member, text=f'Other comment {i}')
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get('/api/feedback/?expand=comments').data['results']
+        self.assertTrue(all(len(row['comments']) == COMMENT_PREVIEW_SIZE for row in rows))
+        # One windowed query for every row's previews
+        self.assertEqual(len([query for query in queries if 'ROW_NUMBER()' in query['sql']]), 1)
+
+    def test_thread_pages_oldest_first(self):
+        url = f'/api/feedback/{self.feedback.pk}/comments/?page_size=2&total=exact'
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['total'], 5)
+            ids += self.ids(response)
+            url = response.data['next']
+        self.assertEqual(ids, self.comments)
+
+    def test_thread_fields_and_expand(self):
+        url = f'/api/feedback/{self.feedback.pk}/comments/'
+        row = self.client.get(f'{url}?fields=id,user').data['results'][0]
+        self.assertEqual(row, {'id': self.comments[0], 'user': {'id': self.admin.pk, 'username': 'admin'}})
+        row = self.client.get(f'{url}?expand=user').data['results'][0]
+        self.assertEqual(row['user']['role'], 'admin')
+
+    def test_comment_list_needs_a_feedback_id(self):
+        self.assertEqual(self.client.get('/api/comments/').status_code, 400)
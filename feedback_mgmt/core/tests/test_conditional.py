@@ -0,0 +1,154 @@
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from core.analytics import SUMMARY_VERSION_KEY
+from core.models import Comment
+
+from .base import CoreTestCase
+
+
+class ConditionalGetTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.feedback = self.make_feedback(tags='ui')
+        self.login(self.member)
+
+    def assertRevalidates(self, url, change, modified=True):
+        """A 304 for ``url`` until ``change()`` runs, then a 200 (unless ``modified`` is False)."""
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200 if modified else 304)
+
+    def rename(self, obj, field, value):
+        setattr(obj, field, value)
+        obj.save()
+
+    def test_unchanged_list_is_not_sent_again(self):
+        self.assertRevalidates('/api/feedback/', lambda: None, modified=False)
+
+    def test_feedback_edit(self):
+        self.assertRevalidates('/api/feedback/', lambda: self.rename(self.feedback, 'title', 'Renamed feedback'))
+
+    def test_new_and_deleted_feedback(self):
+        self.assertRevalidates('/api/feedback/', lambda: self.make_feedback())
+        self.assertRevalidates('/api/feedback/', lambda: self.feedback.delete())
+
+    def test_votes_and_comments(self):
+        self.assertRevalidates('/api/feedback/', lambda: self.client.post(f'/api/feedback/{self.feedback.pk}/upvote/'))
+        self.assertRevalidates('/api/feedback/', lambda: Comment.objects.create(
+            feedback=self.feedback, user=self.admin, text='A comment',
+        ))
+
+    def test_board_rename(self):
+        # Compact rows embed the board name
+        self.assertRevalidates('/api/feedback/', lambda: self.rename(self.public_board, 'name', 'Renamed board'))
+        self.assertRevalidates(
+            f'/api/feedback/{self.feedback.pk}/', lambda: self.rename(self.public_board, 'name', 'Again'),
+        )
+
+    def test_author_rename(self):
+        self.assertRevalidates('/api/feedback/', lambda: self.rename(self.member, 'username', 'renamed'))
+
+    def test_comments(self):
+        comment = Comment.objects.create(feedback=self.feedback, user=self.admin, text='A comment')
+        url = f'/api/comments/?feedback_id={self.feedback.pk}'
+        self.assertRevalidates(url, lambda: Comment.objects.create(
+            feedback=self.feedback, user=self.member, text='Another one',
+        ))
+        self.assertRevalidates(url, lambda: self.rename(comment, 'text', 'Edited comment'))
+        self.assertRevalidates(f'/api/comments/{comment.pk}/', lambda: self.rename(comment, 'text', 'Edited again'))
+
+    def test_comment_thread(self):
+        comment = Comment.objects.create(feedback=self.feedback, user=self.admin, text='A comment')
+        url = f'/api/feedback/{self.feedback.pk}/comments/'
+        self.assertRevalidates(url, lambda: Comment.objects.create(
+            feedback=self.feedback, user=self.member, text='Another one',
+        ))
+        self.assertRevalidates(url, lambda: self.rename(comment, 'text', 'Edited comment'))
+        self.assertRevalidates(url, lambda: self.rename(self.admin, 'username', 'renamed-admin'))
+        self.assertRevalidates(url, lambda: comment.delete())
+
+    def test_board_edit(self):
+        url = f'/api/boards/{self.public_board.pk}/'
+        self.assertRevalidates(url, lambda: self.rename(self.public_board, 'description', 'Everybody, really'))
+        self.assertRevalidates('/api/boards/', lambda: self.rename(self.public_board, 'name', 'Renamed board'))
+
+    def test_board_membership(self):
+        url = f'/api/boards/{self.private_board.pk}/?expand=members'
+        self.assertRevalidates(url, lambda: self.private_board.members.add(self.outsider))
+
+    def test_etag_only(self):
+        # Deletes and votes move no timestamp, so no date can stand for them
+        response = self.client.get('/api/feedback/')
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+        later = http_date(time.time() + 3600)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feedback.delete()
+        self.assertEqual(self.client.get('/api/feedback/', HTTP_IF_MODIFIED_SINCE=later).status_code, 200)
+
+    def test_validators_are_per_viewer(self):
+        etag = self.client.get('/api/feedback/')['ETag']
+        self.login(self.admin)
+        self.assertEqual(self.client.get('/api/feedback/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SummaryRevalidationTests(CoreTestCase):
+    url = '/api/feedback/summary/'
+
+    def setUp(self):
+        super().setUp()
+        self.feedback = self.make_feedback()
+        self.login(self.member)
+
+    def etag(self):
+        return self.client.get(self.url)['ETag']
+
+    def test_unchanged(self):
+        etag = self.etag()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_expired_version(self):
+        # What another process sees once its copy of the clock expires
+        etag = self.etag()
+        cache.delete(SUMMARY_VERSION_KEY)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_only(self):
+        # The version clock restarts on expiry, so it is no modification date
+        response = self.client.get(self.url)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_aggregates_are_cached(self):
+        first = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse([query for query in queries if 'core_feedbackdailystat' in query['sql']])
+
+    def test_feedback_change(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_feedback(status='completed')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_vote(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/feedback/{self.feedback.pk}/upvote/')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_scoped_to_readable_boards(self):
+        etag = self.etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.private_board.members.remove(self.member)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,160 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core import counters, votes
+from core.models import Comment, Feedback
+
+from .base import CoreTestCase
+
+
+class VoteTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.feedback = self.make_feedback()
+        self.url = f'/api/feedback/{self.feedback.pk}/vote/'
+        self.login(self.member)
+
+    def count(self, feedback=None):
+        return Feedback.objects.values_list('upvote_count', flat=True).get(pk=(feedback or self.feedback).pk)
+
+    def test_put_is_idempotent(self):
+        for _ in range(2):
+            response = self.client.put(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'upvoted': True, 'upvote_count': 1})
+        self.assertEqual(self.feedback.upvotes.count(), 1)
+
+    def test_delete_is_idempotent(self):
+        self.client.put(self.url)
+        for _ in range(2):
+            response = self.client.delete(self.url)
+            self.assertEqual(response.data, {'upvoted': False, 'upvote_count': 0})
+        self.assertEqual(self.count(), 0)
+
+    def test_toggle_flips_the_vote(self):
+        url = f'/api/feedback/{self.feedback.pk}/upvote/'
+        self.assertEqual(self.client.post(url).data, {'upvoted': True, 'upvote_count': 1})
+        self.assertEqual(self.client.post(url).data, {'upvoted': False, 'upvote_count': 0})
+
+    def test_votes_of_several_users_add_up(self):
+        self.client.put(self.url)
+        self.login(self.outsider)
+        self.assertEqual(self.client.put(self.url).data['upvote_count'], 2)
+        self.assertEqual(self.client.delete(self.url).data['upvote_count'], 1)
+
+    def test_batch_applies_only_real_changes(self):
+        other = self.make_feedback()
+        self.client.put(self.url)
+        response = self.client.post('/api/feedback/votes/', {'votes': [
+            {'feedback_id': self.feedback.pk, 'upvoted': True},
+            {'feedback_id': other.pk, 'upvoted': True},
+            {'feedback_id': other.pk, 'upvoted': False},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # The last vote for an item wins
+        self.assertEqual(response.data['results'], [
+            {'feedback_id': self.feedback.pk, 'upvoted': True, 'upvote_count': 1},
+            {'feedback_id': other.pk, 'upvoted': False, 'upvote_count': 0},
+        ])
+        self.assertEqual(self.count(other), 0)
+
+    def test_batch_with_an_unreadable_item_changes_nothing(self):
+        private = self.make_feedback(board=self.private_board)
+        self.login(self.outsider)
+        response = self.client.post('/api/feedback/votes/', {'votes': [
+            {'feedback_id': self.feedback.pk, 'upvoted': True},
+            {'feedback_id': private.pk, 'upvoted': True},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.count(), 0)
+        self.assertEqual(self.count(private), 0)
+
+    def test_batch_size_is_capped(self):
+        response = self.client.post('/api/feedback/votes/', {'votes': [
+            {'feedback_id': self.feedback.pk, 'upvoted': True},
+        ] * (votes.MAX_BATCH_VOTES + 1)}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.count(), 0)
+
+    def test_set_vote_reports_real_changes(self):
+        self.assertTrue(votes.set_vote(self.feedback.pk, self.member.pk, True))
+        self.assertFalse(votes.set_vote(self.feedback.pk, self.member.pk, True))
+        self.assertTrue(votes.set_vote(self.feedback.pk, self.member.pk, False))
+        self.assertFalse(votes.set_vote(self.feedback.pk, self.member.pk, False))
+        self.assertEqual(self.count(), 0)
+
+    def test_voting_on_unreadable_feedback_is_not_found(self):
+        private = self.make_feedback(board=self.private_board)
+        self.login(self.outsider)
+        self.assertEqual(self.client.put(f'/api/feedback/{private.pk}/vote/').status_code, 404)
+        self.assertEqual(self.count(private), 0)
+
+
+class CounterTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.feedback = self.make_feedback()
+
+    def counts(self):
+        return Feedback.objects.values_list('upvote_count', 'comment_count').get(pk=self.feedback.pk)
+
+    def test_comments_move_the_comment_count(self):
+        self.login(self.member)
+        response = self.client.post('/api/comments/', {'feedback_id': self.feedback.pk, 'text': 'Agreed'})
+        self.assertEqual(response.status_code, 201)
+        Comment.objects.create(feedback=self.feedback, user=self.admin, text='Noted')
+        self.assertEqual(self.counts(), (0, 2))
+
+        self.assertEqual(self.client.delete(f"/api/comments/{response.data['id']}/").status_code, 204)
+        self.assertEqual(self.counts(), (0, 1))
+
+    def test_adjust_never_goes_below_zero(self):
+        self.assertEqual(counters.adjust(self.feedback.pk, 'upvote_count', -1), 0)
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_saving_a_stale_copy_keeps_the_counters(self):
+        stale = Feedback.objects.get(pk=self.feedback.pk)
+        votes.set_vote(self.feedback.pk, self.admin.pk, True)
+        Comment.objects.create(feedback=self.feedback, user=self.admin, text='Noted')
+
+        stale.title = 'A new title'
+        stale.save()
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_saving_a_partial_copy_writes_only_what_was_loaded(self):
+        partial = Feedback.objects.only('id', 'title').get(pk=self.feedback.pk)
+        Feedback.objects.filter(pk=self.feedback.pk).update(description='Edited elsewhere')
+        partial.title = 'A new title'
+        with CaptureQueriesContext(connection) as queries:
+            partial.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "core_feedback"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"description"', updates[0])
+        self.assertIn('"updated_at"', updates[0])
+        self.feedback.refresh_from_db()
+        self.assertEqual((self.feedback.title, self.feedback.description), ('A new title', 'Edited elsewhere'))
+
+    def test_update_through_the_api_leaves_the_counters(self):
+        self.login(self.member)
+        votes.set_vote(self.feedback.pk, self.admin.pk, True)
+        response = self.client.patch(f'/api/feedback/{self.feedback.pk}/', {'title': 'A new title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['upvote_count'], 1)
+        self.assertEqual(self.counts(), (1, 0))
+
+    def test_most_voted_first(self):
+        other = self.make_feedback()
+        votes.set_vote(self.feedback.pk, self.admin.pk, True)
+        self.login(self.member)
+        response = self.client.get('/api/feedback/?ordering=upvotes')
+        self.assertEqual(self.ids(response), [self.feedback.pk, other.pk])
+        response = self.client.get('/api/feedback/?ordering=-upvotes')
+        self.assertEqual(self.ids(response), [other.pk, self.feedback.pk])
+
+    def test_reconcile_repairs_drift(self):
+        votes.set_vote(self.feedback.pk, self.admin.pk, True)
+        Feedback.objects.filter(pk=self.feedback.pk).update(upvote_count=7, comment_count=3)
+        self.assertEqual(counters.reconcile(dry_run=True), 1)
+        self.assertEqual(counters.reconcile(), 1)
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(counters.reconcile(), 0)
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.test import RequestFactory, SimpleTestCase
+
+from core import routers
+from core.backends.sqlite3.base import DatabaseWrapper
+from core.models import Feedback
+from feedback_mgmt.caches import caches
+from feedback_mgmt.database import REPLICA, databases
+
+from .base import CoreTestCase
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def settings_for(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return databases(Path('/srv/feedback'))
+
+    def test_sqlite_by_default(self):
+        default = self.settings_for()['default']
+        self.assertEqual(default['ENGINE'], 'core.backends.sqlite3')
+        self.assertEqual(default['NAME'], '/srv/feedback/db.sqlite3')
+        self.assertEqual(default['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA busy_timeout = 20000', default['OPTIONS']['init_command'])
+        self.assertEqual((default['CONN_MAX_AGE'], default['CONN_HEALTH_CHECKS']), (60, True))
+
+    def test_postgres_with_a_replica(self):
+        result = self.settings_for(DB_ENGINE='postgres', DB_HOST='primary.db', DB_REPLICA_HOST='replica.db')
+        self.assertEqual(result['default']['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((result['default']['HOST'], result[REPLICA]['HOST']), ('primary.db', 'replica.db'))
+        self.assertEqual(result[REPLICA]['TEST'], {'MIRROR': 'default'})
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.settings_for(DB_ENGINE='oracle')
+
+
+class CacheSettingsTests(SimpleTestCase):
+    def settings_for(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return caches(Path('/srv/feedback'))['default']
+
+    def test_locmem_by_default(self):
+        default = self.settings_for()
+        self.assertEqual(default['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+        self.assertEqual(default['OPTIONS'], {'MAX_ENTRIES': 10000})
+        self.assertEqual(self.settings_for(CACHE_BACKEND='file')['LOCATION'], '/srv/feedback/cache')
+
+    def test_shared_servers(self):
+        default = self.settings_for(CACHE_BACKEND='redis', CACHE_LOCATION='redis://cache:6379/1')
+        self.assertEqual(default, {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379/1',
+        })
+        with self.assertRaises(ImproperlyConfigured):
+            self.settings_for(CACHE_BACKEND='memcached')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.settings_for(CACHE_BACKEND='disk')
+
+
+class SQLiteBackendTests(CoreTestCase):
+    def test_pragmas_and_immediate_transactions(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+    def test_transaction_mode_is_validated(self):
+        settings_dict = {**connection.settings_dict, 'OPTIONS': {'transaction_mode': 'sometimes'}}
+        with self.assertRaises(ImproperlyConfigured):
+            DatabaseWrapper(settings_dict, alias='other').get_connection_params()
+
+
+@mock.patch.object(routers, 'replica_configured', lambda: True)
+class ReplicaRoutingTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def read_alias(self, request):
+        token = routers.start(request)
+        try:
+            return self.router.db_for_read(Feedback)
+        finally:
+            routers.stop(token)
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.read_alias(self.factory.get('/api/feedback/')), REPLICA)
+        self.assertEqual(self.read_alias(self.factory.post('/api/feedback/')), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.router.db_for_write(Feedback), DEFAULT_DB_ALIAS)
+
+    def test_outside_requests_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Feedback), DEFAULT_DB_ALIAS)
+
+    def test_writers_are_pinned_to_the_primary(self):
+        headers = {'HTTP_AUTHORIZATION': 'Bearer writer'}
+        routers.remember_write(self.factory.post('/api/feedback/', **headers), mock.Mock(status_code=201))
+        self.assertEqual(self.read_alias(self.factory.get('/api/feedback/', **headers)), DEFAULT_DB_ALIAS)
+        # Other clients, and failed writes, are not pinned
+        self.assertEqual(self.read_alias(self.factory.get('/api/feedback/')), REPLICA)
+        routers.remember_write(self.factory.post('/api/feedback/'), mock.Mock(status_code=400))
+        self.assertEqual(self.read_alias(self.factory.get('/api/feedback/')), REPLICA)
+
+    def test_replica_is_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'core'))
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core'))
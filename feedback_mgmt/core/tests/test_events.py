@@ -0,0 +1,146 @@
+import json
+from unittest import mock
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core import events, votes
+from core.models import Comment
+
+from .base import CoreTestCase
+
+
+def parse(body):
+    """``(event type, data)`` pairs of a Server-Sent Events body."""
+    parsed = []
+    for block in body.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in fields:
+            parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+class BrokerTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = events.InMemoryBroker(history_size=3)
+
+    def publish(self, board_id=1, type='feedback.updated'):
+        return self.broker.publish(events.Event(board_id, type, {}))
+
+    def test_subscribers_of_the_board_get_its_events(self):
+        subscription, replay = self.broker.subscribe(1)
+        other, _ = self.broker.subscribe(2)
+        event = self.publish()
+        self.assertEqual(replay, [])
+        self.assertIs(subscription.get(0), event)
+        self.assertIsNone(other.get(0))
+
+        self.broker.unsubscribe(subscription)
+        self.publish()
+        self.assertIsNone(subscription.get(0))
+
+    def test_replay_after_the_last_event_id(self):
+        first, second = self.publish(), self.publish()
+        _, replay = self.broker.subscribe(1, last_event_id=first.id)
+        self.assertEqual(replay, [second])
+        _, replay = self.broker.subscribe(1, last_event_id=second.id)
+        self.assertEqual(replay, [])
+
+    def test_lost_events_need_a_refetch(self):
+        first = self.publish()
+        for _ in range(3):
+            self.publish()
+        # The history still starts right after ``first``
+        self.assertEqual(len(self.broker.subscribe(1, last_event_id=first.id)[1]), 3)
+        self.publish()
+        # Now the event after ``first`` fell out of it
+        self.assertIsNone(self.broker.subscribe(1, last_event_id=first.id)[1])
+        # Ids of another process or an earlier run
+        self.assertIsNone(self.broker.subscribe(1, last_event_id='feedcafe-1')[1])
+
+    def test_slow_subscribers_overflow(self):
+        subscription, _ = self.broker.subscribe(1)
+        with mock.patch.object(subscription.queue, 'put_nowait', side_effect=events.queue.Full):
+            self.publish()
+        self.assertTrue(subscription.overflowed)
+
+
+class BoardEventTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        events._brokers.clear()
+        self.subscription, _ = events.get_broker().subscribe(self.public_board.pk)
+        self.addCleanup(events.get_broker().unsubscribe, self.subscription)
+
+    def received(self):
+        types = []
+        while (event := self.subscription.get(0)) is not None:
+            types.append((event.type, event.data))
+        return types
+
+    def test_feedback_lifecycle(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback = self.make_feedback()
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback.status = 'completed'
+            feedback.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback.delete()
+        self.assertEqual([type for type, _ in self.received()], [
+            'feedback.created', 'feedback.status', 'feedback.deleted',
+        ])
+
+    def test_votes_and_comments(self):
+        feedback = self.make_feedback()
+        self.received()
+        with self.captureOnCommitCallbacks(execute=True):
+            votes.set_vote(feedback.pk, self.admin.pk, True)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(feedback=feedback, user=self.admin, text='A comment')
+        received = self.received()
+        self.assertIn(('feedback.counts', {'id': feedback.pk, 'upvote_count': 1, 'comment_count': 0}), received)
+        self.assertIn('comment.created', [type for type, _ in received])
+
+    def test_nothing_is_sent_for_rolled_back_changes(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self.make_feedback()
+        self.assertEqual(self.received(), [])
+
+
+@mock.patch.object(events, 'STREAM_SECONDS', 0)
+class EventStreamTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        events._brokers.clear()
+        self.url = f'/api/boards/{self.public_board.pk}/events/'
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_replay_and_reset(self):
+        self.login(self.member)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_feedback()
+        with self.captureOnCommitCallbacks(execute=True):
+            second = self.make_feedback()
+        first_id = events.get_broker().history[self.public_board.pk][0][1].id
+
+        body = self.read(self.client.get(self.url, HTTP_LAST_EVENT_ID=first_id))
+        self.assertTrue(body.startswith('retry: '))
+        self.assertEqual(parse(body), [
+            ('feedback.created', {'id': second.pk, 'status': 'open', 'title': second.title}),
+        ])
+
+        body = self.read(self.client.get(self.url, HTTP_LAST_EVENT_ID='feedcafe-1'))
+        self.assertEqual(parse(body), [('reset', {})])
+
+    def test_query_token(self):
+        token = RefreshToken.for_user(self.member).access_token
+        self.read(self.client.get(f'{self.url}?access_token={token}'))
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_private_boards(self):
+        self.login(self.outsider)
+        self.assertEqual(self.client.get(f'/api/boards/{self.private_board.pk}/events/').status_code, 404)
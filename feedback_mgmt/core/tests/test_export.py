@@ -0,0 +1,86 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+
+from core import export, votes
+from core.models import Comment, Feedback
+
+from .base import CoreTestCase
+
+
+class ExportTests(CoreTestCase):
+    url = '/api/feedback/export/'
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.outsider)
+        self.feedback = self.make_feedback(title='Exported, with "quotes"', tags='ui')
+        self.completed = self.make_feedback(status='completed')
+        self.private = self.make_feedback(board=self.private_board)
+        Comment.objects.create(feedback=self.feedback, user=self.admin, text='First comment')
+        Comment.objects.create(feedback=self.private, user=self.member, text='Members only')
+        votes.set_vote(self.feedback.pk, self.admin.pk, True)
+
+    def download(self, query=''):
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def rows(self, query=''):
+        _, body = self.download(query)
+        return list(csv.DictReader(io.StringIO(body.decode('utf-8'))))
+
+    def test_csv(self):
+        response, _ = self.download()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('filename="feedback-export.csv"', response['Content-Disposition'])
+        rows = self.rows()
+        self.assertEqual([int(row['id']) for row in rows], [self.feedback.pk, self.completed.pk])
+        self.assertEqual(rows[0]['title'], 'Exported, with "quotes"')
+        self.assertEqual((rows[0]['created_by'], rows[0]['upvote_count']), ('member', '1'))
+
+    def test_list_filters_apply(self):
+        self.assertEqual([row['id'] for row in self.rows('status=completed')], [str(self.completed.pk)])
+        self.assertEqual([row['id'] for row in self.rows('tags=ui')], [str(self.feedback.pk)])
+
+    def test_comments_and_votes(self):
+        self.assertEqual([row['text'] for row in self.rows('kind=comments')], ['First comment'])
+        self.assertEqual(self.rows('kind=votes'), [{'feedback_id': str(self.feedback.pk), 'user': 'admin'}])
+
+    def test_ndjson_gzip(self):
+        response, body = self.download('output=ndjson&compress=gzip')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        lines = gzip.decompress(body).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [self.feedback.pk, self.completed.pk])
+
+    def test_bad_options(self):
+        for query in ['kind=boards', 'output=xml', 'compress=zip']:
+            self.assertEqual(self.client.get(f'{self.url}?{query}').status_code, 400)
+
+    def test_large_exports_are_flushed_in_pieces(self):
+        for i in range(40):
+            self.make_feedback(title=f'Feedback number {i}', description='x' * 4000)
+        chunks = list(export.stream('feedback', Feedback.objects.all(), chunk_size=10))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) < 2 * export.FLUSH_BYTES for chunk in chunks))
+
+
+class ExportCommandTests(CoreTestCase):
+    def test_to_a_file(self):
+        self.make_feedback(board=self.private_board, status='completed')
+        self.make_feedback()
+        fd, path = tempfile.mkstemp(suffix='.csv.gz')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        out = io.StringIO()
+        call_command('export_feedback', '--board', str(self.private_board.pk), '--gzip', '-o', path, stdout=out)
+        self.assertIn(f'to {path}', out.getvalue())
+        with gzip.open(path, 'rt') as fh:
+            rows = list(csv.DictReader(fh))
+        self.assertEqual([row['status'] for row in rows], ['completed'])
@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Comment
+
+from .base import CoreTestCase
+
+
+class SparseFieldsTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.feedback = self.make_feedback(tags='ui')
+        Comment.objects.create(feedback=self.feedback, user=self.admin, text='A comment')
+        self.login(self.member)
+
+    def first_row(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'][0]
+
+    def test_compact_rows(self):
+        row = self.first_row('/api/feedback/')
+        self.assertEqual(row['board'], {'id': self.public_board.pk, 'name': 'Public'})
+        self.assertEqual(row['created_by'], {'id': self.member.pk, 'username': 'member'})
+        self.assertEqual((row['upvote_count'], row['comment_count']), (0, 1))
+        self.assertNotIn('comments', row)
+
+    def test_fields(self):
+        self.assertEqual(set(self.first_row('/api/feedback/?fields=id,title')), {'id', 'title'})
+        row = self.client.get(f'/api/feedback/{self.feedback.pk}/?fields=id,status').data
+        self.assertEqual(set(row), {'id', 'status'})
+
+    def test_expand(self):
+        row = self.first_row('/api/feedback/?expand=comments,created_by')
+        self.assertEqual(row['created_by']['role'], 'contributor')
+        self.assertEqual([comment['user']['username'] for comment in row['comments']], ['admin'])
+        self.assertEqual(row['board'], {'id': self.public_board.pk, 'name': 'Public'})
+
+    def test_detail_is_expanded(self):
+        data = self.client.get(f'/api/feedback/{self.feedback.pk}/').data
+        self.assertEqual(data['board']['description'], 'Everybody')
+        self.assertEqual(len(data['comments']), 1)
+
+    def test_boards(self):
+        row = next(
+            board for board in self.client.get('/api/boards/').data['results'] if board['id'] == self.private_board.pk
+        )
+        self.assertEqual(row['member_count'], 1)
+        self.assertNotIn('members', row)
+        row = self.client.get(f'/api/boards/{self.private_board.pk}/?expand=members').data
+        self.assertEqual([member['username'] for member in row['members']], ['member'])
+
+    def test_queries_do_not_grow_with_the_page(self):
+        self.client.get('/api/feedback/?expand=comments')
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/feedback/?expand=comments')
+        for board in (self.public_board, self.private_board):
+            for _ in range(3):
+                feedback = self.make_feedback(board=board, user=self.admin, tags='api')
+                Comment.objects.create(feedback=feedback, user=self.member, text='Another comment')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/feedback/?expand=comments')
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertEqual(len(large), len(small))
@@ -0,0 +1,60 @@
+import re
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from core.management.commands.explain_queries import Command as ExplainCommand
+from core.views import FeedbackViewSet
+
+from .base import CoreTestCase
+
+
+class ListIndexTests(CoreTestCase):
+    def plan(self, params):
+        return ExplainCommand.list_queryset(FeedbackViewSet, self.admin, params).explain()
+
+    def test_filtered_lists_read_an_index_in_order(self):
+        cases = [
+            ({'ordering': '-created_at'}, 'feedback_created_idx'),
+            ({'board_id': self.public_board.pk, 'ordering': '-created_at'}, 'feedback_board_created_idx'),
+            ({'board_id': self.public_board.pk, 'status': 'open', 'ordering': '-created_at'},
+             'feedback_board_status_idx'),
+            ({'status': 'open', 'ordering': '-upvote_count'}, 'feedback_status_votes_idx'),
+        ]
+        for params, index in cases:
+            with self.subTest(params):
+                plan = self.plan(params)
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_comment_thread_reads_its_index_in_order(self):
+        feedback = self.make_feedback()
+        plan = FeedbackViewSet.thread_comments(feedback.pk)[:20].explain()
+        self.assertIn('comment_feedback_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class ExplainQueriesTests(CoreTestCase):
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('explain_queries', *args, stdout=out)
+        return out.getvalue()
+
+    def test_summary(self):
+        self.make_feedback(tags='ui, api')
+        output = self.run_command('--role', 'admin')
+        total, flagged = map(int, re.search(r'(\d+) querysets explained, (\d+) flagged$', output).groups())
+        self.assertGreater(total, 20)
+        self.assertLessEqual(flagged, total)
+
+    def test_filters_that_cannot_match_are_skipped(self):
+        # No tags exist, so the tag filters resolve to an empty id list
+        output = self.run_command('--role', 'admin')
+        self.assertRegex(output, r'flagged, \d+ skipped \(cannot match anything\)$')
+
+    def test_fail_on_issues(self):
+        # Ignoring every plan line leaves nothing to flag
+        output = self.run_command('--ignore', '.', '--fail-on-issues')
+        self.assertIn(' 0 flagged', output)
+        with self.assertRaises(CommandError):
+            self.run_command('--fail-on-issues')
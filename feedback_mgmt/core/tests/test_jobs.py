@@ -0,0 +1,127 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from core import jobs
+from core.models import Feedback, Job
+
+from .base import CoreTestCase
+
+outcomes = []
+
+
+@jobs.handler('test_flaky', max_attempts=2)
+def flaky(job):
+    """Raises while ``outcomes`` holds exceptions, then returns the payload."""
+    if outcomes:
+        raise outcomes.pop(0)
+    return job.payload
+
+
+class JobQueueTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        outcomes.clear()
+
+    def make_due(self, job):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+
+    def test_claim_is_exclusive(self):
+        job = jobs.enqueue('test_flaky', {'n': 1}, self.member)
+        claimed = jobs.claim('worker-a')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual((claimed.status, claimed.worker, claimed.attempts), (jobs.RUNNING, 'worker-a', 1))
+        self.assertIsNone(jobs.claim('worker-b'))
+
+    def test_oldest_due_job_first(self):
+        later = jobs.enqueue('test_flaky')
+        first = jobs.enqueue('test_flaky')
+        Job.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(minutes=5))
+        Job.objects.filter(pk=first.pk).update(run_after=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(jobs.claim('worker').pk, first.pk)
+        self.assertIsNone(jobs.claim('worker'))
+
+    def test_success_stores_the_result(self):
+        job = jobs.enqueue('test_flaky', {'n': 1})
+        self.assertTrue(jobs.execute(jobs.claim('worker')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.error), (jobs.SUCCEEDED, {'n': 1}, ''))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_retry_with_backoff_then_fail(self):
+        outcomes.extend([RuntimeError('first'), RuntimeError('second')])
+        job = jobs.enqueue('test_flaky')
+        before = timezone.now()
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertFalse(jobs.execute(jobs.claim('worker')))
+        job.refresh_from_db()
+        self.assertEqual(job.status, jobs.QUEUED)
+        self.assertIn('RuntimeError: first', job.error)
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=jobs.RETRY_DELAY))
+        # Not due before the delay is over
+        self.assertIsNone(jobs.claim('worker'))
+
+        self.make_due(job)
+        with self.assertLogs('core.jobs', 'ERROR'):
+            self.assertFalse(jobs.execute(jobs.claim('worker')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (jobs.FAILED, 2))
+        self.assertIn('RuntimeError: second', job.error)
+        self.assertIsNone(jobs.claim('worker'))
+
+    def test_retry_succeeds(self):
+        outcomes.append(RuntimeError('once'))
+        job = jobs.enqueue('test_flaky', {'n': 2})
+        with self.assertLogs('core.jobs', 'ERROR'):
+            jobs.execute(jobs.claim('worker'))
+        self.make_due(job)
+        self.assertTrue(jobs.execute(jobs.claim('worker')))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result), (jobs.SUCCEEDED, 2, {'n': 2}))
+
+    def test_retry_delay_doubles_up_to_the_maximum(self):
+        with mock.patch.multiple(jobs, RETRY_DELAY=10, MAX_RETRY_DELAY=60):
+            self.assertEqual([jobs.retry_delay(attempt) for attempt in range(1, 6)], [10, 20, 40, 60, 60])
+
+    def test_lost_workers(self):
+        retried = jobs.enqueue('test_flaky')
+        exhausted = jobs.enqueue('test_flaky')
+        jobs.claim('worker')
+        jobs.claim('worker')
+        Job.objects.filter(pk=exhausted.pk).update(attempts=2)
+        self.assertEqual(jobs.requeue_stale(timeout=60), 0)
+
+        Job.objects.update(started_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(jobs.requeue_stale(timeout=60), 2)
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(retried.status, jobs.QUEUED)
+        self.assertEqual(exhausted.status, jobs.FAILED)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('no_such_kind')
+
+
+class BackgroundRequestTests(CoreTestCase):
+    def test_bulk_create_in_the_background(self):
+        self.login(self.member)
+        response = self.client.post('/api/feedback/bulk/?background=true', {'items': [
+            {'title': 'Written by a job', 'description': 'x', 'board_id': self.public_board.pk},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], response.data['url'])
+        self.assertFalse(Feedback.objects.exists())
+
+        self.assertTrue(jobs.execute(jobs.claim('worker')))
+        job = self.client.get(response.data['url']).data
+        self.assertEqual((job['status'], job['result']['failed']), (jobs.SUCCEEDED, 0))
+        self.assertEqual(Feedback.objects.get().created_by, self.member)
+
+    def test_jobs_are_private_to_their_owner(self):
+        job = jobs.enqueue('test_flaky', user=self.member)
+        self.login(self.outsider)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/').status_code, 404)
+        self.login(self.admin)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/').status_code, 200)
@@ -0,0 +1,93 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Feedback
+
+from .base import CoreTestCase
+
+
+class KanbanTests(CoreTestCase):
+    url = '/api/feedback/kanban/'
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        self.open = [self.make_feedback(title=f'Open item {i}') for i in range(5)]
+        self.completed = [self.make_feedback(title=f'Done item {i}', status='completed') for i in range(2)]
+        self.private = self.make_feedback(board=self.private_board, status='rejected')
+
+    def columns(self, query=''):
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertEqual(response.status_code, 200)
+        return {column['status']: column for column in response.data['columns']}
+
+    def card_ids(self, column):
+        return [card['id'] for card in column['results']]
+
+    def walk(self, column):
+        """Card ids of ``column`` followed by those of every ``next`` page."""
+        ids, url = self.card_ids(column), column['next']
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += self.ids(response)
+            url = response.data['next']
+        return ids
+
+    def newest_first(self, items):
+        return [item.pk for item in sorted(items, key=lambda item: item.pk, reverse=True)]
+
+    def test_columns(self):
+        columns = self.columns('per_column=3')
+        self.assertEqual(list(columns), ['open', 'in_progress', 'completed', 'rejected'])
+        self.assertEqual({status: column['total'] for status, column in columns.items()}, {
+            'open': 5, 'in_progress': 0, 'completed': 2, 'rejected': 1,
+        })
+        self.assertEqual(self.card_ids(columns['open']), self.newest_first(self.open)[:3])
+        self.assertEqual(self.card_ids(columns['completed']), self.newest_first(self.completed))
+        self.assertIsNone(columns['completed']['next'])
+
+    def test_next_links_continue_the_column(self):
+        columns = self.columns('per_column=2')
+        self.assertEqual(self.walk(columns['open']), self.newest_first(self.open))
+
+    def test_search_next_links_continue_the_column(self):
+        # Stronger matches in another column than any in this one
+        for i in range(3):
+            self.make_feedback(title='Zebra zebra zebra', description=f'Stripes {i}', status='completed')
+        matches = [self.make_feedback(title=f'Open item {i}', description='A zebra') for i in range(3)]
+        columns = self.columns('per_column=1&search=zebra')
+        self.assertEqual(columns['open']['total'], 3)
+        listed = self.ids(self.client.get('/api/feedback/?status=open&search=zebra'))
+        self.assertEqual(sorted(listed), [item.pk for item in matches])
+        self.assertEqual(self.walk(columns['open']), listed)
+        self.assertEqual(len(self.walk(columns['completed'])), 3)
+
+    def test_ordering(self):
+        Feedback.objects.filter(pk=self.open[0].pk).update(upvote_count=3)
+        Feedback.objects.filter(pk=self.open[1].pk).update(upvote_count=2)
+        columns = self.columns('per_column=2&ordering=-upvote_count')
+        self.assertEqual(self.card_ids(columns['open']), [self.open[0].pk, self.open[1].pk])
+        self.assertEqual(self.walk(columns['open'])[2:], self.newest_first(self.open[2:]))
+
+    def test_filters_and_visibility(self):
+        columns = self.columns(f'board_id={self.private_board.pk}')
+        self.assertEqual(self.card_ids(columns['rejected']), [self.private.pk])
+        self.assertEqual(columns['open']['total'], 0)
+        self.login(self.outsider)
+        self.assertEqual(self.columns()['rejected']['total'], 0)
+
+    def test_one_query_for_every_column(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertEqual(len([query for query in queries if 'ROW_NUMBER()' in query['sql']]), 1)
+        for i in range(5):
+            self.make_feedback(title=f'In progress item {i}', status='in_progress')
+        with CaptureQueriesContext(connection) as more:
+            self.client.get(self.url)
+        self.assertEqual(len(more), len(queries))
+
+    def test_per_column_is_validated(self):
+        self.assertEqual(self.client.get(f'{self.url}?per_column=many').status_code, 400)
+        self.assertEqual(len(self.columns('per_column=0')['open']['results']), 1)
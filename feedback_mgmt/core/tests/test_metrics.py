@@ -0,0 +1,84 @@
+import re
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import metrics
+
+from .base import CoreTestCase
+
+
+class InstrumentationTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+        self.make_feedback()
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/feedback/')
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, total;dur=[\d.]+$')
+        self.assertEqual(int(re.search(r'"(\d+) queries"', timing)[1]), len(queries))
+
+    @override_settings(SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/feedback/'))
+
+    def test_nested_serializers_count_once(self):
+        request_metrics, token = metrics.start()
+        try:
+            with metrics.serializing():
+                with metrics.serializing():
+                    pass
+                self.assertEqual(request_metrics.serialize_seconds, 0)
+        finally:
+            metrics.stop(token)
+        self.assertGreater(request_metrics.serialize_seconds, 0)
+
+    @mock.patch.object(metrics, 'SLOW_REQUEST_MS', 0)
+    def test_slow_requests_are_logged_with_their_sql(self):
+        with self.assertLogs('core.slow_requests', 'WARNING') as logs:
+            self.client.get('/api/feedback/')
+        self.assertIn('GET /api/feedback/ (FeedbackViewSet.list)', logs.output[0])
+        self.assertIn('FROM "core_feedback"', logs.output[0])
+
+
+class MetricsEndpointTests(CoreTestCase):
+    url = '/api/metrics/'
+
+    def setUp(self):
+        super().setUp()
+        # A fresh registry per test
+        patcher = mock.patch.object(metrics, 'registry', metrics.Registry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counts_by_view_and_action(self):
+        self.login(self.member)
+        feedback = self.make_feedback()
+        self.client.get('/api/feedback/')
+        self.client.get('/api/feedback/')
+        self.client.post(f'/api/feedback/{feedback.pk}/upvote/')
+        self.login(self.admin)
+        body = self.client.get(self.url).content.decode()
+        self.assertIn('feedback_http_requests_total{view="FeedbackViewSet.list",method="GET",status="200"} 2', body)
+        self.assertIn('feedback_http_requests_total{view="FeedbackViewSet.upvote",method="POST",status="200"} 1', body)
+        self.assertIn('feedback_http_request_duration_seconds_count{view="FeedbackViewSet.list"} 2', body)
+        self.assertRegex(body, r'feedback_db_queries_total\{view="FeedbackViewSet.list"\} [1-9]')
+
+    def test_admins_only(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.login(self.member)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer wrong-secret')
+        self.assertEqual(self.client.get(self.url).status_code, 401)
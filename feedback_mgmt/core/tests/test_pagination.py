@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.db import connections
+from django.utils import timezone
+
+from core.models import Comment, Feedback
+
+from .base import CoreTestCase
+
+
+class KeysetPaginationTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+        # Seven items sharing one created_at, so only the id breaks ties
+        created = timezone.now()
+        self.feedback = [self.make_feedback(title=f'Feedback number {i}') for i in range(7)]
+        Feedback.objects.update(created_at=created)
+        for item in self.feedback[:3]:
+            Feedback.objects.filter(pk=item.pk).update(upvote_count=5)
+
+    def walk(self, url, link='next'):
+        """Ids of every page from ``url`` on, following ``link``."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(self.ids(response))
+            url = response.data[link]
+        return pages
+
+    def test_forward_and_back_with_ties(self):
+        expected = sorted((item.pk for item in self.feedback), reverse=True)
+        pages = self.walk('/api/feedback/?page_size=3')
+        self.assertEqual(pages, [expected[0:3], expected[3:6], expected[6:]])
+
+        last = self.client.get('/api/feedback/?page_size=3')
+        for _ in range(2):
+            last = self.client.get(last.data['next'])
+        self.assertIsNone(last.data['next'])
+        self.assertEqual(self.walk(last.data['previous'], link='previous'), [expected[3:6], expected[0:3]])
+
+    def test_ties_on_a_counter_ordering(self):
+        voted = sorted((item.pk for item in self.feedback[:3]), reverse=True)
+        rest = sorted((item.pk for item in self.feedback[3:]), reverse=True)
+        pages = self.walk('/api/feedback/?ordering=-upvote_count&page_size=2')
+        self.assertEqual(sum(pages, []), voted + rest)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+        pages = self.walk('/api/feedback/?ordering=upvote_count&page_size=4')
+        self.assertEqual(sum(pages, []), sorted(rest) + sorted(voted))
+
+    def test_previous_link_of_a_middle_page(self):
+        first = self.client.get('/api/feedback/?page_size=3')
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertIsNone(back.data['previous'])
+        self.assertEqual(self.ids(self.client.get(back.data['next'])), self.ids(second))
+
+    def test_comments(self):
+        feedback = self.feedback[0]
+        comments = [Comment.objects.create(feedback=feedback, user=self.member, text=f'Comment {i}') for i in range(5)]
+        pages = self.walk(f'/api/comments/?feedback_id={feedback.pk}&page_size=2')
+        self.assertEqual(sum(pages, []), [comment.pk for comment in comments])
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+
+    def test_totals_only_on_request(self):
+        response = self.client.get('/api/feedback/?page_size=3')
+        self.assertNotIn('total', response.data)
+        response = self.client.get('/api/feedback/?page_size=3&total=exact')
+        self.assertEqual((response.data['total'], response.data['total_is_estimate']), (7, False))
+
+    @mock.patch.object(connections['default'], 'vendor', 'postgresql')
+    def test_approx_total_of_filters_that_cannot_match(self):
+        response = self.client.get('/api/feedback/?tags=nope&total=approx')
+        self.assertEqual((response.data['total'], response.data['results']), (0, []))
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/feedback/?cursor=not-a-cursor').status_code, 404)
+
+    def test_page_numbers_for_existing_clients(self):
+        response = self.client.get('/api/feedback/?page=2&page_size=3')
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 3)
@@ -0,0 +1,141 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from core import rollups
+from core.models import Feedback, FeedbackDailyStat, TagDailyStat
+
+from .base import CoreTestCase
+
+
+class RollupTests(CoreTestCase):
+    """The rollups kept by signals and bulk paths equal a rebuild from scratch."""
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+        self.today = timezone.localdate()
+
+    def rollup_rows(self):
+        # Decrements leave rows at zero, which a rebuild does not create
+        stats = {
+            (row.board_id, row.day, row.status): row.count
+            for row in FeedbackDailyStat.objects.exclude(count=0)
+        }
+        tag_stats = {
+            (row.board_id, row.day, row.tag): row.count
+            for row in TagDailyStat.objects.exclude(count=0)
+        }
+        return stats, tag_stats
+
+    def assertRollupsRebuilt(self):
+        kept = self.rollup_rows()
+        rollups.rebuild()
+        self.assertEqual(kept, self.rollup_rows())
+        return kept
+
+    def test_create(self):
+        response = self.client.post('/api/feedback/', {
+            'title': 'Dark mode please', 'description': 'x', 'board_id': self.public_board.pk, 'tags': 'ui, UX',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.make_feedback(tags='ui')
+        stats, tag_stats = self.assertRollupsRebuilt()
+        self.assertEqual(stats, {(self.public_board.pk, self.today, 'open'): 2})
+        self.assertEqual(tag_stats, {
+            (self.public_board.pk, self.today, 'ui'): 2,
+            (self.public_board.pk, self.today, 'UX'): 1,
+        })
+
+    def test_status_change(self):
+        feedback = self.make_feedback(tags='api')
+        self.make_feedback()
+        self.client.patch(f'/api/feedback/{feedback.pk}/', {'status': 'completed'})
+        stats, _ = self.assertRollupsRebuilt()
+        self.assertEqual(stats, {
+            (self.public_board.pk, self.today, 'open'): 1,
+            (self.public_board.pk, self.today, 'completed'): 1,
+        })
+
+    def test_retag(self):
+        feedback = self.make_feedback(tags='ui, api')
+        self.client.patch(f'/api/feedback/{feedback.pk}/', {'tags': 'api, mobile'})
+        _, tag_stats = self.assertRollupsRebuilt()
+        self.assertEqual(set(tag_stats), {
+            (self.public_board.pk, self.today, 'api'), (self.public_board.pk, self.today, 'mobile'),
+        })
+
+    def test_move_to_another_board(self):
+        feedback = self.make_feedback(tags='ui')
+        feedback.board = self.private_board
+        feedback.save()
+        stats, _ = self.assertRollupsRebuilt()
+        self.assertEqual(stats, {(self.private_board.pk, self.today, 'open'): 1})
+
+    def test_delete(self):
+        feedback = self.make_feedback(tags='ui')
+        self.make_feedback(tags='ui')
+        self.assertEqual(self.client.delete(f'/api/feedback/{feedback.pk}/').status_code, 204)
+        stats, tag_stats = self.assertRollupsRebuilt()
+        self.assertEqual(stats, {(self.public_board.pk, self.today, 'open'): 1})
+        self.assertEqual(tag_stats, {(self.public_board.pk, self.today, 'ui'): 1})
+
+    def test_bulk_paths(self):
+        response = self.client.post('/api/feedback/bulk/', {'items': [
+            {'title': 'First bulk item', 'description': 'x', 'board_id': self.public_board.pk, 'tags': 'ui'},
+            {'title': 'Second bulk item', 'description': 'x', 'board_id': self.private_board.pk, 'tags': 'ui, api'},
+            {'title': 'Third bulk item', 'description': 'x', 'board_id': self.public_board.pk},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        created = [result['id'] for result in response.data['results']]
+        self.assertRollupsRebuilt()
+
+        response = self.client.patch('/api/feedback/bulk/', {'items': [
+            {'id': created[0], 'status': 'in_progress'},
+            {'id': created[1], 'tags': 'api, billing'},
+            {'id': created[2], 'status': 'rejected', 'tags': 'ux'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertRollupsRebuilt()
+
+        response = self.client.delete('/api/feedback/bulk/', {'ids': created[:2]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        stats, tag_stats = self.assertRollupsRebuilt()
+        self.assertEqual(stats, {(self.public_board.pk, self.today, 'rejected'): 1})
+        self.assertEqual(tag_stats, {(self.public_board.pk, self.today, 'ux'): 1})
+        self.assertEqual(Feedback.objects.count(), 1)
+
+
+class RollupMigrationTests(TransactionTestCase):
+    """0002 fills the rollup tables from the feedback that already exists."""
+    before = [('core', '0001_initial')]
+    after = [('core', '0002_feedback_rollups')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('core', 'User')
+        Board = apps.get_model('core', 'Board')
+        Feedback = apps.get_model('core', 'Feedback')
+        user = User.objects.create(username='author')
+        board = Board.objects.create(name='Board', description='', created_by=user)
+        for status, tags in [('open', 'ui, api'), ('open', 'ui'), ('completed', '')]:
+            Feedback.objects.create(
+                title='Title', description='Text', board=board, created_by=user, status=status, tags=tags,
+            )
+
+        apps = self.migrate(self.after)
+        today = timezone.localdate()
+        stats = apps.get_model('core', 'FeedbackDailyStat').objects.values_list('day', 'status', 'count')
+        self.assertEqual(sorted(stats), [(today, 'completed', 1), (today, 'open', 2)])
+        tag_stats = apps.get_model('core', 'TagDailyStat').objects.values_list('tag', 'count')
+        self.assertEqual(sorted(tag_stats), [('api', 1), ('ui', 2)])
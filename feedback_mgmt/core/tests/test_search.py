@@ -0,0 +1,96 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from core.models import Comment, Feedback
+from core.search import BasicSearchBackend, get_backend
+
+from .base import CoreTestCase
+
+
+class SearchTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        self.title_match = self.make_feedback(title='Dark mode everywhere', description='Please add a dark theme')
+        self.body_match = self.make_feedback(title='Settings page', description='A dark mode toggle would help')
+        self.unrelated = self.make_feedback(title='Faster exports', description='Exports time out')
+
+    def search(self, query):
+        response = self.client.get(f'/api/feedback/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_ranked_hits(self):
+        response = self.search('search=dark')
+        self.assertEqual(self.ids(response), [self.title_match.pk, self.body_match.pk])
+        hit = response.data['results'][0]['search']
+        self.assertEqual(hit['title'], '<mark>Dark</mark> mode everywhere')
+        self.assertEqual(hit['matched_in'], 'feedback')
+        self.assertNotIn('search', self.client.get('/api/feedback/').data['results'][0])
+
+    def test_prefix_and_every_word(self):
+        self.assertEqual(self.ids(self.search('search=expo')), [self.unrelated.pk])
+        self.assertEqual(self.ids(self.search('search=dark toggle')), [self.body_match.pk])
+
+    def test_query_syntax_is_not_interpreted(self):
+        for query in ['dark OR', '"dark', 'NEAR(dark', '*', 'title:dark']:
+            self.search(f'search={query}')
+
+    def test_comments_on_request(self):
+        Comment.objects.create(feedback=self.unrelated, user=self.admin, text='A dark export would be nice')
+        self.assertNotIn(self.unrelated.pk, self.ids(self.search('search=dark')))
+        response = self.search('search=dark&search_comments=1')
+        hits = {row['id']: row['search']['matched_in'] for row in response.data['results']}
+        self.assertEqual(hits[self.unrelated.pk], 'comment')
+
+    def test_index_follows_edits_and_deletes(self):
+        self.title_match.title = 'Light mode everywhere'
+        self.title_match.description = 'Bright colours'
+        self.title_match.save()
+        self.body_match.delete()
+        self.assertEqual(self.ids(self.search('search=dark')), [])
+        self.assertEqual(self.ids(self.search('search=light')), [self.title_match.pk])
+
+    def test_filters_and_visibility_still_apply(self):
+        private = self.make_feedback(board=self.private_board, title='Dark corners', status='completed')
+        self.assertEqual(self.ids(self.search('search=dark&status=completed')), [private.pk])
+        self.assertEqual(
+            self.ids(self.search(f'search=dark&board_id={self.public_board.pk}')),
+            [self.title_match.pk, self.body_match.pk],
+        )
+        self.login(self.outsider)
+        self.assertNotIn(private.pk, self.ids(self.search('search=dark')))
+
+    def test_filters_that_cannot_match_anything(self):
+        self.assertEqual(self.ids(self.search('search=dark&tags=nope')), [])
+        for backend in (get_backend(), BasicSearchBackend()):
+            self.assertEqual(backend.search('dark', within=Feedback.objects.filter(id__in=[])), [])
+
+    def test_no_readable_boards(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.public_board.public = False
+            self.public_board.save()
+        self.login(self.outsider)
+        self.assertEqual(self.ids(self.search('search=dark')), [])
+
+    def test_limit_applies_within_the_filters(self):
+        private = [self.make_feedback(board=self.private_board, title=f'Dark room {i}') for i in range(3)]
+        within = Feedback.objects.filter(board=self.private_board)
+        for backend in (get_backend(), BasicSearchBackend()):
+            hits = backend.search('dark', limit=2, within=within)
+            self.assertEqual(len(hits), 2)
+            self.assertLessEqual({hit.feedback_id for hit in hits}, {item.pk for item in private})
+
+    def test_other_orderings(self):
+        response = self.search('search=dark&ordering=-created_at')
+        self.assertEqual(self.ids(response), [self.body_match.pk, self.title_match.pk])
+        self.assertEqual(self.client.get('/api/feedback/?ordering=relevance').status_code, 400)
+
+    def test_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM core_search_index')
+        self.assertEqual(self.ids(self.search('search=dark')), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.ids(self.search('search=dark')), [self.title_match.pk, self.body_match.pk])
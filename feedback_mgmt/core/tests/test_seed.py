@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from core import counters, rollups
+from core.benchmarks import benchmark_cases, benchmark_fixtures
+from core.models import Board, Comment, Feedback, FeedbackDailyStat, User
+
+from .base import CoreTestCase
+
+SMALL = ['--users', '12', '--boards', '3', '--feedback', '60', '--upvotes', '150', '--comments', '80',
+         '--members-per-board', '4']
+
+
+class SeedTests(CoreTestCase):
+    def seed(self, *args):
+        call_command('seed', *SMALL, *args, stdout=StringIO())
+
+    def snapshot(self):
+        return list(Feedback.objects.order_by('title', 'created_at').values_list('title', 'status', 'tags'))
+
+    def test_counts(self):
+        self.seed()
+        self.assertEqual(User.objects.filter(username__startswith='seed-').count(), 12)
+        self.assertEqual(Board.objects.filter(created_by__username__startswith='seed-').count(), 3)
+        self.assertEqual(Feedback.objects.count(), 60)
+        self.assertEqual(Comment.objects.count(), 80)
+
+    def test_private_boards_only_hear_from_members(self):
+        self.seed()
+        for board in Board.objects.filter(public=False):
+            members = set(board.members.values_list('id', flat=True))
+            authors = Feedback.objects.filter(board=board).values_list('created_by', flat=True)
+            commenters = Comment.objects.filter(feedback__board=board).values_list('user', flat=True)
+            self.assertLessEqual(set(authors) | set(commenters), members)
+
+    def test_derived_data_is_consistent(self):
+        self.seed()
+        self.assertEqual(counters.reconcile(dry_run=True), 0)
+        kept = sorted(FeedbackDailyStat.objects.values_list('board_id', 'day', 'status', 'count'))
+        rollups.rebuild()
+        self.assertEqual(kept, sorted(FeedbackDailyStat.objects.values_list('board_id', 'day', 'status', 'count')))
+
+    def test_deterministic(self):
+        self.seed()
+        first = self.snapshot()
+        with self.assertRaises(CommandError):
+            self.seed()
+        self.seed('--clear')
+        self.assertEqual(self.snapshot(), first)
+        self.seed('--clear', '--seed', '7')
+        self.assertNotEqual(self.snapshot(), first)
+
+
+class BenchmarkTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.json_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.json_path)
+
+    def benchmark(self, *args):
+        out = StringIO()
+        call_command('benchmark_endpoints', '--iterations', '1', '--warmup', '0', *args, stdout=out)
+        return out.getvalue()
+
+    def test_needs_data(self):
+        with self.assertRaises(CommandError):
+            self.benchmark()
+
+    def test_every_case_reports(self):
+        # Enough feedback for feedback-list-page's ?page=5
+        call_command('seed', *SMALL, '--feedback', '150', stdout=StringIO())
+        output = self.benchmark('--no-fail', '--json', self.json_path)
+        with open(self.json_path) as fh:
+            results = json.load(fh)
+        self.assertEqual(
+            [result['name'] for result in results],
+            [case.name for case in benchmark_cases(benchmark_fixtures())],
+        )
+        self.assertIn(f'{len(results)} endpoints benchmarked', output)
+        self.assertEqual([result['name'] for result in results if result['status'] >= 400], [])
+        self.assertTrue({'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes', 'violations'} <= set(results[0]))
+
+    def test_budget_violations_fail(self):
+        call_command('seed', *SMALL, stdout=StringIO())
+        with open(self.json_path, 'w') as fh:
+            json.dump({'auth-me': {'queries': 0}}, fh)
+        with self.assertRaisesMessage(CommandError, '1 endpoints benchmarked, 1 over budget'):
+            self.benchmark('--only', '^auth-me$', '--budgets', self.json_path)
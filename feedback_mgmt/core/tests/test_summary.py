@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core import rollups
+from core.models import Feedback
+
+from .base import CoreTestCase
+
+
+class SummaryTests(CoreTestCase):
+    url = '/api/feedback/summary/'
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        self.today = timezone.localdate()
+        self.voted = self.make_feedback(tags='ui, api')
+        # Votes only count through the counter column
+        self.voted.upvotes.add(self.admin, self.outsider)
+        Feedback.objects.filter(pk=self.voted.pk).update(upvote_count=2)
+        self.completed = self.make_feedback(status='completed', tags='ui')
+        self.private = self.make_feedback(board=self.private_board, status='rejected')
+
+    def summary(self, query=''):
+        response = self.client.get(f'{self.url}?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counts(self):
+        data = self.summary()
+        self.assertEqual(data['total_feedback'], 3)
+        self.assertEqual(
+            [data[f'{status}_feedback'] for status in ('open', 'in_progress', 'completed', 'rejected')],
+            [1, 0, 1, 1],
+        )
+        self.assertEqual(data['status_distribution'], {'open': 1, 'in_progress': 0, 'completed': 1, 'rejected': 1})
+        self.assertEqual(dict(data['tag_distribution']), {'ui': 2, 'api': 1})
+        self.assertEqual(data['top_voted_feedback'][0]['id'], self.voted.pk)
+
+    def test_trends_include_today(self):
+        Feedback.objects.filter(pk=self.completed.pk).update(created_at=timezone.now() - timedelta(days=2))
+        # Queryset updates skip the signals that keep the rollups
+        rollups.rebuild()
+        trends = self.summary('days=3')['feedback_trends']
+        self.assertEqual(list(trends), [
+            (self.today - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in (2, 1, 0)
+        ])
+        self.assertEqual(list(trends.values()), [1, 0, 2])
+
+    def test_days_are_validated(self):
+        for days in ('0', '366', 'soon'):
+            self.assertEqual(self.client.get(f'{self.url}?days={days}').status_code, 400)
+
+    def test_board_filter(self):
+        data = self.summary(f'board_id={self.private_board.pk}')
+        self.assertEqual((data['total_feedback'], data['rejected_feedback']), (1, 1))
+        data = self.summary(f'board_id={self.public_board.pk},{self.private_board.pk}')
+        self.assertEqual(data['total_feedback'], 3)
+
+    def test_private_boards_are_left_out(self):
+        self.login(self.outsider)
+        data = self.summary()
+        self.assertEqual((data['total_feedback'], data['rejected_feedback']), (2, 0))
+        self.assertEqual(self.summary(f'board_id={self.private_board.pk}')['total_feedback'], 0)
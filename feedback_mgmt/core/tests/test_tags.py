@@ -0,0 +1,49 @@
+from .base import CoreTestCase
+
+
+class TagFilterTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        self.both = self.make_feedback(tags='ui, api')
+        self.upper = self.make_feedback(tags='UI')
+        self.api = self.make_feedback(tags='api')
+        # Contains "ui" without carrying it
+        self.near_miss = self.make_feedback(tags='uix, build')
+        self.untagged = self.make_feedback()
+
+    def matches(self, query):
+        response = self.client.get(f'/api/feedback/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return set(self.ids(response))
+
+    def test_exact_and_case_insensitive(self):
+        self.assertEqual(self.matches('tags=ui'), {self.both.pk, self.upper.pk})
+        self.assertEqual(self.matches('tags=Ui'), {self.both.pk, self.upper.pk})
+        self.assertEqual(self.matches('tags=u'), set())
+
+    def test_any(self):
+        expected = {self.both.pk, self.upper.pk, self.api.pk}
+        self.assertEqual(self.matches('tags=ui,api'), expected)
+        self.assertEqual(self.matches('tags=ui,api&tags_match=any'), expected)
+
+    def test_all(self):
+        self.assertEqual(self.matches('tags=ui,api&tags_match=all'), {self.both.pk})
+        self.assertEqual(self.matches('tags=ui,nothing&tags_match=all'), set())
+
+    def test_unknown_match_mode(self):
+        response = self.client.get('/api/feedback/?tags=ui&tags_match=some')
+        self.assertEqual(response.status_code, 400)
+
+    def test_retagging_moves_the_links(self):
+        response = self.client.patch(f'/api/feedback/{self.both.pk}/', {'tags': 'api, mobile'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tags_list'], ['api', 'mobile'])
+        self.assertEqual(self.matches('tags=ui'), {self.upper.pk})
+        self.assertEqual(self.matches('tags=mobile'), {self.both.pk})
+
+    def test_combined_with_other_filters(self):
+        private = self.make_feedback(board=self.private_board, tags='ui')
+        self.assertEqual(self.matches(f'tags=ui&board_id={self.private_board.pk}'), {private.pk})
+        self.login(self.outsider)
+        self.assertEqual(self.matches('tags=ui'), {self.both.pk, self.upper.pk})
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from core.throttling import CostThrottle
+
+from .base import CoreTestCase
+
+# Ten cost units a minute for everybody
+SMALL_BUDGET = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'user': '10/min', 'anon': '10/min'},
+}
+
+
+@override_settings(REST_FRAMEWORK=SMALL_BUDGET)
+class CostThrottleTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.member)
+        # The start of a window, so nothing carries over from the previous one
+        patcher = mock.patch('core.throttling.time.time', return_value=600.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def remaining(self, response):
+        return int(response['RateLimit-Remaining'])
+
+    def test_actions_spend_their_cost(self):
+        response = self.client.get('/api/feedback/')
+        self.assertEqual(response['RateLimit-Limit'], '10')
+        self.assertEqual(self.remaining(response), 9)
+        # A search costs 4
+        self.assertEqual(self.remaining(self.client.get('/api/feedback/?search=dark')), 5)
+        self.assertEqual(self.remaining(self.client.get('/api/boards/')), 4)
+
+    @override_settings(THROTTLE_COSTS={'FeedbackViewSet.list': 3})
+    def test_costs_can_be_overridden(self):
+        self.assertEqual(self.remaining(self.client.get('/api/feedback/')), 7)
+
+    def test_refused_requests_spend_nothing(self):
+        # Summaries cost 5
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/feedback/summary/').status_code, 200)
+        response = self.client.get('/api/feedback/summary/')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.remaining(response), 0)
+        # This window has to end and half of the next one pass before 5 more fit
+        self.assertEqual(response['Retry-After'], '90')
+
+        self.clock.return_value = 600.0 + 90
+        self.assertEqual(self.client.get('/api/feedback/summary/').status_code, 200)
+
+    def test_budgets_are_per_user(self):
+        for _ in range(2):
+            self.client.get('/api/feedback/summary/')
+        self.assertEqual(self.client.get('/api/feedback/summary/').status_code, 429)
+        self.login(self.outsider)
+        self.assertEqual(self.client.get('/api/feedback/summary/').status_code, 200)
+
+    @override_settings(REST_FRAMEWORK={**SMALL_BUDGET, 'DEFAULT_THROTTLE_RATES': {'user': '10/min', 'anon': '50/min'}})
+    def test_anonymous_clients_are_counted_by_ip(self):
+        self.client.credentials()
+        login = {'username': 'member', 'password': 'wrong-password'}
+        # Logins cost 20
+        response = self.client.post('/api/auth/login/', login, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(self.remaining(response), 30)
+        self.assertEqual(self.remaining(self.client.post('/api/auth/login/', login, REMOTE_ADDR='10.0.0.2')), 30)
+        self.assertEqual(self.remaining(self.client.post('/api/auth/login/', login, REMOTE_ADDR='10.0.0.1')), 10)
+        self.assertEqual(self.client.post('/api/auth/login/', login, REMOTE_ADDR='10.0.0.1').status_code, 429)
+
+
+class TimeUntilTests(SimpleTestCase):
+    def test_waits_for_the_previous_window_to_decay(self):
+        # 10 spent last window, none yet in this one: half of it must pass
+        self.assertEqual(CostThrottle.time_until(10, 60, 0, 10, 0, 5), 30)
+        self.assertEqual(CostThrottle.time_until(10, 60, 20, 10, 0, 5), 10)
+
+    def test_waits_for_the_current_window_to_roll_over(self):
+        # 10 spent in this window: it has to become the previous one and decay
+        self.assertEqual(CostThrottle.time_until(10, 60, 30, 0, 10, 5), 60)
+        self.assertEqual(CostThrottle.time_until(10, 60, 30, 0, 10, 10), 90)
+
+    def test_never_less_than_a_second(self):
+        self.assertEqual(CostThrottle.time_until(10, 60, 59.9, 10, 0, 1), 1)
+
+    def test_costs_above_the_limit_never_fit(self):
+        self.assertIsNone(CostThrottle.time_until(10, 60, 0, 0, 0, 11))
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Comment
+
+from .base import CoreTestCase
+
+
+class ViewerStateTests(CoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.voted = self.make_feedback(user=self.admin)
+        self.voted.upvotes.add(self.member)
+        self.commented = self.make_feedback(user=self.admin)
+        Comment.objects.create(feedback=self.commented, user=self.member, text='Me too please')
+        self.authored = self.make_feedback(user=self.member)
+
+    def flags(self, row):
+        return (row['is_upvoted'], row['has_commented'], row['is_author'])
+
+    def test_list(self):
+        self.login(self.member)
+        rows = {row['id']: self.flags(row) for row in self.client.get('/api/feedback/').data['results']}
+        self.assertEqual(rows, {
+            self.voted.pk: (True, False, False),
+            self.commented.pk: (False, True, False),
+            self.authored.pk: (False, False, True),
+        })
+
+        self.login(self.outsider)
+        rows = self.client.get('/api/feedback/').data['results']
+        self.assertEqual({self.flags(row) for row in rows}, {(False, False, False)})
+
+    def test_detail(self):
+        self.login(self.member)
+        for feedback, flags in [(self.voted, (True, False, False)), (self.authored, (False, False, True))]:
+            self.assertEqual(self.flags(self.client.get(f'/api/feedback/{feedback.pk}/').data), flags)
+
+    def test_flags_come_from_the_list_query(self):
+        for _ in range(5):
+            self.make_feedback(user=self.admin).upvotes.add(self.member)
+        self.login(self.member)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/feedback/')
+        self.assertEqual(len(response.data['results']), 8)
+        # No per-row vote lookups, only the EXISTS inside the list query
+        lookups = [query['sql'] for query in queries if 'core_feedback_upvotes' in query['sql']]
+        self.assertTrue(lookups)
+        self.assertTrue(all('EXISTS' in sql for sql in lookups))
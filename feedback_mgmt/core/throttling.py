@@ -0,0 +1,127 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# Cost of actions that set no weight of their own (see ``throttle_costs``)
+DEFAULT_COST = 1
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+# Headers are added by core.middleware.RateLimitHeadersMiddleware
+HEADERS_ATTR = 'rate_limit'
+
+
+class CostThrottle(BaseThrottle):
+    """Sliding-window throttle where each action spends its own cost.
+
+    A client may spend ``DEFAULT_THROTTLE_RATES[scope]`` (e.g.
+    ``'1200/min'``) cost units per window. Views weigh their actions with
+    a ``throttle_costs`` dict, e.g. ``{'summary': 5}``, which the
+    ``THROTTLE_COSTS`` setting overrides by ``'ViewSet.action'``. A rate
+    of ``None`` turns the scope off.
+
+    Counts live in the default cache, per fixed window, and the previous
+    window's count is weighted by how much of it still overlaps the
+    sliding one. ``cache.incr`` keeps concurrent requests from all being
+    let through on the same reading on Redis or Memcached; the file and
+    database caches increment by read-then-write and may lose a few.
+    """
+    scope = None
+
+    def get_ident_key(self, request):
+        """Who the budget belongs to, or ``None`` if this scope does not apply."""
+        raise NotImplementedError
+
+    def get_rate(self):
+        """``(cost units, seconds)`` for the scope, or ``(None, None)`` when off."""
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            return None, None
+        units, period = rate.split('/')
+        return int(units), PERIODS[period[0]]
+
+    def get_cost(self, request, view):
+        # Views may name a costlier variant of an action, e.g. a list with ?search=
+        get_throttle_action = getattr(view, 'get_throttle_action', None)
+        action = get_throttle_action(request) if get_throttle_action else getattr(view, 'action', None)
+        overrides = getattr(settings, 'THROTTLE_COSTS', {})
+        name = f'{type(view).__name__}.{action}'
+        if name in overrides:
+            return overrides[name]
+        return getattr(view, 'throttle_costs', {}).get(action, DEFAULT_COST)
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        limit, duration = self.get_rate()
+        ident = self.get_ident_key(request)
+        if limit is None or ident is None:
+            return True
+        cost = self.get_cost(request, view)
+
+        now = time.time()
+        window = int(now // duration)
+        elapsed = now - window * duration
+        key = f'throttle:{self.scope}:{ident}:{window}'
+        previous_key = f'throttle:{self.scope}:{ident}:{window - 1}'
+        previous = cache.get(previous_key, 0)
+        cache.add(key, 0, duration * 2)
+        try:
+            current = cache.incr(key, cost)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, cost, duration * 2)
+            current = cost
+        overlap = (duration - elapsed) / duration
+        used = previous * overlap + current
+
+        allowed = used <= limit
+        if not allowed:
+            # Refused requests spend nothing, or a retry loop never recovers
+            cache.decr(key, cost)
+            current -= cost
+            used -= cost
+            self.retry_after = self.time_until(limit, duration, elapsed, previous, current, cost)
+        setattr(request._request, HEADERS_ATTR, {
+            'RateLimit-Limit': str(limit),
+            'RateLimit-Remaining': str(max(0, math.floor(limit - used))),
+            'RateLimit-Reset': str(math.ceil(duration - elapsed)),
+        })
+        return allowed
+
+    @staticmethod
+    def time_until(limit, duration, elapsed, previous, current, cost):
+        """Seconds until ``cost`` fits, assuming no other requests meanwhile."""
+        if cost > limit:
+            return None
+        if current + cost <= limit and previous:
+            # The previous window's weight decays until enough is left
+            fits_at = duration * (1 - (limit - current - cost) / previous)
+            return max(1, math.ceil(fits_at - elapsed))
+        # Not before this window becomes the previous one, then as above
+        fits_at = duration * (1 - (limit - cost) / current) if current else 0
+        return max(1, math.ceil(duration - elapsed + fits_at))
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserCostThrottle(CostThrottle):
+    """Budget per authenticated user."""
+    scope = 'user'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class AnonCostThrottle(CostThrottle):
+    """Budget per client IP for everything unauthenticated, logins included."""
+    scope = 'anon'
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
@@ -1,15 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
-from .views import AuthViewSet, BoardViewSet, FeedbackViewSet, CommentViewSet
+from .views import AuthViewSet, BoardViewSet, FeedbackViewSet, CommentViewSet, JobViewSet, MetricsView
 
 router = DefaultRouter()
 router.register(r'auth', AuthViewSet, basename='auth')
 router.register(r'boards', BoardViewSet, basename='board')
 router.register(r'feedback', FeedbackViewSet, basename='feedback')
 router.register(r'comments', CommentViewSet, basename='comment')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,36 @@
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q, Value
+
+from .models import Comment, Feedback
+
+VIEWER_FIELDS = ['is_upvoted', 'has_commented', 'is_author']
+
+
+def annotate_viewer_state(queryset, user):
+    """Annotate feedback rows with the requesting user's relation to them.
+
+    Each flag is an ``EXISTS`` subquery evaluated in the list query itself,
+    so a page costs the same number of queries whatever its size.
+    """
+    if not user or not user.is_authenticated:
+        return queryset.annotate(**{name: Value(False, output_field=BooleanField()) for name in VIEWER_FIELDS})
+
+    upvotes = Feedback.upvotes.through.objects.filter(feedback_id=OuterRef('pk'), user_id=user.id)
+    comments = Comment.objects.filter(feedback_id=OuterRef('pk'), user_id=user.id)
+    return queryset.annotate(
+        is_upvoted=Exists(upvotes),
+        has_commented=Exists(comments),
+        is_author=ExpressionWrapper(Q(created_by_id=user.id), output_field=BooleanField()),
+    )
+
+
+def viewer_state(feedback, user, name):
+    """Flag for a single instance, reading the annotation when present."""
+    if hasattr(feedback, name):
+        return getattr(feedback, name)
+    if not user or not user.is_authenticated:
+        return False
+    if name == 'is_upvoted':
+        return feedback.upvotes.filter(id=user.id).exists()
+    if name == 'has_commented':
+        return feedback.comments.filter(user_id=user.id).exists()
+    return feedback.created_by_id == user.id
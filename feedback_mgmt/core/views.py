@@ -1,27 +1,188 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import login
-from django.db.models import Count, Q
-from django.utils import timezone
-from datetime import timedelta, datetime
-from collections import defaultdict
-
-from .models import User, Board, Feedback, Comment
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Prefetch, Subquery, Sum, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+from . import bulk, events, export, jobs, metrics, votes
+from .access import filter_readable
+from .analytics import cached_summary, parse_days, parse_id_list, summary_etag, summary_scope, summary_version
+from .authentication import CachedJWTAuthentication, MetricsTokenAuthentication, QueryTokenJWTAuthentication
+from .conditional import aggregate_etag, not_modified, set_validators
+from .feedback_filters import FEEDBACK_FILTER_PARAMS, filter_feedback, find_search_hits, narrow_feedback
+from .models import User, Board, Feedback, Comment, Job
+from .pagination import KeysetPagination
+from .tagging import tag_counts, tag_links_prefetch
+from .viewer import annotate_viewer_state
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, LoginSerializer,
     BoardSerializer, FeedbackSerializer, CommentSerializer,
-    FeedbackSummarySerializer
+    FeedbackSummarySerializer, VoteBatchSerializer, BulkItemsSerializer, BulkIdsSerializer,
+    JobSerializer, RecomputeSerializer
 )
 from .permissions import (
     IsAdminOrModerator, IsAdminOrReadOnly, IsBoardMemberOrPublic,
-    CanEditFeedback, CanEditComment
+    CanEditFeedback, CanEditComment, CanReadMetrics
 )
 
+def _orderings(field, tiebreak):
+    """Ascending and descending keys for ``field``; ``tiebreak`` is given for ascending."""
+    flipped = tuple(key[1:] if key.startswith('-') else f'-{key}' for key in tiebreak)
+    return {field: (field, *tiebreak), f'-{field}': (f'-{field}', *flipped)}
+
+# Every ordering ends in a unique key so keyset pagination is stable, and the
+# common ones match an index in Feedback.Meta.indexes (check with
+# `manage.py explain_queries`). 'upvotes' means most voted first.
+FEEDBACK_ORDERINGS = {
+    **_orderings('created_at', ('id',)),
+    **_orderings('updated_at', ('id',)),
+    **_orderings('title', ('id',)),
+    **_orderings('status', ('-created_at', '-id')),
+    **_orderings('upvote_count', ('created_at', 'id')),
+    **_orderings('comment_count', ('created_at', 'id')),
+    'upvotes': ('-upvote_count', '-created_at', '-id'),
+    '-upvotes': ('upvote_count', 'created_at', 'id'),
+    # Only with ?search=, see core.search.apply_search
+    'relevance': ('search_position', 'id'),
+}
+
+# Latest comments embedded per feedback item with ?expand=comments
+COMMENT_PREVIEW_SIZE = 3
+KANBAN_PER_COLUMN = 20
+MAX_KANBAN_PER_COLUMN = 100
+
+def with_board_counts(queryset):
+    """Annotate feedback and member totals as subqueries (no GROUP BY join)."""
+    feedback = (
+        Feedback.objects.filter(board_id=OuterRef('pk')).order_by()
+        .values('board_id').annotate(n=Count('id')).values('n')
+    )
+    members = (
+        Board.members.through.objects.filter(board_id=OuterRef('pk')).order_by()
+        .values('board_id').annotate(n=Count('id')).values('n')
+    )
+    return queryset.annotate(
+        feedback_total=Coalesce(Subquery(feedback), 0),
+        member_total=Coalesce(Subquery(members), 0),
+    )
+
+def in_background(request):
+    return request.query_params.get('background') in ('1', 'true')
+
+def job_accepted(job, request):
+    """202 Accepted with the queued job, which ``Location`` points at."""
+    data = JobSerializer(job, context={'request': request}).data
+    return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['url']})
+
+def bulk_response(results, success_status=status.HTTP_200_OK):
+    """Per-item results; 207 Multi-Status as soon as one item failed."""
+    failed = any('errors' in result for result in results)
+    return Response({'results': results}, status=status.HTTP_207_MULTI_STATUS if failed else success_status)
+
+class ExpandableViewMixin:
+    """Passes ``?fields=`` and ``?expand=`` through to the serializer.
+
+    Without ``?expand=`` list actions are compact while detail actions (and
+    create) expand ``detail_expand``, which matches the old nested output.
+    """
+    detail_expand = []
+
+    def _param_list(self, name):
+        value = self.request.query_params.get(name, '')
+        return [part.strip() for part in value.split(',') if part.strip()]
+
+    def get_expand(self):
+        if 'expand' in self.request.query_params:
+            return set(self._param_list('expand'))
+        if self.detail or self.action == 'create':
+            return set(self.detail_expand)
+        return set()
+
+    def get_fields(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        return self._param_list('fields') or None
+
+    def wants(self, name):
+        fields = self.get_fields()
+        return fields is None or name in fields
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_fields())
+        kwargs.setdefault('expand', self.get_expand())
+        return super().get_serializer(*args, **kwargs)
+
+# count and ids catch rows entering or leaving the filter set
+CONDITIONAL_AGGREGATES = {'count': Count('pk'), 'ids': Sum('pk'), 'latest': Max('updated_at')}
+
+class ConditionalReadMixin:
+    """Answers ``If-None-Match`` on list and retrieve.
+
+    The ETag comes from one aggregate (``validator_aggregates()``) over
+    ``get_validator_queryset()``, before anything is loaded or serialized,
+    so an unchanged poll costs a single small query. That queryset is
+    scoped to the viewer like ``get_queryset``, and every object permission
+    here allows safe methods, so a detail 304 can skip ``get_object``.
+    """
+
+    # Relation whose username every row embeds, e.g. 'created_by'
+    author_field = None
+
+    def get_validator_queryset(self):
+        return self.get_queryset()
+
+    def validator_aggregates(self):
+        aggregates = dict(CONDITIONAL_AGGREGATES)
+        if self.author_field:
+            # Renaming a user changes the rows without touching them
+            aggregates['author_latest'] = Max(f'{self.author_field}__updated_at')
+        return aggregates
+
+    def get_etag(self, queryset):
+        values = queryset.order_by().aggregate(**self.validator_aggregates())
+        if not values['count'] and self.detail:
+            return None
+        return aggregate_etag(self.basename, self.request.user, values)
+
+    def respond(self, handler, queryset, request, *args, **kwargs):
+        etag = self.get_etag(queryset)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_validators(response, etag)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.respond(super().list, self.get_validator_queryset(), request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            queryset = self.get_validator_queryset().filter(**{self.lookup_field: lookup})
+        except (TypeError, ValueError, DjangoValidationError):
+            # Malformed ids 404 the usual way
+            return super().retrieve(request, *args, **kwargs)
+        return self.respond(super().retrieve, queryset, request, *args, **kwargs)
+
 class AuthViewSet(viewsets.GenericViewSet):
     permission_classes = [permissions.AllowAny]
     serializer_class = UserSerializer
+    # Password hashing makes these the priciest requests per byte
+    throttle_costs = {'register': 20, 'login': 20, 'me': 1}
 
 
     @action(detail=False, methods=['post'])
@@ -56,147 +217,443 @@ class AuthViewSet(viewsets.GenericViewSet):
             return Response(UserSerializer(request.user).data)
         return Response({'error': 'Not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
 
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(ConditionalReadMixin, ExpandableViewMixin, viewsets.ModelViewSet):
     serializer_class = BoardSerializer
     permission_classes = [IsAdminOrReadOnly, IsBoardMemberOrPublic]
+    detail_expand = ['created_by', 'members']
+    author_field = 'created_by'
 
     def get_queryset(self):
-        user = self.request.user
-        if user.role in ['admin', 'moderator']:
-            return Board.objects.all()
-        else:
-            return Board.objects.filter(
-                Q(public=True) | Q(members=user)
-            ).distinct()
+        queryset = filter_readable(Board.objects.all(), self.request.user, field='id')
+        queryset = with_board_counts(queryset.select_related('created_by'))
+        if 'members' in self.get_expand():
+            queryset = queryset.prefetch_related('members')
+        return queryset
+
+    def get_validator_queryset(self):
+        return with_board_counts(filter_readable(Board.objects.all(), self.request.user, field='id'))
+
+    def validator_aggregates(self):
+        # Membership changes move updated_at, see core.signals
+        aggregates = {**super().validator_aggregates(), 'feedback_sum': Sum('feedback_total')}
+        if 'members' in self.get_expand():
+            aggregates['member_latest'] = Max('members__updated_at')
+        return aggregates
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=True, methods=['get'],
+        authentication_classes=[CachedJWTAuthentication, QueryTokenJWTAuthentication],
+        renderer_classes=[events.EventStreamRenderer, JSONRenderer],
+    )
+    def events(self, request, pk=None):
+        """Server-Sent Events for changes on the board, instead of polling.
+
+        Reconnecting clients send ``Last-Event-ID`` (or ``?last_event_id=``)
+        and get what they missed, or a ``reset`` event when that is gone.
+        """
+        board = self.get_object()
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        # Under ASGI an idle stream waits on the event loop, not a thread
+        stream = events.astream if isinstance(request._request, ASGIRequest) else events.stream
+        response = StreamingHttpResponse(stream(board.pk, last_event_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+class FeedbackViewSet(ConditionalReadMixin, ExpandableViewMixin, viewsets.ModelViewSet):
     serializer_class = FeedbackSerializer
     permission_classes = [permissions.IsAuthenticated, CanEditFeedback]
+    detail_expand = ['board', 'created_by', 'comments']
+    author_field = 'created_by'
+    pagination_class = KeysetPagination
+    search_hits = None
+    throttle_costs = {
+        'list': 1, 'search': 4, 'retrieve': 1, 'create': 2, 'update': 2, 'partial_update': 2, 'destroy': 2,
+        'upvote': 1, 'vote': 1, 'comment_thread': 1, 'vote_batch': 5, 'bulk': 20, 'export': 30, 'kanban': 3,
+        'tags': 2, 'summary': 5, 'recompute': 5,
+    }
+
+    def get_throttle_action(self, request):
+        # Full-text lists cost more than plain ones (see core.throttling)
+        if self.action == 'list' and request.query_params.get('search'):
+            return 'search'
+        return self.action
 
     def get_queryset(self):
-        queryset = Feedback.objects.select_related('created_by', 'board').prefetch_related('upvotes', 'comments')
-
-        # Filter by board access
         user = self.request.user
-        if user.role not in ['admin', 'moderator']:
-            queryset = queryset.filter(
-                Q(board__public=True) | Q(board__members=user)
-            ).distinct()
-
-        # Apply filters
-        board_id = self.request.query_params.get('board_id')
-        status_filter = self.request.query_params.get('status')
-        tags_filter = self.request.query_params.get('tags')
-        search = self.request.query_params.get('search')
-        ordering = self.request.query_params.get('ordering', '-created_at')
-
-        if board_id:
-            queryset = queryset.filter(board_id=board_id)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        if tags_filter:
-            queryset = queryset.filter(tags__icontains=tags_filter)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
-
-        # Handle ordering - CHANGE HERE: use different annotation name
-        if ordering == 'upvotes':
-            queryset = queryset.annotate(upvotes_count=Count('upvotes')).order_by('-upvotes_count')
-        elif ordering == '-upvotes':
-            queryset = queryset.annotate(upvotes_count=Count('upvotes')).order_by('upvotes_count')
+        expand = self.get_expand()
+        queryset = Feedback.objects.select_related('created_by')
+        if 'board' in expand:
+            boards = with_board_counts(Board.objects.select_related('created_by')).prefetch_related('members')
+            queryset = queryset.prefetch_related(Prefetch('board', queryset=boards))
         else:
-            queryset = queryset.order_by(ordering)
+            queryset = queryset.select_related('board')
+        if 'comments' in expand:
+            # A sliced prefetch: one ROW_NUMBER() query for the whole page
+            latest = Comment.objects.select_related('user').order_by('-created_at', '-id')[:COMMENT_PREVIEW_SIZE]
+            queryset = queryset.prefetch_related(Prefetch('comments', queryset=latest, to_attr='latest_comments'))
+        if self.wants('tags_list'):
+            queryset = queryset.prefetch_related(tag_links_prefetch())
+        queryset = annotate_viewer_state(queryset, user)
+        queryset = self.filter_feedback(queryset)
+
+        search = self.request.query_params.get('search')
+        ordering = self.request.query_params.get('ordering', 'relevance' if search else '-created_at')
+        if ordering == 'relevance' and not search:
+            raise ValidationError({'ordering': "'relevance' requires a search."})
+        if ordering not in FEEDBACK_ORDERINGS:
+            raise ValidationError({'ordering': f"Must be one of: {', '.join(FEEDBACK_ORDERINGS)}."})
+        queryset = queryset.order_by(*FEEDBACK_ORDERINGS[ordering])
 
         return queryset
 
+    def filter_feedback(self, queryset):
+        """Board access plus the ``board_id``, ``status``, ``tags`` and ``search`` filters."""
+        params = self.request.query_params
+        # Searched once per request, validators and the page share the hits
+        if params.get('search') and self.search_hits is None:
+            self.search_hits = self.find_search_hits(params)
+        return filter_feedback(queryset, self.request.user, params, self.search_hits)
+
+    def find_search_hits(self, params):
+        """The ``?search=`` hits, searched per status column on the kanban.
+
+        Each column's ``next`` link continues on the list endpoint, which
+        searches one status, so the column has to rank and limit the same hits.
+        """
+        if self.action == 'kanban':
+            columns = [value for value, _ in Feedback.STATUS_CHOICES if params.get('status') in (None, '', value)]
+        else:
+            columns = [None]
+        hits = {}
+        for column in columns:
+            column_params = params.copy()
+            if column is not None:
+                column_params['status'] = column
+            within = narrow_feedback(Feedback.objects.all(), self.request.user, column_params)
+            hits.update(find_search_hits(column_params, within))
+        return hits
+
+    def get_validator_queryset(self):
+        return self.filter_feedback(Feedback.objects.all())
+
+    def validator_aggregates(self):
+        aggregates = {
+            **super().validator_aggregates(),
+            # Counter updates do not touch updated_at
+            'upvote_sum': Sum('upvote_count'),
+            'comment_sum': Sum('comment_count'),
+            # Compact rows embed the board name too
+            'board_latest': Max('board__updated_at'),
+        }
+        if 'comments' in self.get_expand():
+            # The join repeats feedback rows, which keeps the sums deterministic all the same
+            # (comment_sum already changes when a comment is added or deleted)
+            aggregates['comment_latest'] = Max('comments__updated_at')
+            aggregates['commenter_latest'] = Max('comments__user__updated_at')
+        return aggregates
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['search_hits'] = getattr(self, 'search_hits', None)
+        return context
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-    @action(detail=True, methods=['post'])
-    def upvote(self, request, pk=None):
-        feedback = self.get_object()
-        user = request.user
-
-        if feedback.upvotes.filter(id=user.id).exists():
-            feedback.upvotes.remove(user)
-            upvoted = False
-        else:
-            feedback.upvotes.add(user)
-            upvoted = True
+    def get_readable_id(self, pk):
+        """Id of a feedback item the user can read, without loading it."""
+        try:
+            return filter_readable(Feedback.objects.filter(pk=pk), self.request.user).values_list('id', flat=True).get()
+        except (Feedback.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise NotFound()
 
+    def vote_response(self, feedback_id, upvoted):
         return Response({
             'upvoted': upvoted,
-            'upvote_count': feedback.upvote_count
+            'upvote_count': votes.vote_counts([feedback_id]).get(feedback_id, 0),
         })
 
+    @action(detail=True, methods=['post'])
+    def upvote(self, request, pk=None):
+        """Toggle, kept for existing clients; prefer PUT/DELETE on ``vote``."""
+        feedback_id = self.get_readable_id(pk)
+        return self.vote_response(feedback_id, votes.toggle_vote(feedback_id, request.user.id))
+
+    @action(detail=True, methods=['put', 'delete'])
+    def vote(self, request, pk=None):
+        feedback_id = self.get_readable_id(pk)
+        upvoted = request.method == 'PUT'
+        votes.set_vote(feedback_id, request.user.id, upvoted)
+        return self.vote_response(feedback_id, upvoted)
+
+    @staticmethod
+    def thread_comments(feedback_id):
+        """One item's comments in thread (and index) order."""
+        return Comment.objects.filter(feedback_id=feedback_id).select_related('user').order_by('created_at', 'id')
+
+    @action(detail=True, methods=['get'], url_path='comments')
+    def comment_thread(self, request, pk=None):
+        """The item's full comment thread, oldest first, keyset paginated.
+
+        List rows only embed the latest few comments; this loads the rest
+        along the ``(feedback, created_at, id)`` index.
+        """
+        feedback_id = self.get_readable_id(pk)
+        comments = self.thread_comments(feedback_id)
+        etag = aggregate_etag(
+            'feedback-comments', request.user, comments.order_by().aggregate(
+                **CONDITIONAL_AGGREGATES, author_latest=Max('user__updated_at'),
+            )
+        )
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        page = self.paginate_queryset(comments)
+        serializer = CommentSerializer(
+            page, many=True, context=self.get_serializer_context(),
+            fields=self.get_fields(), expand=self._param_list('expand'),
+        )
+        response = self.get_paginated_response(serializer.data)
+        set_validators(response, etag)
+        return response
+
+    @action(detail=False, methods=['post'], url_path='votes')
+    def vote_batch(self, request):
+        """Apply queued ``{"votes": [{"feedback_id", "upvoted"}, ...]}`` in one transaction."""
+        serializer = VoteBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        wanted = serializer.validated_data['votes']
+        readable = set(
+            filter_readable(Feedback.objects.filter(pk__in=list(wanted)), request.user)
+            .values_list('id', flat=True)
+        )
+        missing = sorted(set(wanted) - readable)
+        if missing:
+            raise ValidationError({'votes': f"Feedback not found: {', '.join(map(str, missing))}."})
+
+        votes.apply_votes(request.user.id, wanted)
+        counts = votes.vote_counts(list(wanted))
+        return Response({'results': [
+            {'feedback_id': pk, 'upvoted': upvoted, 'upvote_count': counts.get(pk, 0)}
+            for pk, upvoted in wanted.items()
+        ]})
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def bulk(self, request):
+        """Bulk create (POST ``items``), status/tag update (PATCH ``items``) or delete (DELETE ``ids``).
+
+        With ``?background=true`` the items are written by a job instead,
+        and the answer is 202 with the job (see ``JobViewSet``).
+        """
+        if request.method == 'DELETE':
+            serializer, key = BulkIdsSerializer(data=request.data), 'ids'
+        else:
+            serializer, key = BulkItemsSerializer(data=request.data), 'items'
+        serializer.is_valid(raise_exception=True)
+        values = serializer.validated_data[key]
+        if in_background(request):
+            job = jobs.enqueue('feedback_bulk', {'method': request.method, key: values}, request.user)
+            return job_accepted(job, request)
+
+        if request.method == 'DELETE':
+            return bulk_response(bulk.in_chunks(bulk.delete_feedback, values, request.user))
+        if request.method == 'POST':
+            return bulk_response(bulk.in_chunks(bulk.create_feedback, values, request.user), status.HTTP_201_CREATED)
+        return bulk_response(bulk.in_chunks(bulk.update_feedback, values, request.user))
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated, IsAdminOrReadOnly])
+    def recompute(self, request):
+        """Queue a counter reconciliation or rollup rebuild (admins only); 202 with the job."""
+        serializer = RecomputeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data['target'] == 'counters':
+            job = jobs.enqueue('reconcile_counters', user=request.user)
+        else:
+            job = jobs.enqueue('rebuild_rollups', {'board_ids': serializer.validated_data.get('board_ids')}, request.user)
+        return job_accepted(job, request)
+
     @action(detail=False, methods=['get'])
-    def summary(self, request):
-        days     = int(request.query_params.get('days', 30))
-        end_date = timezone.now().date()
-        start    = end_date - timedelta(days=days)
-
-        # counts
-        total  = Feedback.objects.count()
-        open_  = Feedback.objects.filter(status='open').count()
-        ip     = Feedback.objects.filter(status='in_progress').count()
-        comp   = Feedback.objects.filter(status='completed').count()
-        rej    = Feedback.objects.filter(status='rejected').count()
-
-        # top‐voted QS (real model instances, not dicts)
-        top_qs = (
-          Feedback.objects
-            .select_related('created_by','board')
-            .annotate(upvotes_count=Count('upvotes'))
-            .order_by('-upvotes_count')[:5]
+    def export(self, request):
+        """Stream feedback, comments or votes (``?kind=``) of the filtered feedback.
+
+        ``?output=csv|ndjson`` picks the encoding and ``?compress=gzip``
+        compresses it; the list filters (board_id, status, tags, search) apply.
+        ``?background=true`` writes the file in a job instead (202), to be
+        fetched from ``/api/jobs/<id>/download/`` when it succeeded.
+        """
+        kind = request.query_params.get('kind', 'feedback')
+        output = request.query_params.get('output', 'csv')
+        compress = request.query_params.get('compress')
+        export.check_options(kind, output, compress)
+        if in_background(request):
+            params = {name: request.query_params[name] for name in FEEDBACK_FILTER_PARAMS if name in request.query_params}
+            payload = {'kind': kind, 'output': output, 'compress': compress, 'params': params}
+            return job_accepted(jobs.enqueue('feedback_export', payload, request.user), request)
+
+        feedback = self.filter_feedback(Feedback.objects.all())
+        response = StreamingHttpResponse(
+            export.stream(kind, feedback, output, compress),
+            content_type=export.content_type(output, compress),
         )
+        response['Content-Disposition'] = f'attachment; filename="{export.filename(kind, output, compress)}"'
+        return response
 
-        # trends, distributions...
-        trends = {}
-        for i in range(days):
-            d = start + timedelta(days=i)
-            trends[d.strftime('%Y-%m-%d')] = Feedback.objects.filter(created_at__date=d).count()
+    @action(detail=False, methods=['get'])
+    def kanban(self, request):
+        """The first ``?per_column=`` cards of every status column, in one query.
+
+        Takes the list filters and ``?ordering=``. Each column carries its
+        total and a ``next`` link that continues it on the list endpoint.
+        """
+        return self.respond(self.kanban_columns, self.get_validator_queryset(), request)
+
+    def kanban_columns(self, request):
+        try:
+            per_column = int(request.query_params.get('per_column', KANBAN_PER_COLUMN))
+        except ValueError:
+            raise ValidationError({'per_column': 'Must be an integer.'})
+        per_column = max(1, min(per_column, MAX_KANBAN_PER_COLUMN))
+
+        queryset = self.get_queryset()
+        paginator = self.paginator
+        paginator.request = request
+        paginator.ordering = paginator.get_ordering(queryset)
+        # Ranked and counted per status by the database, then cut to the top N
+        column_order = [F(key[1:]).desc() if key.startswith('-') else F(key).asc() for key in paginator.ordering]
+        cards = queryset.annotate(
+            column_rank=Window(RowNumber(), partition_by=F('status'), order_by=column_order),
+            column_total=Window(Count('pk'), partition_by=F('status')),
+        ).filter(column_rank__lte=per_column)
+
+        columns = {value: [] for value, _ in Feedback.STATUS_CHOICES}
+        for card in sorted(cards, key=lambda card: card.column_rank):
+            columns.setdefault(card.status, []).append(card)
+
+        params = request.query_params.copy()
+        for name in ('per_column', 'cursor'):
+            params.pop(name, None)
+        params['page_size'] = per_column
+        results = []
+        for value, column in columns.items():
+            total = column[0].column_total if column else 0
+            next_link = None
+            if total > len(column):
+                params['status'] = value
+                url = f"{reverse('feedback-list', request=request)}?{params.urlencode()}"
+                last = column[-1]
+                if 'search_position' in paginator.ordering:
+                    # The list endpoint numbers the hits of one status from 0
+                    last.search_position = last.column_rank - 1
+                next_link = paginator.encode_cursor(paginator.key_of(last), url=url)
+            results.append({
+                'status': value,
+                'total': total,
+                'next': next_link,
+                'results': self.get_serializer(column, many=True).data,
+            })
+        return Response({'columns': results})
 
-        status_dist = {
-          'open': open_, 'in_progress': ip,
-          'completed': comp, 'rejected': rej
-        }
+    @action(detail=False, methods=['get'])
+    def tags(self, request):
+        return Response(tag_counts(self.get_queryset()))
 
-        tag_dist = {}
-        for fb in Feedback.objects.exclude(tags=''):
-            for t in [t.strip() for t in fb.tags.split(',') if t.strip()]:
-                tag_dist[t] = tag_dist.get(t,0) + 1
-
-        payload = {
-          'total_feedback': total,
-          'open_feedback': open_,
-          'in_progress_feedback': ip,
-          'completed_feedback': comp,
-          'rejected_feedback': rej,
-          'top_voted_feedback': top_qs,
-          'feedback_trends': trends,
-          'status_distribution': status_dist,
-          'tag_distribution': tag_dist,
-        }
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        days = parse_days(request.query_params.get('days'))
+        board_ids = parse_id_list(request.query_params.get('board_id'), 'board_id')
+
+        # The ETag comes from cached state only, so a 304 costs no queries. No
+        # Last-Modified: the version clock restarts when it expires, which
+        # is no modification date
+        scope = summary_scope(request.user, days, board_ids)
+        version = summary_version()
+        etag = summary_etag(request.user, scope, version)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        payload = cached_summary(request.user, days, board_ids, scope=scope, version=version)
 
         # pass the dict as the “instance” to the Serializer
         serializer = FeedbackSummarySerializer(payload, context={'request': request})
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), etag)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalReadMixin, ExpandableViewMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, CanEditComment]
+    detail_expand = ['user']
+    author_field = 'user'
+    pagination_class = KeysetPagination
+    throttle_costs = {
+        'list': 1, 'retrieve': 1, 'create': 2, 'update': 2, 'partial_update': 2, 'destroy': 2, 'bulk': 10,
+    }
 
     def get_queryset(self):
+        queryset = filter_readable(Comment.objects.all(), self.request.user, field='feedback__board_id')
         feedback_id = self.request.query_params.get('feedback_id')
         if feedback_id:
-            return Comment.objects.filter(feedback_id=feedback_id).select_related('user')
-        return Comment.objects.all().select_related('user')
+            queryset = queryset.filter(feedback_id=feedback_id)
+        elif self.action == 'list':
+            # Listing every comment in the system is never what a client wants
+            raise ValidationError({'feedback_id': 'This query parameter is required.'})
+        return queryset.select_related('user').order_by('created_at', 'id')
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create ``{"items": [{"feedback_id", "text"}, ...]}`` with per-item results."""
+        serializer = BulkItemsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk.in_chunks(bulk.create_comments, serializer.validated_data['items'], request.user)
+        return bulk_response(results, status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status of background jobs (see ``core.jobs``): users see theirs, admins all."""
+    serializer_class = JobSerializer
+    throttle_costs = {'download': 5}
+
+    def get_queryset(self):
+        queryset = Job.objects.all()
+        if self.request.user.role != 'admin':
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """The file a successful ``feedback_export`` job wrote."""
+        job = self.get_object()
+        if job.kind != 'feedback_export' or job.status != jobs.SUCCEEDED:
+            raise NotFound('This job has no file to download.')
+        try:
+            file = open(jobs.result_path(job, job.result['filename']), 'rb')
+        except FileNotFoundError:
+            raise NotFound('The file of this job has been removed.')
+        payload = job.payload
+        return FileResponse(
+            file, as_attachment=True, filename=job.result['filename'],
+            content_type=export.content_type(payload['output'], payload.get('compress')),
+        )
+
+class MetricsView(APIView):
+    """Request metrics of this process in the Prometheus text format.
+
+    For admins, or scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    authentication_classes = [MetricsTokenAuthentication, CachedJWTAuthentication]
+    permission_classes = [CanReadMetrics]
+
+    def get(self, request):
+        return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,75 @@
+from django.db import connections, router, transaction
+from django.db.models.constants import OnConflict
+
+from . import counters
+from .models import Feedback
+
+Upvote = Feedback.upvotes.through
+
+MAX_BATCH_VOTES = 100
+
+
+def _insert(feedback_id, user_id):
+    """``INSERT`` the vote unless it exists; True if a row was added.
+
+    The unique ``(feedback, user)`` constraint settles concurrent inserts,
+    so double clicks can never count twice.
+    """
+    connection = connections[router.db_for_write(Upvote)]
+    ops = connection.ops
+    columns = [Upvote._meta.get_field(name) for name in ('feedback', 'user')]
+    suffix = ops.on_conflict_suffix_sql(columns, OnConflict.IGNORE, None, None)
+    sql = '{} {} ({}) VALUES (%s, %s) {}'.format(
+        ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        ops.quote_name(Upvote._meta.db_table),
+        ', '.join(ops.quote_name(field.column) for field in columns),
+        suffix,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [feedback_id, user_id])
+        return cursor.rowcount == 1
+
+
+def _delete(feedback_id, user_id):
+    removed, _ = Upvote.objects.filter(feedback_id=feedback_id, user_id=user_id).delete()
+    return bool(removed)
+
+
+def set_vote(feedback_id, user_id, upvoted):
+    """Idempotently make ``user_id``'s vote on ``feedback_id`` equal ``upvoted``.
+
+    Returns True if anything changed. Counters only move when a row did.
+    """
+    with transaction.atomic():
+        changed = _insert(feedback_id, user_id) if upvoted else _delete(feedback_id, user_id)
+        if changed:
+            counters.adjust(feedback_id, 'upvote_count', 1 if upvoted else -1)
+    return changed
+
+
+def toggle_vote(feedback_id, user_id):
+    """Flip the vote and return the new state (the old ``upvote`` endpoint)."""
+    with transaction.atomic():
+        if _delete(feedback_id, user_id):
+            counters.adjust(feedback_id, 'upvote_count', -1)
+            return False
+        if _insert(feedback_id, user_id):
+            counters.adjust(feedback_id, 'upvote_count', 1)
+        return True
+
+
+def apply_votes(user_id, votes):
+    """Apply ``{feedback_id: upvoted}`` for one user in one transaction.
+
+    Each row is still inserted or deleted on its own so only real changes
+    reach the counters, which then move in (at most) two ``UPDATE``\\s.
+    """
+    with transaction.atomic():
+        added = [pk for pk, upvoted in votes.items() if upvoted and _insert(pk, user_id)]
+        removed = [pk for pk, upvoted in votes.items() if not upvoted and _delete(pk, user_id)]
+        counters.adjust_many(added, 'upvote_count', 1)
+        counters.adjust_many(removed, 'upvote_count', -1)
+
+
+def vote_counts(feedback_ids):
+    return dict(Feedback.objects.filter(pk__in=feedback_ids).values_list('id', 'upvote_count'))
@@ -0,0 +1,44 @@
+"""``CACHES`` from environment variables (read with python-decouple).
+
+Throttle budgets, board access lists, the summary clock and replica pins
+live in the default cache. ``CACHE_BACKEND`` picks one:
+
+- ``locmem`` (default): per process; other processes miss invalidations
+  until entries expire and count their own throttle budgets
+- ``redis`` or ``memcached``: ``CACHE_LOCATION`` is the server, e.g.
+  ``redis://127.0.0.1:6379/1`` or ``127.0.0.1:11211``; shared by every
+  process and host, with atomic counters, so the one for multi-process
+  deployments (they need the ``redis`` or ``pymemcache`` package)
+- ``db``: a table (``CACHE_LOCATION``, default ``cache_table``), made by
+  ``manage.py createcachetable``
+- ``file``: a directory (``CACHE_LOCATION``, default ``<BASE_DIR>/cache``);
+  every write past ``MAX_ENTRIES`` culls by listing the directory, and
+  neither it nor ``db`` increments atomically
+"""
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def caches(base_dir):
+    backend = config('CACHE_BACKEND', default='locmem')
+    if backend not in BACKENDS:
+        raise ImproperlyConfigured(f"CACHE_BACKEND must be one of {', '.join(BACKENDS)}, not {backend!r}")
+    default_locations = {'file': str(base_dir / 'cache'), 'db': 'cache_table'}
+    location = config('CACHE_LOCATION', default=default_locations.get(backend, ''))
+    if backend in ('redis', 'memcached') and not location:
+        raise ImproperlyConfigured(f'CACHE_BACKEND={backend} needs CACHE_LOCATION')
+
+    default = {'BACKEND': BACKENDS[backend], 'LOCATION': location}
+    if backend in ('file', 'db', 'locmem'):
+        # One throttle window key per client adds up; the default 300 would
+        # cull board access lists long before they expire
+        default['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)}
+    return {'default': default}
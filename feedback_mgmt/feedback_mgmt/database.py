@@ -0,0 +1,81 @@
+"""``DATABASES`` from environment variables (read with python-decouple).
+
+SQLite by default, tuned for concurrent requests: WAL journal, a busy
+timeout and write transactions that queue for the lock. Set
+``DB_ENGINE=postgres`` and the usual ``DB_NAME``/``DB_USER``/
+``DB_PASSWORD``/``DB_HOST``/``DB_PORT`` for PostgreSQL.
+
+``DB_REPLICA_NAME`` (SQLite file) or ``DB_REPLICA_HOST`` (PostgreSQL) adds a
+``replica`` alias, which ``core.routers.PrimaryReplicaRouter`` reads from.
+"""
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
+REPLICA = 'replica'
+
+ENGINES = {
+    'sqlite': 'core.backends.sqlite3',
+    'postgres': 'django.db.backends.postgresql',
+}
+
+# WAL lets readers run alongside the writer; NORMAL sync is durable in WAL
+# mode except for the last commits on power loss; 64MB page cache
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode = WAL;'
+    'PRAGMA synchronous = NORMAL;'
+    'PRAGMA busy_timeout = {busy_timeout_ms};'
+    'PRAGMA cache_size = -65536;'
+    'PRAGMA temp_store = MEMORY'
+)
+
+
+def _sqlite(name):
+    busy_timeout = config('DB_BUSY_TIMEOUT', default=20, cast=int)
+    return {
+        'ENGINE': ENGINES['sqlite'],
+        'NAME': name,
+        'OPTIONS': {
+            'timeout': busy_timeout,
+            'init_command': SQLITE_PRAGMAS.format(busy_timeout_ms=busy_timeout * 1000),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+
+
+def _postgres(host):
+    return {
+        'ENGINE': ENGINES['postgres'],
+        'NAME': config('DB_NAME', default='feedback'),
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': host,
+        'PORT': config('DB_PORT', default=''),
+    }
+
+
+def databases(base_dir):
+    engine = config('DB_ENGINE', default='sqlite')
+    if engine not in ENGINES:
+        raise ImproperlyConfigured(f"DB_ENGINE must be one of {', '.join(ENGINES)}, not {engine!r}")
+    if engine == 'sqlite':
+        default = _sqlite(config('DB_NAME', default=str(base_dir / 'db.sqlite3')))
+        replica_name = config('DB_REPLICA_NAME', default='')
+        replica = _sqlite(replica_name) if replica_name else None
+    else:
+        default = _postgres(config('DB_HOST', default='localhost'))
+        replica_host = config('DB_REPLICA_HOST', default='')
+        replica = _postgres(replica_host) if replica_host else None
+
+    # Persistent connections, checked before reuse; 0 closes after each request
+    default['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    default['CONN_HEALTH_CHECKS'] = True
+    result = {'default': default}
+    if replica is not None:
+        result[REPLICA] = {
+            **replica,
+            'CONN_MAX_AGE': default['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': True,
+            # Tests run against the primary only
+            'TEST': {'MIRROR': 'default'},
+        }
+    return result
@@ -14,6 +14,9 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import config
 
+from .caches import caches
+from .database import databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -53,6 +56,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so it times everything below it (see core.metrics)
+    'core.middleware.InstrumentationMiddleware',
+    'core.middleware.RateLimitHeadersMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -86,12 +93,16 @@ WSGI_APPLICATION = 'feedback_mgmt.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# SQLite (WAL) or PostgreSQL, persistent connections and an optional read
+# replica, all from DB_* environment variables (see feedback_mgmt.database)
+DATABASES = databases(BASE_DIR)
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+# Seconds a client keeps reading from the primary after one of its writes
+REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Per process (LocMem) by default; Redis or Memcached for several processes,
+# from CACHE_* environment variables (see feedback_mgmt.caches)
+CACHES = caches(BASE_DIR)
 
 
 # Password validation
@@ -139,13 +150,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.SizedPageNumberPagination',
+    'PAGE_SIZE': 20,
+    # Cost units per client and window (see core.throttling); login and
+    # register cost 20, so the anonymous rate allows 10 of them a minute
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.UserCostThrottle',
+        'core.throttling.AnonCostThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': config('THROTTLE_USER_RATE', default='1200/min'),
+        'anon': config('THROTTLE_ANON_RATE', default='200/min'),
+    },
 }
 
 # JWT Configuration
@@ -153,8 +174,14 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
+    # Tokens carry a hash of the password and stop working when it changes
+    'CHECK_REVOKE_TOKEN': True,
 }
 
+# Users resolved from access tokens are cached per process for this long
+# (see core.authentication.CachedJWTAuthentication)
+PRINCIPAL_CACHE_SECONDS = config('PRINCIPAL_CACHE_SECONDS', default=30, cast=int)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",   # Keep this for Create React App users
@@ -177,3 +204,9 @@ CORS_ALLOWED_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
 ]
+
+# Request instrumentation (see core.metrics): log requests slower than this
+# with their slowest SQL (0 = off), and the bearer token Prometheus scrapes
+# /api/metrics/ with (admins can always read it)
+SLOW_REQUEST_MS = config('SLOW_REQUEST_MS', default=0, cast=int) or None
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
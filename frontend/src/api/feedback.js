@@ -8,4 +8,7 @@ export const feedbackAPI = {
   delete: (id) => api.delete(`/feedback/${id}/`),
   upvote: (id) => api.post(`/feedback/${id}/upvote/`),
   summary: (params = {}) => api.get('/feedback/summary/', { params }),
+  kanban: (params = {}) => api.get('/feedback/kanban/', { params }),
+  comments: (id, params = {}) => api.get(`/feedback/${id}/comments/`, { params }),
+  page: (url) => api.get(url),
 };
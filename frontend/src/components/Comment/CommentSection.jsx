@@ -1,11 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import { MessageCircle, Send, Trash2, Edit2 } from 'lucide-react';
 import { commentsAPI } from '../../api/comments.js';
+import { feedbackAPI } from '../../api/feedback.js';
 import { useAuth } from '../../context/AuthContext.jsx';
 import toast from 'react-hot-toast';
 
 const CommentSection = ({ feedbackId }) => {
   const [comments, setComments] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [newComment, setNewComment] = useState('');
   const [loading, setLoading] = useState(false);
   const [editingComment, setEditingComment] = useState(null);
@@ -19,13 +23,28 @@ const CommentSection = ({ feedbackId }) => {
 
   const fetchComments = async () => {
     try {
-      const response = await commentsAPI.list({ feedback_id: feedbackId });
-      setComments(response.data.results || response.data);
+      const response = await feedbackAPI.comments(feedbackId, { total: 'exact' });
+      setComments(response.data.results);
+      setTotal(response.data.total);
+      setNextPage(response.data.next);
     } catch (error) {
       toast.error('Failed to fetch comments');
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await feedbackAPI.page(nextPage);
+      setComments(current => [...current, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (error) {
+      toast.error('Failed to fetch comments');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     if (!newComment.trim()) return;
@@ -37,7 +56,11 @@ const CommentSection = ({ feedbackId }) => {
         feedback_id: feedbackId,  // Changed from 'feedback' to 'feedback_id'
         text: newComment.trim()
       });
-      setComments([...comments, response.data]);
+      // Oldest first: the new comment shows up once the thread is loaded to the end
+      if (!nextPage) {
+        setComments([...comments, response.data]);
+      }
+      setTotal(total + 1);
       setNewComment('');
       toast.success('Comment added successfully');
     } catch (error) {
@@ -53,6 +76,7 @@ const CommentSection = ({ feedbackId }) => {
     try {
       await commentsAPI.delete(commentId);
       setComments(comments.filter(comment => comment.id !== commentId));
+      setTotal(total - 1);
       toast.success('Comment deleted');
     } catch (error) {
       toast.error('Failed to delete comment');
@@ -80,7 +104,7 @@ const CommentSection = ({ feedbackId }) => {
     <div className="space-y-4">
       <h3 className="text-lg font-medium text-gray-900 flex items-center">
         <MessageCircle className="h-5 w-5 mr-2" />
-        Comments ({comments.length})
+        Comments ({total})
       </h3>
 
       {/* Comment Form */}
@@ -143,6 +167,17 @@ const CommentSection = ({ feedbackId }) => {
           </div>
         ))}
 
+        {nextPage && (
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="w-full py-2 text-sm text-blue-600 border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : `Show more comments (${total - comments.length})`}
+          </button>
+        )}
+
         {comments.length === 0 && (
           <div className="text-center py-8 text-gray-500">
             <MessageCircle className="h-12 w-12 mx-auto mb-4 text-gray-300" />
@@ -106,7 +106,7 @@ const Boards = () => {
               </div>
               <div className="flex items-center">
                 <Users className="h-4 w-4 mr-1" />
-                <span>{board.members?.length || 0} members</span>
+                <span>{board.member_count ?? board.members?.length ?? 0} members</span>
               </div>
             </div>
 
@@ -5,8 +5,10 @@ import toast from 'react-hot-toast';
 import Loading from '../components/Common/Loading.jsx';
 
 const KanbanView = () => {
-  const [feedback, setFeedback] = useState([]);
+  // { [status]: { total, next, results } }, see /feedback/kanban/
+  const [board, setBoard] = useState({});
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(null);
   const [draggedItem, setDraggedItem] = useState(null);
   const [dragOverColumn, setDragOverColumn] = useState(null);
 
@@ -23,8 +25,8 @@ const KanbanView = () => {
 
   const fetchFeedback = async () => {
     try {
-      const response = await feedbackAPI.list();
-      setFeedback(response.data.results || response.data);
+      const response = await feedbackAPI.kanban();
+      setBoard(Object.fromEntries(response.data.columns.map(column => [column.status, column])));
     } catch (error) {
       toast.error('Failed to fetch feedback');
     } finally {
@@ -32,6 +34,33 @@ const KanbanView = () => {
     }
   };
 
+  const loadMore = async (columnId) => {
+    const column = board[columnId];
+    if (!column?.next) return;
+    setLoadingMore(columnId);
+    try {
+      const response = await feedbackAPI.page(column.next);
+      setBoard(current => {
+        const seen = new Set(current[columnId].results.map(item => item.id));
+        return {
+          ...current,
+          [columnId]: {
+            ...current[columnId],
+            next: response.data.next,
+            results: [
+              ...current[columnId].results,
+              ...response.data.results.filter(item => !seen.has(item.id)),
+            ],
+          },
+        };
+      });
+    } catch (error) {
+      toast.error('Failed to load more feedback');
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   const handleDragStart = (e, item) => {
     setDraggedItem(item);
     e.dataTransfer.effectAllowed = 'move';
@@ -76,11 +105,20 @@ const KanbanView = () => {
     try {
       await feedbackAPI.update(draggedItem.id, { status: targetColumnId });
 
-      setFeedback(feedback.map(item =>
-        item.id === draggedItem.id
-          ? { ...item, status: targetColumnId }
-          : item
-      ));
+      const sourceId = draggedItem.status;
+      setBoard(current => ({
+        ...current,
+        [sourceId]: {
+          ...current[sourceId],
+          total: current[sourceId].total - 1,
+          results: current[sourceId].results.filter(item => item.id !== draggedItem.id),
+        },
+        [targetColumnId]: {
+          ...current[targetColumnId],
+          total: current[targetColumnId].total + 1,
+          results: [{ ...draggedItem, status: targetColumnId }, ...current[targetColumnId].results],
+        },
+      }));
 
       toast.success('Feedback status updated');
     } catch (error) {
@@ -128,7 +166,8 @@ const KanbanView = () => {
 
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
         {columns.map((column) => {
-          const columnFeedback = feedback.filter(item => item.status === column.id);
+          const columnData = board[column.id] || { total: 0, next: null, results: [] };
+          const columnFeedback = columnData.results;
           const isDragOver = dragOverColumn === column.id;
 
           return (
@@ -145,7 +184,7 @@ const KanbanView = () => {
               <div className={`px-4 py-3 rounded-t-xl ${getHeaderColor(column.color)}`}>
                 <h3 className="font-medium">
                   {column.title}
-                  <span className="ml-2 text-sm">({columnFeedback.length})</span>
+                  <span className="ml-2 text-sm">({columnData.total})</span>
                 </h3>
               </div>
 
@@ -190,6 +229,18 @@ const KanbanView = () => {
                     )}
                   </div>
                 ))}
+                {columnData.next && (
+                  <button
+                    type="button"
+                    onClick={() => loadMore(column.id)}
+                    disabled={loadingMore === column.id}
+                    className="w-full py-2 text-sm font-medium text-happyfox-orange border border-happyfox-orange rounded-xl hover:bg-happyfox-orange/10 disabled:opacity-50"
+                  >
+                    {loadingMore === column.id
+                      ? 'Loading...'
+                      : `Show more (${columnData.total - columnFeedback.length})`}
+                  </button>
+                )}
                 {isDragOver && columnFeedback.length > 0 && (
                   <div className="border-2 border-dashed border-happyfox-orange rounded-xl p-4 text-center text-happyfox-orange bg-happyfox-light transition-all duration-400 ease-smooth animate-fade-in transform hover:bg-happyfox-orange/10">
                     Drop here to move feedback